@@ -0,0 +1,71 @@
+"""
+asyncio entry point for Cassiopeia. Provides coroutine versions of the riotapi calls used most for bulk collection, so a single thread can keep hundreds of requests in flight.
+
+The API key, region, load policy, and data store are shared with cassiopeia.riotapi and should be set there.
+"""
+
+import cassiopeia.dto.asyncrequests
+import cassiopeia.type.api.asyncrates
+import cassiopeia.type.api.asyncconnection
+from cassiopeia.core.asyncapi import get_match, get_matches, get_match_list, get_summoner_by_id, get_summoners_by_id, get_summoner_by_name, get_summoners_by_name
+
+__all__ = [
+    "get_match", "get_matches", "get_match_list", "get_summoner_by_id", "get_summoners_by_id", "get_summoner_by_name", "get_summoners_by_name",
+    "set_rate_limits", "set_tournament_rate_limits", "get_requests_count", "set_connection_pool", "get_connection_stats"
+]
+
+
+def set_rate_limits(*limits):
+    """
+    Sets separate rate limits for asyncio requests. By default asyncio requests share the rate limiter (and its call budget) with riotapi.
+
+    Args:
+        *limits (tuple...): the rate limits to apply. Rate limits are of the form (calls_per_epoch, seconds_per_epoch)
+    """
+    cassiopeia.dto.asyncrequests.rate_limiter = cassiopeia.type.api.asyncrates.AsyncMultiRateLimiter(*limits)
+
+
+def set_tournament_rate_limits(*limits):
+    """
+    Sets separate tournament rate limits for asyncio requests. By default asyncio requests share the tournament rate limiter (and its call budget) with riotapi.
+
+    Args:
+        *limits (tuple...): the rate limits to apply. Rate limits are of the form (calls_per_epoch, seconds_per_epoch)
+    """
+    cassiopeia.dto.asyncrequests.tournament_rate_limiter = cassiopeia.type.api.asyncrates.AsyncMultiRateLimiter(*limits)
+
+
+def get_requests_count(tournament=False):
+    """
+    Returns the number of successful requests (no exceptions in the call) and total requests issued through asyncio up to now
+
+    Args:
+        tournament (bool): get the request counts for the tournament requests
+
+    Returns:
+        tuple: A (successful calls, total calls) tuple
+    """
+    limiter = cassiopeia.dto.asyncrequests.get_rate_limiter(tournament)
+    return limiter.calls if limiter else (0, 0)
+
+
+def set_connection_pool(max_connections_per_host, idle_timeout=60):
+    """
+    Sets up the pool of persistent (keep-alive) connections used for asyncio requests
+
+    Args:
+        max_connections_per_host (int): the maximum number of sockets to keep open to each host
+        idle_timeout (int): the number of seconds an unused connection is kept open before it is closed (default 60)
+    """
+    cassiopeia.dto.asyncrequests.connection_pool.close()
+    cassiopeia.dto.asyncrequests.connection_pool = cassiopeia.type.api.asyncconnection.AsyncConnectionPool(max_connections_per_host, idle_timeout)
+
+
+def get_connection_stats():
+    """
+    Returns statistics about how well connections are being reused by asyncio requests
+
+    Returns:
+        dict<str, int>: the number of requests sent, connections created, connections reused, idle connections evicted, and connections currently idle
+    """
+    return cassiopeia.dto.asyncrequests.connection_pool.stats
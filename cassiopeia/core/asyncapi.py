@@ -0,0 +1,234 @@
+import asyncio
+import datetime
+
+import cassiopeia.dto.asyncapi
+import cassiopeia.dto.asyncrequests
+import cassiopeia.core.matchapi
+import cassiopeia.core.requests
+import cassiopeia.type.core.common
+import cassiopeia.type.core.match
+import cassiopeia.type.core.matchlist
+import cassiopeia.type.core.summoner
+
+
+async def call_with_ensured_size(method, max_size, arg):
+    """
+    Breaks a list of arguments up into chunks of a maximum size and awaits the given coroutine function on all the chunks concurrently
+
+    Args:
+        method (coroutine function): the method to call
+        max_size (int): the maximum number of arguments to include in a single call
+        arg (any | list<any>): the arguments to split up
+
+    Returns:
+        list<any> | dict<any>: the combined results of the function calls on each chunk
+    """
+    if not isinstance(arg, list) or len(arg) <= max_size:
+        return await method(arg)
+
+    chunks = await asyncio.gather(*[method(arg[i:i + max_size]) for i in range(0, len(arg), max_size)])
+
+    results = chunks[0]
+    for chunk in chunks[1:]:
+        if isinstance(results, list):
+            results = results + chunk
+        else:
+            results.update(chunk)
+    return results
+
+
+async def get_match(id_, include_timeline=False, tournament_code=""):
+    """
+    Gets a match
+
+    Args:
+        id_ (int | MatchReference): the ID of or reference to the match to get
+        include_timeline (bool): whether to include timeline data in the returned match
+        tournament_code (str): the tournament code if the match to be retrieved is from a tournament
+
+    Returns:
+        Match: the match
+    """
+    if isinstance(id_, cassiopeia.type.core.matchlist.MatchReference):
+        id_ = id_.id
+
+    # Data stores and the eager loading calls block, so they're run off the event loop
+    store = cassiopeia.core.requests.get_data_store()
+    match = await cassiopeia.dto.asyncrequests.run_blocking(store.get, cassiopeia.type.core.match.Match, id_, "matchId")
+    if match is not None and (match.data.timeline or not include_timeline):
+        return match
+
+    match = await cassiopeia.dto.asyncapi.get_match(id_, include_timeline, tournament_code)
+    await cassiopeia.dto.asyncrequests.run_blocking(cassiopeia.core.matchapi.load_required_data, [match])
+
+    match = cassiopeia.type.core.match.Match(match)
+    await cassiopeia.dto.asyncrequests.run_blocking(store.store, match, id_)
+    return match
+
+
+async def get_matches(ids, include_timeline=False, tournament_code=""):
+    """
+    Gets a bunch of matches concurrently
+
+    Args:
+        ids (list<int> | list<MatchReference>): the IDs of or references to the matches to get
+        include_timeline (bool): whether to include timeline data in the returned matches
+        tournament_code (str): the tournament code if the match to be retrieved is from a tournament
+
+    Returns:
+        list<Match>: the matches
+    """
+    return list(await asyncio.gather(*[get_match(id_, include_timeline, tournament_code) for id_ in ids]))
+
+
+async def get_match_list(summoner, num_matches=0, begin_index=0, begin_time=0, end_time=0, champions=None, ranked_queues=None, seasons=None):
+    """
+    Gets a summoner's match history
+
+    Args:
+        summoner (Summoner): the summoner to get match history for
+        num_matches (int): the maximum number of matches to retrieve. 0 will get as many as possible. (default 0)
+        begin_index (int): the game index to start from (default 0)
+        begin_time (int | datetime): the begin time to use for fetching games (default 0)
+        end_time (int | datetime): the end time to use for fetching games (default 0)
+        champions (Champion | list<Champion>): the champion(s) to limit the results to (default None)
+        ranked_queues Queue | list<Queue>: the ranked queue(s) to limit the results to (default None)
+        seasons (Season | list<Season>): the season(s) to limit the results to (default None)
+
+    Returns:
+        list<MatchReference>: the summoner's match history
+    """
+    # Convert strings that should be enums into enums
+    if isinstance(seasons, str):
+        seasons = cassiopeia.type.core.common.Season(seasons.upper())
+    elif isinstance(seasons, list) and all(isinstance(s, str) for s in seasons):
+        seasons = [cassiopeia.type.core.common.Season(s.upper()) for s in seasons]
+
+    if isinstance(ranked_queues, str):
+        ranked_queues = cassiopeia.type.core.common.Queue(ranked_queues.upper().replace("5X5", "5x5").replace("3X3", "3x3"))
+    elif isinstance(ranked_queues, list) and all(isinstance(q, str) for q in ranked_queues):
+        ranked_queues = [cassiopeia.type.core.common.Queue(q.upper().replace("5X5", "5x5").replace("3X3", "3x3")) for q in ranked_queues]
+
+    # Convert core types to API-ready types
+    epoch = datetime.datetime.utcfromtimestamp(0)
+    if isinstance(begin_time, datetime.datetime):
+        begin_time = int((begin_time - epoch).total_seconds() * 1000)
+    if isinstance(end_time, datetime.datetime):
+        end_time = int((end_time - epoch).total_seconds() * 1000)
+
+    champion_ids = [champion.id for champion in champions] if isinstance(champions, list) else champions.id if champions else None
+    ranked_queues = [queue.value for queue in ranked_queues] if isinstance(ranked_queues, list) else ranked_queues.value if ranked_queues else None
+    seasons = [season.value for season in seasons] if isinstance(seasons, list) else seasons.value if seasons else None
+
+    history = await cassiopeia.dto.asyncapi.get_match_list(summoner.id, num_matches, begin_index, begin_time, end_time, champion_ids, ranked_queues, seasons)
+    return [cassiopeia.type.core.matchlist.MatchReference(ref) for ref in history.matches]
+
+
+async def get_summoner_by_id(id_):
+    """
+    Gets a summoner by ID
+
+    Args:
+        id_ (int): the ID of the summoner
+
+    Returns:
+        Summoner: the summoner
+    """
+    return (await get_summoners_by_id([id_]))[0]
+
+
+async def get_summoners_by_id(ids):
+    """
+    Gets a bunch of summoners by ID
+
+    Args:
+        ids (list<int>): the IDs of the summoners
+
+    Returns:
+        list<Summoner>: the summoners
+    """
+    store = cassiopeia.core.requests.get_data_store()
+    summoners = await cassiopeia.dto.asyncrequests.run_blocking(store.get, cassiopeia.type.core.summoner.Summoner, ids, "id")
+
+    # Find which summoners weren't cached
+    missing = []
+    loc = []
+    for i in range(len(ids)):
+        if not summoners[i]:
+            missing.append(ids[i])
+            loc.append(i)
+
+    if not missing:
+        return summoners
+
+    # Make requests to get them
+    new = await call_with_ensured_size(cassiopeia.dto.asyncapi.get_summoners_by_id, 40, missing)
+    to_store = []
+    for i in range(len(missing)):
+        try:
+            summoner = cassiopeia.type.core.summoner.Summoner(new[str(missing[i])])
+            to_store.append(summoner)
+        except KeyError:
+            summoner = None
+        summoners[loc[i]] = summoner
+
+    await cassiopeia.dto.asyncrequests.run_blocking(store.store, to_store, [summoner.id for summoner in to_store])
+    await cassiopeia.dto.asyncrequests.run_blocking(store.store, to_store, [summoner.name for summoner in to_store])
+    return summoners
+
+
+async def get_summoner_by_name(name):
+    """
+    Gets a summoner by name
+
+    Args:
+        name (str): the name of the summoner
+
+    Returns:
+        Summoner: the summoner
+    """
+    return (await get_summoners_by_name([name]))[0]
+
+
+async def get_summoners_by_name(names):
+    """
+    Gets a bunch of summoners by name
+
+    Args:
+        names (list<str>): the names of the summoners
+
+    Returns:
+        list<Summoner>: the summoners
+    """
+    store = cassiopeia.core.requests.get_data_store()
+    summoners = await cassiopeia.dto.asyncrequests.run_blocking(store.get, cassiopeia.type.core.summoner.Summoner, names, "name")
+
+    # Find which summoners weren't cached
+    missing = []
+    loc = []
+    for i in range(len(names)):
+        if not summoners[i]:
+            missing.append(names[i])
+            loc.append(i)
+
+    if not missing:
+        return summoners
+
+    # Make requests to get them
+    new = await call_with_ensured_size(cassiopeia.dto.asyncapi.get_summoners_by_name, 40, missing)
+    to_store = []
+    for i in range(len(missing)):
+        try:
+            summoner = cassiopeia.type.core.summoner.Summoner(new[__standardize(missing[i])])
+            to_store.append(summoner)
+        except KeyError:
+            summoner = None
+        summoners[loc[i]] = summoner
+
+    await cassiopeia.dto.asyncrequests.run_blocking(store.store, to_store, [summoner.id for summoner in to_store])
+    await cassiopeia.dto.asyncrequests.run_blocking(store.store, to_store, [summoner.name for summoner in to_store])
+    return summoners
+
+
+def __standardize(name):
+    return name.replace(" ", "").lower()
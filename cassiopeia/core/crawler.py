@@ -0,0 +1,226 @@
+import collections
+import concurrent.futures
+import datetime
+import json
+import os
+
+import cassiopeia.dto.matchlistapi
+import cassiopeia.core.matchapi
+import cassiopeia.core.requests
+import cassiopeia.type.api.common
+import cassiopeia.type.api.exception
+import cassiopeia.type.core.match
+import cassiopeia.type.core.summoner
+
+
+class MatchCrawler(object):
+    """
+    Collects matches by "spiderweb" crawling: starting from some summoners, it gets each summoner's match list, then each of those matches, then the match lists of everyone who played in them, and so on. Matches are yielded as they arrive:
+
+        crawler = MatchCrawler(seeds, checkpoint="crawl.json")
+        for match in crawler:
+            ...
+
+    Each summoner and each match is only requested once. Up to max_in_flight requests are made at a time on the shared thread pool (see riotapi.set_worker_count), all through the usual rate limiter. Matches which are already in the data store are taken from there instead of requested. Matches and summoners which the API can't find (400s and 404s) are skipped.
+
+    With a checkpoint file, the crawl's progress is saved every checkpoint_interval matches and when the crawl stops, and a new crawler with the same checkpoint file picks up where it left off. The checkpoint file only holds the summoners and matches still to be crawled. The IDs of everything seen so far are appended to a second file (the checkpoint's name plus ".seen") as they're found, so saving doesn't take longer as the crawl grows.
+    """
+
+    def __init__(self, seeds, checkpoint=None, max_in_flight=10, checkpoint_interval=100, begin_time=0, end_time=0, ranked_queues=None, seasons=None):
+        """
+        Args:
+            seeds (list<int> | list<Summoner>): the summoners (or their IDs) to start crawling from. Seeds which were already crawled (according to the checkpoint) are skipped.
+            checkpoint (str): the file to save the crawl's progress to and resume it from. None doesn't save progress. (default None)
+            max_in_flight (int): the maximum number of requests to make at a time (default 10)
+            checkpoint_interval (int): the number of matches to crawl between saving progress (default 100)
+            begin_time (int | datetime): only crawl matches played after this time, as epoch milliseconds or a datetime (default 0)
+            end_time (int | datetime): only crawl matches played before this time, as epoch milliseconds or a datetime (default 0)
+            ranked_queues (str | list<str>): only crawl matches from these ranked queues (default None)
+            seasons (str | list<str>): only crawl matches from these seasons (default None)
+        """
+        self.checkpoint = checkpoint
+        self.max_in_flight = max_in_flight
+        self.checkpoint_interval = checkpoint_interval
+        self.match_list_args = {"begin_time": _timestamp(begin_time), "end_time": _timestamp(end_time), "ranked_queues": ranked_queues, "seasons": seasons}
+
+        # The frontier holds summoners whose match lists haven't been requested yet, and the pending matches are known but haven't been requested yet
+        self.frontier = collections.deque()
+        self.pending = collections.deque()
+        self.seen_summoners = set()
+        self.seen_matches = set()
+        self.crawled = 0
+
+        # IDs seen since the last save, which still have to be added to the seen file
+        self._new_summoners = []
+        self._new_matches = []
+
+        if checkpoint and os.path.exists(checkpoint):
+            self.load()
+        for seed in seeds:
+            self.add_summoner(seed.id if isinstance(seed, cassiopeia.type.core.summoner.Summoner) else seed)
+
+    def __iter__(self):
+        return self.crawl()
+
+    def add_summoner(self, summoner_id):
+        """
+        Adds a summoner to the frontier if they haven't been seen before
+
+        Args:
+            summoner_id (int): the ID of the summoner to add
+        """
+        if summoner_id not in self.seen_summoners:
+            self.seen_summoners.add(summoner_id)
+            self._new_summoners.append(summoner_id)
+            self.frontier.append(summoner_id)
+
+    def add_match(self, match_id):
+        """
+        Adds a match to the ones to get if it hasn't been seen before
+
+        Args:
+            match_id (int): the ID of the match to add
+        """
+        if match_id not in self.seen_matches:
+            self.seen_matches.add(match_id)
+            self._new_matches.append(match_id)
+            self.pending.append(match_id)
+
+    def crawl(self, max_matches=0):
+        """
+        Crawls until there are no more summoners or matches to get
+
+        Args:
+            max_matches (int): the number of matches to stop after. 0 doesn't stop. (default 0)
+
+        Returns:
+            generator<Match>: the matches, in the order they arrive
+        """
+        in_flight = {}
+        crawled = 0
+        try:
+            while in_flight or self.pending or self.frontier:
+                while len(in_flight) < self.max_in_flight and (self.pending or self.frontier):
+                    # Matches are gotten before more match lists, so the pending matches don't pile up
+                    if self.pending:
+                        match_id = self.pending.popleft()
+                        in_flight[cassiopeia.core.requests.submit(_call, _get_match, match_id)] = (True, match_id)
+                    else:
+                        summoner_id = self.frontier.popleft()
+                        in_flight[cassiopeia.core.requests.submit(_call, _get_match_ids, summoner_id, self.match_list_args)] = (False, summoner_id)
+
+                done, _ = concurrent.futures.wait(list(in_flight), return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    # A request which failed is left in flight, so the checkpoint keeps it as not done
+                    is_match, id_ = in_flight[future]
+                    result = future.result()
+                    del in_flight[future]
+                    if not is_match:
+                        for match_id in result or []:
+                            self.add_match(match_id)
+                    elif result is not None:
+                        for participant in result.participants:
+                            if participant.summoner_id:
+                                self.add_summoner(participant.summoner_id)
+
+                        self.crawled += 1
+                        crawled += 1
+                        if self.checkpoint and self.crawled % self.checkpoint_interval == 0:
+                            self._save(in_flight)
+                        yield result
+                        if max_matches and crawled >= max_matches:
+                            return
+        finally:
+            for future in in_flight:
+                future.cancel()
+            if self.checkpoint:
+                self._save(in_flight)
+
+    def load(self):
+        """
+        Loads the crawl's progress from the checkpoint file
+        """
+        with open(self.checkpoint, "r") as checkpoint_file:
+            state = json.load(checkpoint_file)
+        self.frontier = collections.deque(state["frontier"])
+        self.pending = collections.deque(state["pending"])
+        self.crawled = state["crawled"]
+
+        self.seen_summoners = set()
+        self.seen_matches = set()
+        if os.path.exists(self._seen_path()):
+            with open(self._seen_path(), "r") as seen_file:
+                for line in seen_file:
+                    try:
+                        seen = json.loads(line)
+                    except ValueError:
+                        # Blank lines, and lines cut off by a crash while they were being written
+                        continue
+                    self.seen_summoners.update(seen["summoners"])
+                    self.seen_matches.update(seen["matches"])
+
+        # Everything still to be crawled has been seen too, even if the crawl stopped before it was added to the seen file
+        self._new_summoners = [id_ for id_ in self.frontier if id_ not in self.seen_summoners]
+        self._new_matches = [id_ for id_ in self.pending if id_ not in self.seen_matches]
+        self.seen_summoners.update(self._new_summoners)
+        self.seen_matches.update(self._new_matches)
+
+    def save(self):
+        """
+        Saves the crawl's progress to the checkpoint file
+        """
+        self._save({})
+
+    def _save(self, in_flight):
+        # Requests which haven't finished are saved as not done yet, so they're made again on resume
+        frontier = [id_ for is_match, id_ in in_flight.values() if not is_match] + list(self.frontier)
+        pending = [id_ for is_match, id_ in in_flight.values() if is_match] + list(self.pending)
+        state = {
+            "frontier": frontier,
+            "pending": pending,
+            "crawled": self.crawled
+        }
+
+        # The checkpoint is replaced in one go, so a crash never leaves a partly written one. It's written before the new IDs are added to the seen file, so a crash in between can only make the crawl request something again, never lose it.
+        cassiopeia.type.api.common.atomic_write(self.checkpoint, json.dumps(state).encode("UTF-8"))
+        if self._new_summoners or self._new_matches:
+            with open(self._seen_path(), "a") as seen_file:
+                # Each line starts with a newline, so one cut off by a crash doesn't run into the next
+                seen_file.write("\n" + json.dumps({"summoners": self._new_summoners, "matches": self._new_matches}))
+            self._new_summoners = []
+            self._new_matches = []
+
+    def _seen_path(self):
+        return self.checkpoint + ".seen"
+
+
+def _timestamp(time):
+    if isinstance(time, datetime.datetime):
+        return int((time - datetime.datetime.utcfromtimestamp(0)).total_seconds() * 1000)
+    return time
+
+
+def _call(method, *args):
+    # Things the API can't find are skipped
+    try:
+        return method(*args)
+    except cassiopeia.type.api.exception.APIError as e:
+        if e.error_code in (400, 404):
+            return None
+        raise
+
+
+def _get_match(match_id):
+    store = cassiopeia.core.requests.get_data_store()
+    match = store.get(cassiopeia.type.core.match.Match, match_id, "matchId")
+    if match is not None:
+        return match
+
+    match = cassiopeia.core.matchapi.get_match(match_id)
+    store.store(match, match_id)
+    return match
+
+
+def _get_match_ids(summoner_id, match_list_args):
+    match_list = cassiopeia.dto.matchlistapi.get_match_list(summoner_id, **match_list_args)
+    return [reference.matchId for reference in match_list.matches]
@@ -5,51 +5,28 @@ import cassiopeia.type.core.common
 import cassiopeia.type.core.match
 import cassiopeia.type.core.matchlist
 
-import time
-from multiprocessing.dummy import Pool as ThreadPool
+import concurrent.futures
+import itertools
 
 
-def get_match(id_):
+def get_match(id_, include_timeline=False, tournament_code=""):
     """
     Gets a match
 
     Args:
         id_ (int | MatchReference): the ID of or reference to the match to get
-        include_timeline (bool): whether to include timeline data in the returned match
-        tournament_code (str): the tournament code if the match to be retrieved is from a tournament
+        include_timeline (bool): whether to include timeline data in the returned match (default False)
+        tournament_code (str): the tournament code if the match to be retrieved is from a tournament (default "")
 
     Returns:
         Match: the match
     """
-    include_timeline=False
-    tournament_code=""
-    
     if isinstance(id_, cassiopeia.type.core.matchlist.MatchReference):
         id_ = id_.id
 
-    #match = cassiopeia.core.requests.data_store.get(cassiopeia.type.core.match.Match, id_, "matchId")
-    #if match and (match.timeline or not include_timeline):
-    #    return match
-
     match = cassiopeia.dto.matchapi.get_match(id_, include_timeline, tournament_code)
-
-    # Load required data if loading policy is eager
-    if cassiopeia.core.requests.load_policy is cassiopeia.type.core.common.LoadPolicy.eager:
-        cassiopeia.riotapi.get_items() if match.item_ids else None
-        cassiopeia.riotapi.get_champions() if match.champion_ids else None
-        cassiopeia.riotapi.get_masteries() if match.mastery_ids else None
-        cassiopeia.riotapi.get_runes() if match.rune_ids else None
-        summoner_ids = match.summoner_ids
-        cassiopeia.riotapi.get_summoners_by_id(list(summoner_ids)) if summoner_ids else None
-        cassiopeia.riotapi.get_summoner_spells() if match.summoner_spell_ids else None
-
-    match = cassiopeia.type.core.match.Match(match)
-    #cassiopeia.core.requests.data_store.store(match, id_)
-
-    #print('Finished with match, now return')
-    return match
-
-
+    load_required_data([match])
+    return cassiopeia.type.core.match.Match(match)
 
 
 def get_matches(ids, include_timeline=False, tournament_code=""):
@@ -66,7 +43,7 @@ def get_matches(ids, include_timeline=False, tournament_code=""):
     """
     ids = [ref.id if isinstance(ref, cassiopeia.type.core.matchlist.MatchReference) else ref for ref in ids]
 
-    matches = cassiopeia.core.requests.data_store.get(cassiopeia.type.core.match.Match, ids, "matchId")
+    matches = cassiopeia.core.requests.get_data_store().get(cassiopeia.type.core.match.Match, ids, "matchId")
 
     # Find which matches weren't cached
     missing = []
@@ -79,58 +56,121 @@ def get_matches(ids, include_timeline=False, tournament_code=""):
     if not missing:
         return matches
 
-    # Initialize eager loading variables appropriately
-    if cassiopeia.core.requests.load_policy is cassiopeia.type.core.common.LoadPolicy.eager:
-        item_ids = set()
-        champion_ids = set()
-        mastery_ids = set()
-        rune_ids = set()
-        summoner_ids = set()
-        summoner_spell_ids = set()
-
-    # Make requests to get them
-    #print('Set pool')
-    pool = ThreadPool(25)
-    print("Make {0} requests to get the missing matches".format(len(missing)))
-    pool_time = time.time()
-    match = pool.map_async(get_match, missing).get()
-    time_taken = time.time() - pool_time
-    print("Pool(25) closed within {0} seconds".format(time_taken))
-    #print(match)
-    #print('Close and join pool')
-    pool.close()
-    pool.join()
-
-    
+    # Make requests to get them, then load the data they refer to for all of them at once
+    fetched = cassiopeia.core.requests.map_concurrently(lambda id_: cassiopeia.dto.matchapi.get_match(id_, include_timeline, tournament_code), missing)
+    load_required_data(fetched)
+    fetched = [cassiopeia.type.core.match.Match(match) for match in fetched]
     for i in range(len(missing)):
-        #match = cassiopeia.type.core.match.Match(cassiopeia.dto.matchapi.get_match(missing[i], include_timeline, tournament_code))
-        matches[loc[i]] = match[i]
-        missing[i] = match[i]
-
-        if cassiopeia.core.requests.load_policy is cassiopeia.type.core.common.LoadPolicy.eager:
-            item_ids = item_ids | match.data.item_ids
-            champion_ids = champion_ids | match.data.champion_ids
-            mastery_ids = mastery_ids | match.data.mastery_ids
-            rune_ids = rune_ids | match.data.rune_ids
-            summoner_ids = summoner_ids | match.data.summoner_ids
-            summoner_spell_ids = summoner_spell_ids | match.data.summoner_spell_ids
-
-    # Load required data if loading policy is eager
-    if cassiopeia.core.requests.load_policy is cassiopeia.type.core.common.LoadPolicy.eager:
-        cassiopeia.riotapi.get_items() if item_ids else None
-        cassiopeia.riotapi.get_champions() if champion_ids else None
-        cassiopeia.riotapi.get_masteries() if mastery_ids else None
-        cassiopeia.riotapi.get_runes() if rune_ids else None
-        cassiopeia.riotapi.get_summoners_by_id(list(summoner_ids)) if summoner_ids else None
-        cassiopeia.riotapi.get_summoner_spells() if summoner_spell_ids else None
-
-    sql_time = time.time()
-    cassiopeia.core.requests.data_store.store(missing, [match.id for match in missing])
-    time_taken = time.time() - sql_time
-    print("SQL data_store finished within {0} seconds".format(time_taken))
+        matches[loc[i]] = fetched[i]
+
+    cassiopeia.core.requests.get_data_store().store(fetched, [match.id for match in fetched])
     return matches
 
 
+def load_required_data(matches):
+    """
+    Loads the data the matches refer to (items, champions, summoners, etc.) if the load policy is eager. Both riotapi and asyncriotapi use this, so their matches come back the same.
+
+    Args:
+        matches (list<MatchDetail>): the matches
+    """
+    if cassiopeia.core.requests.load_policy is not cassiopeia.type.core.common.LoadPolicy.eager:
+        return
+
+    item_ids = set()
+    champion_ids = set()
+    mastery_ids = set()
+    rune_ids = set()
+    summoner_ids = set()
+    summoner_spell_ids = set()
+    for match in matches:
+        item_ids |= match.item_ids
+        champion_ids |= match.champion_ids
+        mastery_ids |= match.mastery_ids
+        rune_ids |= match.rune_ids
+        summoner_ids |= match.summoner_ids
+        summoner_spell_ids |= match.summoner_spell_ids
+
+    cassiopeia.riotapi.get_items() if item_ids else None
+    cassiopeia.riotapi.get_champions() if champion_ids else None
+    cassiopeia.riotapi.get_masteries() if mastery_ids else None
+    cassiopeia.riotapi.get_runes() if rune_ids else None
+    cassiopeia.riotapi.get_summoners_by_id(list(summoner_ids)) if summoner_ids else None
+    cassiopeia.riotapi.get_summoner_spells() if summoner_spell_ids else None
+
+
+def iter_matches(ids, ordered=False, max_in_flight=25):
+    """
+    Gets a bunch of matches, yielding each one as soon as it's ready instead of waiting for all of them. At most max_in_flight matches are requested or waiting to be yielded at a time, so memory use doesn't grow with the number of matches, and each match is stored in the data store as soon as it arrives. The requests are made on the shared thread pool (see riotapi.set_worker_count).
+
+    Args:
+        ids (iterable<int> | iterable<MatchReference>): the IDs of or references to the matches to get
+        ordered (bool): whether to yield the matches in the same order as the IDs. Otherwise they're yielded in the order they arrive, so one slow match doesn't hold up the others. (default False)
+        max_in_flight (int): the maximum number of matches to request or hold at a time (default 25)
+
+    Returns:
+        generator<Match>: the matches
+    """
+    lookups = _look_up_matches(ids, max_in_flight)
+    waiting = {}
+    ready = {}
+    next_position = 0
+    exhausted = False
+    try:
+        while True:
+            # Matches waiting to be yielded count against the limit too, so an ordered iteration can't get too far ahead of a slow match
+            while not exhausted and len(waiting) + len(ready) < max_in_flight:
+                try:
+                    position, id_, match = next(lookups)
+                except StopIteration:
+                    exhausted = True
+                    break
+                if match is not None:
+                    ready[position] = match
+                else:
+                    waiting[cassiopeia.core.requests.submit(_fetch_match, id_)] = position
+
+            if ordered:
+                while next_position in ready:
+                    yield ready.pop(next_position)
+                    next_position += 1
+            else:
+                for position in list(ready):
+                    yield ready.pop(position)
+
+            if not waiting:
+                if exhausted and not ready:
+                    return
+                continue
+
+            done, _ = concurrent.futures.wait(list(waiting), return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                ready[waiting.pop(future)] = future.result()
+    finally:
+        for future in waiting:
+            future.cancel()
+
+
+def _look_up_matches(ids, chunk_size):
+    # Yields (position, ID, match from the data store or None) for each ID, looking them up in the data store a chunk at a time
+    ids = iter(ids)
+    position = 0
+    while True:
+        chunk = [ref.id if isinstance(ref, cassiopeia.type.core.matchlist.MatchReference) else ref for ref in itertools.islice(ids, chunk_size)]
+        if not chunk:
+            return
+        for id_, match in zip(chunk, cassiopeia.core.requests.get_data_store().get(cassiopeia.type.core.match.Match, chunk, "matchId")):
+            yield position, id_, match
+            position += 1
+
+
+def _fetch_match(id_):
+    # Gets a match from the API and stores it straight away
+    match = get_match(id_)
+    cassiopeia.core.requests.get_data_store().store(match, match.id)
+    return match
+
+
 def get_tournament_match_ids(tournament_code):
     """
     Gets the IDs for a tournament's matches
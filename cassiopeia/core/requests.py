@@ -1,8 +1,129 @@
+import concurrent.futures
+import sys
+import threading
+
+import cassiopeia.dto.requests
 import cassiopeia.type.core.common
 import cassiopeia.type.api.store
 
 load_policy = cassiopeia.type.core.common.LoadPolicy.eager
 data_store = cassiopeia.type.api.store.Cache()
+batch_window = 0
+workers = 25
+_batchers = {}
+_batchers_lock = threading.Lock()
+_executor = None
+_executor_lock = threading.Lock()
+_worker = threading.local()
+
+
+def get_data_store():
+    """
+    Gets the data store for the calling thread, which is the active client's data store if one is active
+
+    Returns:
+        DataStore: the data store
+    """
+    client = cassiopeia.dto.requests.get_client()
+    return client.data_store if client else data_store
+
+
+def get_executor():
+    """
+    Gets the thread pool shared by the calls which make several requests at once (e.g. get_matches), starting it the first time it's needed
+
+    Returns:
+        ThreadPoolExecutor: the thread pool
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = concurrent.futures.ThreadPoolExecutor(workers)
+    return _executor
+
+
+def set_workers(count):
+    """
+    Sets the number of threads in the shared thread pool. The current pool finishes the work it already has and a new one is started when it's next needed.
+
+    Args:
+        count (int): the number of threads
+    """
+    global workers, _executor
+    with _executor_lock:
+        workers = count
+        old, _executor = _executor, None
+    if old:
+        old.shutdown(wait=False)
+
+
+def submit(method, *args):
+    """
+    Schedules a call on the shared thread pool, with the calling thread's client active. Calls made from the pool's own threads are run straight away on the calling thread instead, so work waiting on the pool can't use up all of its threads.
+
+    Args:
+        method (function): the method to call
+        *args (any...): the arguments to call the method with
+
+    Returns:
+        Future: the result of the call
+    """
+    if not getattr(_worker, "active", False):
+        return get_executor().submit(_as_worker(cassiopeia.dto.requests.bind_client(method)), *args)
+
+    future = concurrent.futures.Future()
+    try:
+        future.set_result(method(*args))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+def map_concurrently(method, args):
+    """
+    Calls a method on each of a list of arguments using the shared thread pool, with the calling thread's client active. Calls made from the pool's own threads are run one after another on the calling thread instead, so work waiting on the pool can't use up all of its threads.
+
+    Args:
+        method (function): the method to call
+        args (list<any>): the arguments to call the method on
+
+    Returns:
+        list<any>: the results, in the same order as the arguments
+    """
+    if len(args) < 2 or getattr(_worker, "active", False):
+        return [method(arg) for arg in args]
+    return list(get_executor().map(_as_worker(cassiopeia.dto.requests.bind_client(method)), args))
+
+
+def fan_out(clients, method, *args, **kwargs):
+    """
+    Calls the same function for several clients in parallel, each on its own thread. Since each region has its own rate limits, a workload split across regions runs that many times faster. The threads aren't part of the shared thread pool, so the bulk calls the function makes (e.g. get_matches) still use the pool to make their requests at the same time.
+
+    Args:
+        clients (list<Client>): the clients to call the function with
+        method (function): the function to call (e.g. a crawler's main loop)
+        *args (any...): the arguments to pass to the function
+        **kwargs (any...): the keyword arguments to pass to the function
+
+    Returns:
+        list<any>: the result of the function for each client, in the same order as the clients
+    """
+    if not clients:
+        return []
+    with concurrent.futures.ThreadPoolExecutor(len(clients)) as executor:
+        return list(executor.map(lambda client: client.call(method, *args, **kwargs), clients))
+
+
+def _as_worker(method):
+    # Marks the thread as running work for the shared pool while it calls the method, so calls it makes to the pool run inline. (ThreadPoolExecutor only takes an initializer from Python 3.7.)
+    def call(*args):
+        _worker.active = True
+        try:
+            return method(*args)
+        finally:
+            _worker.active = False
+    return call
 
 
 def call_with_ensured_size(method, max_size, arg):
@@ -20,17 +141,108 @@ def call_with_ensured_size(method, max_size, arg):
     if not isinstance(arg, list) or len(arg) <= max_size:
         return method(arg)
 
-    results = method(arg[0:max_size])
-    i = max_size
-
-    if isinstance(results, list):
-        while(i < len(arg)):
-            sublist = arg[i:i + max_size]
-            results = results + method(sublist)
-            i += max_size
-    elif isinstance(results, dict):
-        while(i < len(arg)):
-            sublist = arg[i:i + max_size]
-            results.update(method(sublist))
-            i += max_size
-    return results
+    # The chunks are requested at the same time
+    chunks = [arg[i:i + max_size] for i in range(0, len(arg), max_size)]
+    results = map_concurrently(method, chunks)
+
+    if isinstance(results[0], list):
+        return [result for chunk in results for result in chunk]
+    elif isinstance(results[0], dict):
+        for chunk in results[1:]:
+            results[0].update(chunk)
+    return results[0]
+
+
+def get_batched(method, id_):
+    """
+    Calls a method which takes a list of up to 40 IDs for a single ID. If batching is on (see riotapi.set_batch_window), calls for single IDs made by different threads around the same time are combined into one request.
+
+    Args:
+        method (function): the method to call, which returns a dict of results keyed by the IDs as strings
+        id_ (int): the ID to get the result for
+
+    Returns:
+        dict<str, any>: the result for the ID, keyed by the ID as a string (empty if there was no result)
+    """
+    if not batch_window:
+        return method(id_)
+
+    batcher = _batchers.get(method)
+    if not batcher:
+        with _batchers_lock:
+            batcher = _batchers.setdefault(method, RequestBatcher(method))
+    batcher.window = batch_window
+
+    result = batcher.get(id_)
+    return {str(id_): result} if result is not None else {}
+
+
+class _Batch(object):
+    def __init__(self):
+        self.ids = []
+        self.full = threading.Event()
+        self.done = threading.Event()
+        self.results = None
+        self.error = None
+
+
+class RequestBatcher(object):
+    """
+    Combines calls for single IDs into calls for lists of IDs. The first thread to ask for an ID waits for the window to pass (or for the batch to fill up), then makes one call for every ID asked for in the meantime and hands each thread its result. No background threads are used.
+    """
+
+    def __init__(self, method, max_size=40, window=0.05):
+        """
+        Args:
+            method (function): the method to call, which takes a list of IDs and returns a dict of results keyed by the IDs as strings
+            max_size (int): the most IDs to put in one call (default 40)
+            window (float): how long to wait for more IDs before making a call, in seconds (default 0.05)
+        """
+        self.method = method
+        self.max_size = max_size
+        self.window = window
+        self.lock = threading.Lock()
+        self._batches = {}
+
+    def get(self, id_):
+        """
+        Gets the result for an ID, as part of a batch
+
+        Args:
+            id_ (int): the ID to get the result for
+
+        Returns:
+            any: the result for the ID, or None if there was none
+        """
+        # Batches are kept per client since they'll go to the region of the thread making the call
+        client = cassiopeia.dto.requests.get_client()
+        with self.lock:
+            batch = self._batches.get(client)
+            leader = batch is None
+            if leader:
+                batch = _Batch()
+                self._batches[client] = batch
+            if id_ not in batch.ids:
+                batch.ids.append(id_)
+            if len(batch.ids) >= self.max_size:
+                del self._batches[client]
+                batch.full.set()
+
+        if leader:
+            batch.full.wait(self.window)
+            with self.lock:
+                if self._batches.get(client) is batch:
+                    del self._batches[client]
+
+            try:
+                batch.results = self.method(batch.ids)
+            except BaseException:
+                batch.error = sys.exc_info()[1]
+            finally:
+                batch.done.set()
+        else:
+            batch.done.wait()
+
+        if batch.error is not None:
+            raise batch.error
+        return batch.results.get(str(id_))
@@ -1,13 +1,109 @@
+import json
+import threading
+import weakref
+import zlib
+
 import cassiopeia.riotapi
+import cassiopeia.dto.requests
 import cassiopeia.dto.staticdataapi
 import cassiopeia.core.requests
+import cassiopeia.type.api.common
+import cassiopeia.type.api.exception
 import cassiopeia.type.core.common
 import cassiopeia.type.core.staticdata
+import cassiopeia.type.dto.common
+import cassiopeia.type.dto.staticdata
 
 _ignore_items = {0, 1080, 1304, 1309, 1314, 1319, 1324, 1329, 2004, 2037, 2039, 2040, 3005, 3039, 3123, 3128, 3131, 3160, 3166, 3167, 3168, 3169, 3175, 3176, 3171, 3186, 3188, 3205, 3206, 3207, 3209, 3210, 3244, 3405, 3406, 3407, 3408, 3409, 3410, 3411, 3412, 3413, 3414, 3415, 3416, 3417, 3419, 3420}
 _ignore_runes = {8028}
 _ignore_summoner_spells = {10}
 
+# The static data kept in snapshots, as (name, Dto list type, core type, Dto getter)
+_snapshot_types = [
+    ("champions", cassiopeia.type.dto.staticdata.ChampionList, cassiopeia.type.core.staticdata.Champion, cassiopeia.dto.staticdataapi.get_champions),
+    ("items", cassiopeia.type.dto.staticdata.ItemList, cassiopeia.type.core.staticdata.Item, cassiopeia.dto.staticdataapi.get_items),
+    ("masteries", cassiopeia.type.dto.staticdata.MasteryList, cassiopeia.type.core.staticdata.Mastery, cassiopeia.dto.staticdataapi.get_masteries),
+    ("runes", cassiopeia.type.dto.staticdata.RuneList, cassiopeia.type.core.staticdata.Rune, cassiopeia.dto.staticdataapi.get_runes),
+    ("summoner_spells", cassiopeia.type.dto.staticdata.SummonerSpellList, cassiopeia.type.core.staticdata.SummonerSpell, cassiopeia.dto.staticdataapi.get_summoner_spells)
+]
+_snapshot_format = 2
+
+# Indexes over the complete sets of static data in each data store
+_indexes = weakref.WeakKeyDictionary()
+_indexes_lock = threading.Lock()
+
+
+class _Index(object):
+    # Hash indexes over a complete set of one type of static data, plus inverted indexes by tag and by item recipe
+    def __init__(self, objects):
+        self.objects = objects
+        self.by_id = {}
+        self.by_name = {}
+        self.by_folded_name = {}
+        self.by_key = {}
+        self.by_tag = {}
+        self.builds_into = {}
+        self.components = {}
+
+        for obj in objects:
+            data = obj.data
+            self.by_id[obj.id] = obj
+
+            name = getattr(data, "name", None)
+            if name:
+                self.by_name.setdefault(name, obj)
+                self.by_folded_name.setdefault(_fold(name), obj)
+
+            key = getattr(data, "key", None)
+            if key:
+                self.by_key[key] = obj
+
+            for tag in getattr(data, "tags", None) or []:
+                self.by_tag.setdefault(tag, []).append(obj)
+
+            # Items list their recipe both ways, so both directions can be looked up without scanning
+            for id_ in getattr(data, "from_", None) or []:
+                self.builds_into.setdefault(int(id_), []).append(obj)
+            for id_ in getattr(data, "into", None) or []:
+                self.components.setdefault(int(id_), []).append(obj)
+
+
+def _find_by_name(index, name):
+    # Exact matches come first, then matches ignoring case
+    found = index.by_name.get(name)
+    return found if found is not None else index.by_folded_name.get(_fold(name))
+
+
+def _fold(name):
+    return name.casefold() if hasattr(name, "casefold") else name.lower()
+
+
+def _store_all(class_, objects):
+    # Stores a complete set of static data and indexes it
+    store = cassiopeia.core.requests.get_data_store()
+    store.store(objects, [obj.id for obj in objects], [class_])
+    index = _Index(objects)
+    with _indexes_lock:
+        _indexes.setdefault(store, {})[class_] = index
+    return index
+
+
+def _get_index(class_, get_all):
+    # Gets the indexes for a type of static data, loading the data (with get_all) if it isn't loaded yet
+    store = cassiopeia.core.requests.get_data_store()
+    with _indexes_lock:
+        index = _indexes.get(store, {}).get(class_)
+    if index is not None and store.has_all(class_):
+        return index
+
+    # Downloading the data indexes it. Data which was already in the data store (e.g. a database) is indexed here.
+    objects = get_all()
+    with _indexes_lock:
+        indexes = _indexes.setdefault(store, {})
+        if class_ not in indexes or indexes[class_] is index:
+            indexes[class_] = _Index(objects)
+        return indexes[class_]
+
 
 def get_champion_by_id(id_):
     """
@@ -19,7 +115,7 @@ def get_champion_by_id(id_):
     Returns:
         Champion: the champion
     """
-    champion = cassiopeia.core.requests.data_store.get(cassiopeia.type.core.staticdata.Champion, id_, "id")
+    champion = cassiopeia.core.requests.get_data_store().get(cassiopeia.type.core.staticdata.Champion, id_, "id")
     if champion:
         return champion
 
@@ -30,7 +126,7 @@ def get_champion_by_id(id_):
         cassiopeia.riotapi.get_items() if champion.item_ids else None
 
     champion = cassiopeia.type.core.staticdata.Champion(champion)
-    cassiopeia.core.requests.data_store.store(champion, id_)
+    cassiopeia.core.requests.get_data_store().store(champion, id_)
     return champion
 
 
@@ -44,11 +140,20 @@ def get_champion_by_name(name):
     Returns:
         Champion: the champion
     """
-    champions = get_champions()
-    for champion in champions:
-        if champion.name == name:
-            return champion
-    return None
+    return _find_by_name(_get_index(cassiopeia.type.core.staticdata.Champion, get_champions), name)
+
+
+def get_champion_by_key(key):
+    """
+    Gets a champion by key (e.g. "MonkeyKing" for Wukong)
+
+    Args:
+        key (str): the key of the champion to get
+
+    Returns:
+        Champion: the champion
+    """
+    return _get_index(cassiopeia.type.core.staticdata.Champion, get_champions).by_key.get(key)
 
 
 def get_champions():
@@ -58,8 +163,8 @@ def get_champions():
     Returns:
         list<Champion>: all the champions
     """
-    if cassiopeia.core.requests.data_store.has_all(cassiopeia.type.core.staticdata.Champion):
-        return cassiopeia.core.requests.data_store.get_all(cassiopeia.type.core.staticdata.Champion)
+    if cassiopeia.core.requests.get_data_store().has_all(cassiopeia.type.core.staticdata.Champion):
+        return cassiopeia.core.requests.get_data_store().get_all(cassiopeia.type.core.staticdata.Champion)
 
     champions = cassiopeia.dto.staticdataapi.get_champions()
 
@@ -68,7 +173,7 @@ def get_champions():
         cassiopeia.riotapi.get_items() if champions.item_ids else None
 
     champions = [cassiopeia.type.core.staticdata.Champion(champ[1]) for champ in champions.data.items()]
-    cassiopeia.core.requests.data_store.store(champions, [champ.id for champ in champions], [cassiopeia.type.core.staticdata.Champion])
+    _store_all(cassiopeia.type.core.staticdata.Champion, champions)
     return champions
 
 
@@ -82,15 +187,8 @@ def get_champions_by_id(ids):
     Returns:
         list<Champion>: the requested champions
     """
-    champions = {champ.id: champ for champ in get_champions()}
-    results = []
-    for id_ in ids:
-        try:
-            champ = champions[id_]
-        except KeyError:
-            champ = None
-        results.append(champ)
-    return results
+    by_id = _get_index(cassiopeia.type.core.staticdata.Champion, get_champions).by_id
+    return [by_id.get(id_) for id_ in ids]
 
 
 def get_champions_by_name(names):
@@ -103,18 +201,21 @@ def get_champions_by_name(names):
     Returns:
         list<Champion>: the requested champions
     """
-    indices = {names[i]: i for i in range(len(names))}
+    index = _get_index(cassiopeia.type.core.staticdata.Champion, get_champions)
+    return [_find_by_name(index, name) for name in names]
+
+
+def get_champions_by_tag(tag):
+    """
+    Gets the champions with a tag (e.g. "Mage")
 
-    champions = get_champions()
-    results = [None for _ in range(len(names))]
-    for champion in champions:
-        try:
-            index = indices[champion.name]
-            results[index] = champion
-        except KeyError:
-            pass
+    Args:
+        tag (str): the tag to get champions for
 
-    return results
+    Returns:
+        list<Champion>: the champions with the tag
+    """
+    return list(_get_index(cassiopeia.type.core.staticdata.Champion, get_champions).by_tag.get(tag, []))
 
 
 def get_item(id_):
@@ -130,7 +231,7 @@ def get_item(id_):
     if id_ in _ignore_items:
         return None
 
-    item = cassiopeia.core.requests.data_store.get(cassiopeia.type.core.staticdata.Item, id_, "id")
+    item = cassiopeia.core.requests.get_data_store().get(cassiopeia.type.core.staticdata.Item, id_, "id")
     if item:
         return item
 
@@ -144,7 +245,7 @@ def get_item(id_):
     else:
         item = cassiopeia.dto.staticdataapi.get_item(id_)
         item = cassiopeia.type.core.staticdata.Item(item)
-        cassiopeia.core.requests.data_store.store(item, id_)
+        cassiopeia.core.requests.get_data_store().store(item, id_)
 
     return item
 
@@ -160,26 +261,58 @@ def get_items(ids=None):
         list<Item>: the items
     """
     if ids is not None:
-        items = {item.id: item for item in get_items()}
-        results = []
-        for id_ in ids:
-            try:
-                item = items[id_]
-            except KeyError:
-                item = None
-            results.append(item)
-        return results
+        by_id = _get_index(cassiopeia.type.core.staticdata.Item, get_items).by_id
+        return [by_id.get(id_) for id_ in ids]
     else:
-        if cassiopeia.core.requests.data_store.has_all(cassiopeia.type.core.staticdata.Item):
-            return cassiopeia.core.requests.data_store.get_all(cassiopeia.type.core.staticdata.Item)
+        if cassiopeia.core.requests.get_data_store().has_all(cassiopeia.type.core.staticdata.Item):
+            return cassiopeia.core.requests.get_data_store().get_all(cassiopeia.type.core.staticdata.Item)
 
         items = cassiopeia.dto.staticdataapi.get_items()
         items = [cassiopeia.type.core.staticdata.Item(item[1]) for item in items.data.items()]
 
-        cassiopeia.core.requests.data_store.store(items, [item.id for item in items], [cassiopeia.type.core.staticdata.Item])
+        _store_all(cassiopeia.type.core.staticdata.Item, items)
         return items
 
 
+def get_items_by_tag(tag):
+    """
+    Gets the items with a tag (e.g. "Boots")
+
+    Args:
+        tag (str): the tag to get items for
+
+    Returns:
+        list<Item>: the items with the tag
+    """
+    return list(_get_index(cassiopeia.type.core.staticdata.Item, get_items).by_tag.get(tag, []))
+
+
+def get_items_built_from(id_):
+    """
+    Gets the items which have an item as a component
+
+    Args:
+        id_ (int): the ID of the component
+
+    Returns:
+        list<Item>: the items which are built from it
+    """
+    return list(_get_index(cassiopeia.type.core.staticdata.Item, get_items).builds_into.get(id_, []))
+
+
+def get_item_components(id_):
+    """
+    Gets the components of an item
+
+    Args:
+        id_ (int): the ID of the item
+
+    Returns:
+        list<Item>: the item's components
+    """
+    return list(_get_index(cassiopeia.type.core.staticdata.Item, get_items).components.get(id_, []))
+
+
 def get_language_strings():
     """
     Gets the locale-based string replacements for various game constants
@@ -220,7 +353,7 @@ def get_mastery(id_):
     Returns:
         Mastery: the mastery
     """
-    mastery = cassiopeia.core.requests.data_store.get(cassiopeia.type.core.staticdata.Mastery, id_, "id")
+    mastery = cassiopeia.core.requests.get_data_store().get(cassiopeia.type.core.staticdata.Mastery, id_, "id")
     if mastery:
         return mastery
 
@@ -232,7 +365,7 @@ def get_mastery(id_):
 
     mastery = cassiopeia.type.core.staticdata.Mastery(mastery)
 
-    cassiopeia.core.requests.data_store.store(mastery, id_)
+    cassiopeia.core.requests.get_data_store().store(mastery, id_)
     return mastery
 
 
@@ -247,23 +380,16 @@ def get_masteries(ids=None):
         list<Mastery>: the masteries
     """
     if ids is not None:
-        masteries = {mastery.id: mastery for mastery in get_masteries()}
-        results = []
-        for id_ in ids:
-            try:
-                mastery = masteries[id_]
-            except KeyError:
-                mastery = None
-            results.append(mastery)
-        return results
+        by_id = _get_index(cassiopeia.type.core.staticdata.Mastery, get_masteries).by_id
+        return [by_id.get(id_) for id_ in ids]
     else:
-        if cassiopeia.core.requests.data_store.has_all(cassiopeia.type.core.staticdata.Mastery):
-            return cassiopeia.core.requests.data_store.get_all(cassiopeia.type.core.staticdata.Mastery)
+        if cassiopeia.core.requests.get_data_store().has_all(cassiopeia.type.core.staticdata.Mastery):
+            return cassiopeia.core.requests.get_data_store().get_all(cassiopeia.type.core.staticdata.Mastery)
 
         masteries = cassiopeia.dto.staticdataapi.get_masteries()
         masteries = [cassiopeia.type.core.staticdata.Mastery(mastery[1]) for mastery in masteries.data.items()]
 
-        cassiopeia.core.requests.data_store.store(masteries, [mastery.id for mastery in masteries], [cassiopeia.type.core.staticdata.Mastery])
+        _store_all(cassiopeia.type.core.staticdata.Mastery, masteries)
         return masteries
 
 
@@ -290,14 +416,14 @@ def get_rune(id_):
     if id_ in _ignore_runes:
         return None
 
-    rune = cassiopeia.core.requests.data_store.get(cassiopeia.type.core.staticdata.Rune, id_, "id")
+    rune = cassiopeia.core.requests.get_data_store().get(cassiopeia.type.core.staticdata.Rune, id_, "id")
     if rune:
         return rune
 
     rune = cassiopeia.dto.staticdataapi.get_rune(id_)
     rune = cassiopeia.type.core.staticdata.Rune(rune)
 
-    cassiopeia.core.requests.data_store.store(rune, id_)
+    cassiopeia.core.requests.get_data_store().store(rune, id_)
     return rune
 
 
@@ -312,23 +438,16 @@ def get_runes(ids=None):
         list<Rune>: the runes
     """
     if ids is not None:
-        runes = {rune.id: rune for rune in get_runes()}
-        results = []
-        for id_ in ids:
-            try:
-                rune = runes[id_]
-            except KeyError:
-                rune = None
-            results.append(rune)
-        return results
+        by_id = _get_index(cassiopeia.type.core.staticdata.Rune, get_runes).by_id
+        return [by_id.get(id_) for id_ in ids]
     else:
-        if cassiopeia.core.requests.data_store.has_all(cassiopeia.type.core.staticdata.Rune):
-            return cassiopeia.core.requests.data_store.get_all(cassiopeia.type.core.staticdata.Rune)
+        if cassiopeia.core.requests.get_data_store().has_all(cassiopeia.type.core.staticdata.Rune):
+            return cassiopeia.core.requests.get_data_store().get_all(cassiopeia.type.core.staticdata.Rune)
 
         runes = cassiopeia.dto.staticdataapi.get_runes()
         runes = [cassiopeia.type.core.staticdata.Rune(rune[1]) for rune in runes.data.items()]
 
-        cassiopeia.core.requests.data_store.store(runes, [rune.id for rune in runes], [cassiopeia.type.core.staticdata.Rune])
+        _store_all(cassiopeia.type.core.staticdata.Rune, runes)
         return runes
 
 
@@ -345,14 +464,14 @@ def get_summoner_spell(id_):
     if id_ in _ignore_summoner_spells:
         return None
 
-    summoner_spell = cassiopeia.core.requests.data_store.get(cassiopeia.type.core.staticdata.SummonerSpell, id_, "id")
+    summoner_spell = cassiopeia.core.requests.get_data_store().get(cassiopeia.type.core.staticdata.SummonerSpell, id_, "id")
     if summoner_spell:
         return summoner_spell
 
     summoner_spell = cassiopeia.dto.staticdataapi.get_summoner_spell(id_)
     summoner_spell = cassiopeia.type.core.staticdata.SummonerSpell(summoner_spell)
 
-    cassiopeia.core.requests.data_store.store(summoner_spell, id_)
+    cassiopeia.core.requests.get_data_store().store(summoner_spell, id_)
     return summoner_spell
 
 
@@ -367,23 +486,16 @@ def get_summoner_spells(ids=None):
         list<SummonerSpell>: the summoner spells
     """
     if ids is not None:
-        summoner_spells = {summoner_spell.id: summoner_spell for summoner_spell in get_summoner_spells()}
-        results = []
-        for id_ in ids:
-            try:
-                summoner_spell = summoner_spells[id_]
-            except KeyError:
-                summoner_spell = None
-            results.append(summoner_spell)
-        return results
+        by_id = _get_index(cassiopeia.type.core.staticdata.SummonerSpell, get_summoner_spells).by_id
+        return [by_id.get(id_) for id_ in ids]
     else:
-        if cassiopeia.core.requests.data_store.has_all(cassiopeia.type.core.staticdata.SummonerSpell):
-            return cassiopeia.core.requests.data_store.get_all(cassiopeia.type.core.staticdata.SummonerSpell)
+        if cassiopeia.core.requests.get_data_store().has_all(cassiopeia.type.core.staticdata.SummonerSpell):
+            return cassiopeia.core.requests.get_data_store().get_all(cassiopeia.type.core.staticdata.SummonerSpell)
 
         summoner_spells = cassiopeia.dto.staticdataapi.get_summoner_spells()
         summoner_spells = [cassiopeia.type.core.staticdata.SummonerSpell(summoner_spell[1]) for summoner_spell in summoner_spells.data.items()]
 
-        cassiopeia.core.requests.data_store.store(summoner_spells, [summoner_spell.id for summoner_spell in summoner_spells], [cassiopeia.type.core.staticdata.SummonerSpell])
+        _store_all(cassiopeia.type.core.staticdata.SummonerSpell, summoner_spells)
         return summoner_spells
 
 
@@ -395,3 +507,67 @@ def get_versions():
         list<str>: the valid versions
     """
     return cassiopeia.dto.staticdataapi.get_versions()
+
+
+def save_static_data(path):
+    """
+    Downloads the champions, items, masteries, runes, and summoner spells for the current version and locale, loads them into the data store, and saves them to one compressed snapshot file, which load_static_data can load without calling the API
+
+    Args:
+        path (str): the file to save the snapshot to
+
+    Returns:
+        str: the static data version the snapshot is for
+    """
+    realm = cassiopeia.dto.staticdataapi.get_realm()
+    snapshot = {
+        "format": _snapshot_format,
+        "version": realm.v,
+        "locale": cassiopeia.dto.staticdataapi._locale or realm.l,
+        "region": cassiopeia.dto.requests.get_region()
+    }
+    for name, list_type, type_, get in _snapshot_types:
+        dtos = get()
+        snapshot[name] = json.loads(dtos.to_json(indent=None, default=_api_fields))
+
+        # It's all been downloaded anyway, so it's loaded into the data store too
+        _store_all(type_, [type_(dto) for dto in dtos.data.values()])
+
+    # Workers loading the snapshot never read a partly written one
+    cassiopeia.type.api.common.atomic_write(path, zlib.compress(json.dumps(snapshot, separators=(",", ":")).encode("UTF-8"), 9))
+    return realm.v
+
+
+def _api_fields(dto):
+    # Gets a Dto's fields under the names the API uses, so the snapshot loads back into the same Dtos. Item recipes are kept in from_ since from is a keyword.
+    fields = {k: v for k, v in cassiopeia.type.dto.common._fields(dto).items() if not k.startswith("_")}
+    if "from_" in fields:
+        fields["from"] = fields.pop("from_")
+    return fields
+
+
+def load_static_data(path, version=None, locale=None):
+    """
+    Loads a snapshot saved by save_static_data into the data store, so the static data doesn't have to be downloaded
+
+    Args:
+        path (str): the snapshot file to load
+        version (str): the static data version the snapshot has to be for, or None to accept any version (default None)
+        locale (str): the locale the snapshot has to be for, or None to accept any locale (default None)
+
+    Returns:
+        str: the static data version the snapshot is for
+    """
+    with open(path, "rb") as snapshot_file:
+        snapshot = json.loads(zlib.decompress(snapshot_file.read()).decode("UTF-8"))
+
+    if snapshot.get("format") != _snapshot_format:
+        raise cassiopeia.type.api.exception.CassiopeiaException("{path} isn't a static data snapshot this version of Cassiopeia can read.".format(path=path))
+    if version and snapshot["version"] != version:
+        raise cassiopeia.type.api.exception.CassiopeiaException("The snapshot is for version {snapshot}, not {version}.".format(snapshot=snapshot["version"], version=version))
+    if locale and snapshot["locale"] != locale:
+        raise cassiopeia.type.api.exception.CassiopeiaException("The snapshot is for locale {snapshot}, not {locale}.".format(snapshot=snapshot["locale"], locale=locale))
+
+    for name, list_type, type_, get in _snapshot_types:
+        _store_all(type_, [type_(dto) for dto in list_type(snapshot[name]).data.values()])
+    return snapshot["version"]
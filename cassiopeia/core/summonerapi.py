@@ -6,7 +6,10 @@ import cassiopeia.type.core.summoner
 
 
 def __get_mastery_pages_by_id(ids):
-    pages = cassiopeia.core.requests.call_with_ensured_size(cassiopeia.dto.summonerapi.get_summoner_masteries, 40, ids)
+    if isinstance(ids, list):
+        pages = cassiopeia.core.requests.call_with_ensured_size(cassiopeia.dto.summonerapi.get_summoner_masteries, 40, ids)
+    else:
+        pages = cassiopeia.core.requests.get_batched(cassiopeia.dto.summonerapi.get_summoner_masteries, ids)
 
     # Load required data if loading policy is eager
     if cassiopeia.core.requests.load_policy is cassiopeia.type.core.common.LoadPolicy.eager:
@@ -38,7 +41,10 @@ def get_mastery_pages(summoners):
 
 
 def __get_rune_pages_by_id(ids):
-    pages = cassiopeia.core.requests.call_with_ensured_size(cassiopeia.dto.summonerapi.get_summoner_runes, 40, ids)
+    if isinstance(ids, list):
+        pages = cassiopeia.core.requests.call_with_ensured_size(cassiopeia.dto.summonerapi.get_summoner_runes, 40, ids)
+    else:
+        pages = cassiopeia.core.requests.get_batched(cassiopeia.dto.summonerapi.get_summoner_runes, ids)
 
     # Load required data if loading policy is eager
     if cassiopeia.core.requests.load_policy is cassiopeia.type.core.common.LoadPolicy.eager:
@@ -79,18 +85,18 @@ def get_summoner_by_id(id_):
     Returns:
         Summoner: the summoner
     """
-    summoner = cassiopeia.core.requests.data_store.get(cassiopeia.type.core.summoner.Summoner, id_, "id")
+    summoner = cassiopeia.core.requests.get_data_store().get(cassiopeia.type.core.summoner.Summoner, id_, "id")
     if summoner:
         return summoner
 
     try:
-        summoner = cassiopeia.dto.summonerapi.get_summoners_by_id(id_)[str(id_)]
+        summoner = cassiopeia.core.requests.get_batched(cassiopeia.dto.summonerapi.get_summoners_by_id, id_)[str(id_)]
         summoner = cassiopeia.type.core.summoner.Summoner(summoner)
     except KeyError:
         return None
 
-    cassiopeia.core.requests.data_store.store(summoner, id_)
-    cassiopeia.core.requests.data_store.store(summoner, summoner.name)
+    cassiopeia.core.requests.get_data_store().store(summoner, id_)
+    cassiopeia.core.requests.get_data_store().store(summoner, summoner.name)
     return summoner
 
 
@@ -104,7 +110,7 @@ def get_summoner_by_name(name):
     Returns:
         Summoner: the summoner
     """
-    summoner = cassiopeia.core.requests.data_store.get(cassiopeia.type.core.summoner.Summoner, name, "name")
+    summoner = cassiopeia.core.requests.get_data_store().get(cassiopeia.type.core.summoner.Summoner, name, "name")
     if summoner:
         return summoner
 
@@ -114,8 +120,8 @@ def get_summoner_by_name(name):
     except KeyError:
         return None
 
-    cassiopeia.core.requests.data_store.store(summoner, name)
-    cassiopeia.core.requests.data_store.store(summoner, summoner.id)
+    cassiopeia.core.requests.get_data_store().store(summoner, name)
+    cassiopeia.core.requests.get_data_store().store(summoner, summoner.id)
     return summoner
 
 
@@ -129,7 +135,7 @@ def get_summoners_by_id(ids):
     Returns:
         list<Summoner>: the summoners
     """
-    summoners = cassiopeia.core.requests.data_store.get(cassiopeia.type.core.summoner.Summoner, ids, "id")
+    summoners = cassiopeia.core.requests.get_data_store().get(cassiopeia.type.core.summoner.Summoner, ids, "id")
 
     # Find which summoners weren't cached
     missing = []
@@ -153,8 +159,8 @@ def get_summoners_by_id(ids):
             summoner = None
         summoners[loc[i]] = summoner
 
-    cassiopeia.core.requests.data_store.store(to_store, [summoner.id for summoner in to_store])
-    cassiopeia.core.requests.data_store.store(to_store, [summoner.name for summoner in to_store])
+    cassiopeia.core.requests.get_data_store().store(to_store, [summoner.id for summoner in to_store])
+    cassiopeia.core.requests.get_data_store().store(to_store, [summoner.name for summoner in to_store])
     return summoners
 
 
@@ -168,7 +174,7 @@ def get_summoners_by_name(names):
     Returns:
         list<Summoner>: the summoners
     """
-    summoners = cassiopeia.core.requests.data_store.get(cassiopeia.type.core.summoner.Summoner, names, "name")
+    summoners = cassiopeia.core.requests.get_data_store().get(cassiopeia.type.core.summoner.Summoner, names, "name")
 
     # Find which summoners weren't cached
     missing = []
@@ -192,8 +198,8 @@ def get_summoners_by_name(names):
             summoner = None
         summoners[loc[i]] = summoner
 
-    cassiopeia.core.requests.data_store.store(to_store, [summoner.id for summoner in to_store])
-    cassiopeia.core.requests.data_store.store(to_store, [summoner.name for summoner in to_store])
+    cassiopeia.core.requests.get_data_store().store(to_store, [summoner.id for summoner in to_store])
+    cassiopeia.core.requests.get_data_store().store(to_store, [summoner.name for summoner in to_store])
     return summoners
 
 
@@ -207,11 +213,11 @@ def get_summoner_name(id_):
     Returns:
         str: the summoner's name
     """
-    summoner = cassiopeia.core.requests.data_store.get(cassiopeia.type.core.summoner.Summoner, id_, "id")
+    summoner = cassiopeia.core.requests.get_data_store().get(cassiopeia.type.core.summoner.Summoner, id_, "id")
     if summoner:
         return summoner.name
 
-    return cassiopeia.dto.summonerapi.get_summoner_names(id_)[str(id_)]
+    return cassiopeia.core.requests.get_batched(cassiopeia.dto.summonerapi.get_summoner_names, id_)[str(id_)]
 
 
 def get_summoner_names(ids):
@@ -224,7 +230,7 @@ def get_summoner_names(ids):
     Returns:
         list<str>: the summoners' names
     """
-    summoners = cassiopeia.core.requests.data_store.get(cassiopeia.type.core.summoner.Summoner, ids, "id")
+    summoners = cassiopeia.core.requests.get_data_store().get(cassiopeia.type.core.summoner.Summoner, ids, "id")
     summoners = [summoner.name if summoner else "" for summoner in summoners]
 
     # Find which summoners weren't cached
@@ -0,0 +1,125 @@
+"""
+asyncio counterparts of the dto API functions most used for bulk collection. Each one is a coroutine that returns the same Dto types as its blocking version.
+"""
+
+import urllib.parse
+
+import cassiopeia.dto.requests
+import cassiopeia.dto.asyncrequests
+import cassiopeia.type.dto.match
+import cassiopeia.type.dto.matchlist
+import cassiopeia.type.dto.summoner
+
+
+async def get_match(id_, include_timeline=False, tournament_code=""):
+    """
+    https://developer.riotgames.com/api/methods#!/1014/3442
+
+    Args:
+        id_ (int): the ID of the match to get
+        include_timeline (bool): whether to include timeline data in the returned match
+        tournament_code (str): the tournament code if the match to be retrieved is from a tournament
+
+    Returns:
+        MatchDetail: the match
+    """
+    request = "{version}/match/for-tournament/{id_}" if tournament_code else "{version}/match/{id_}"
+    request = request.format(version=cassiopeia.dto.requests.api_versions["match"], id_=id_)
+
+    params = {"includeTimeline": include_timeline}
+    if tournament_code:
+        params["tournamentCode"] = tournament_code
+
+    return cassiopeia.type.dto.match.MatchDetail(await cassiopeia.dto.asyncrequests.get(request, params, tournament=bool(tournament_code)))
+
+
+async def get_match_list(summoner_id, num_matches=0, begin_index=0, begin_time=0, end_time=0, champion_ids=None, ranked_queues=None, seasons=None):
+    """
+    https://developer.riotgames.com/api/methods#!/1013/3439
+
+    Args:
+        summoner_id (int): the ID of the summoner to get the match history for
+        num_matches (int): the maximum number of matches to retrieve. 0 will get as many as possible. (default 0)
+        begin_index (int): the game index to start from (default 0)
+        begin_time (int): the begin time to use for fetching games specified as epoch milliseconds (default 0)
+        end_time (int): the end time to use for fetching games specified as epoch milliseconds (default 0)
+        champion_ids (int | list<int>): the champion ID(s) to limit the results to (default None)
+        ranked_queues (str | list<str>): the ranked queue(s) to limit the results to ("RANKED_SOLO_5x5", "RANKED_TEAM_3x3", "RANKED_TEAM_5x5") (default None)
+        seasons (str | list<str>): the season(s) to limit the results to ("PRESEASON3", "SEASON3", "PRESEASON2014", "SEASON2014", "PRESEASON2015", "SEASON2015", "PRESEASON2016", "SEASON2016") (default None)
+
+    Returns:
+        MatchList: the summoner's match history
+    """
+    request = "{version}/matchlist/by-summoner/{summoner_id}".format(version=cassiopeia.dto.requests.api_versions["matchlist"], summoner_id=summoner_id)
+
+    params = {}
+    if num_matches:
+        params["endIndex"] = begin_index + num_matches
+    if begin_index or num_matches:
+        params["beginIndex"] = begin_index
+    if begin_time:
+        params["beginTime"] = begin_time
+    if end_time:
+        params["endTime"] = end_time
+    if champion_ids:
+        params["championIds"] = ",".join(champion_ids) if isinstance(champion_ids, list) else str(champion_ids)
+    if ranked_queues:
+        params["rankedQueues"] = ",".join(ranked_queues) if isinstance(ranked_queues, list) else str(ranked_queues)
+    if seasons:
+        params["seasons"] = ",".join(seasons) if isinstance(seasons, list) else str(seasons)
+
+    return cassiopeia.type.dto.matchlist.MatchList(await cassiopeia.dto.asyncrequests.get(request, params))
+
+
+async def get_summoners_by_id(summoner_ids):
+    """
+    https://developer.riotgames.com/api/methods#!/1017/3447
+
+    Args:
+        summoner_ids (int | list<int>): the summoner ID(s) to look up
+
+    Returns:
+        dict<str, Summoner>: the requested summoners
+    """
+    # Can only have 40 summoners max if it's a list
+    if isinstance(summoner_ids, list) and len(summoner_ids) > 40:
+        raise ValueError("Can only get up to 40 summoners at once.")
+
+    id_string = ",".join(str(x) for x in summoner_ids) if isinstance(summoner_ids, list) else str(summoner_ids)
+
+    # Get JSON response
+    request = "{version}/summoner/{ids}".format(version=cassiopeia.dto.requests.api_versions["summoner"], ids=id_string)
+    response = await cassiopeia.dto.asyncrequests.get(request)
+
+    # Convert response to Dto type
+    for id_, summoner in response.items():
+        response[id_] = cassiopeia.type.dto.summoner.Summoner(summoner)
+
+    return response
+
+
+async def get_summoners_by_name(summoner_names):
+    """
+    https://developer.riotgames.com/api/methods#!/1017/3446
+
+    Args:
+        summoner_names (str | list<str>): the summoner name(s) to look up
+
+    Returns:
+        dict<str, Summoner>: the requested summoners
+    """
+    # Can only have 40 summoners max if it's a list
+    if isinstance(summoner_names, list) and len(summoner_names) > 40:
+        raise ValueError("Can only get up to 40 summoners at once.")
+
+    name_string = ",".join(urllib.parse.quote(x) for x in summoner_names) if isinstance(summoner_names, list) else urllib.parse.quote(summoner_names)
+
+    # Get JSON response
+    request = "{version}/summoner/by-name/{names}".format(version=cassiopeia.dto.requests.api_versions["summoner"], names=name_string)
+    response = await cassiopeia.dto.asyncrequests.get(request)
+
+    # Convert response to Dto type
+    for name, summoner in response.items():
+        response[name] = cassiopeia.type.dto.summoner.Summoner(summoner)
+
+    return response
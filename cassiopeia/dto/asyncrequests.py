@@ -0,0 +1,183 @@
+"""
+Handles making non-blocking HTTP requests to the REST API with asyncio and converting the results into a usable format. The API key, region, and API versions are shared with cassiopeia.dto.requests.
+"""
+
+import asyncio
+import urllib.error
+
+import cassiopeia.dto.requests
+import cassiopeia.type.api.exception
+import cassiopeia.type.api.asyncrates
+import cassiopeia.type.api.asyncconnection
+
+
+rate_limiter = None
+tournament_rate_limiter = None
+connection_pool = cassiopeia.type.api.asyncconnection.AsyncConnectionPool()
+_in_flight = {}
+
+
+async def get(request, params={}, static=False, include_base=True, tournament=False):
+    return await make_request(request=request, method="GET", params=params, static=static, include_base=include_base, tournament=tournament)
+
+
+async def put(request, payload, params={}, include_base=True, tournament=False):
+    return await make_request(request=request, method="PUT", payload=payload, params=params, include_base=include_base, tournament=tournament)
+
+
+async def post(request, payload, params={}, include_base=True, tournament=False):
+    return await make_request(request=request, method="POST", payload=payload, params=params, include_base=include_base, tournament=tournament)
+
+
+async def make_request(request, method, params={}, payload=None, static=False, include_base=True, tournament=False):
+    """
+    Makes a rate-limited HTTP request to the Riot API without blocking the event loop and returns the result
+
+    Args:
+        request (str): the request string
+        method (str): the HTTP method to use
+        params (dict<str, any>): the path parameters to send with the request (default {})
+        payload (CassiopeiaDto | CassiopeiaObject): the payload to send with the POST or PUT request (default None)
+        static (bool): whether this is a call to a static (non-rate-limited) API (default False)
+        include_base (bool): whether to prepend https://{server}.api.pvp.net/api/lol/{region}/ to the request (default True)
+        tournament (bool): whether to use the tournament API rate limit (default False)
+
+    Returns:
+        dict: the JSON response from the Riot API as a dict
+    """
+    url = cassiopeia.dto.requests.build_url(request, params, static, include_base, tournament)
+    payload = payload.to_json(separators=(",", ":"), indent=None) if payload else ""
+
+    # Responses go through the same cache and projections as blocking requests, so both return the same data. The cache is on disk, so it's read and written off the event loop.
+    static_data = static and include_base
+    family = "staticdata" if static_data else cassiopeia.dto.requests.get_api_family(request)
+    cache = cassiopeia.dto.requests.response_cache
+    cache = cache if method == "GET" and cache and cache.caches(family) else None
+    if cache:
+        ttl, version = await run_blocking(cassiopeia.dto.requests.get_cache_terms, cache, request, static_data)
+        content = await run_blocking(cache.get, url, ttl, version)
+        if content is not None:
+            return cassiopeia.dto.requests.parse_content(content, family)
+
+    if method == "GET" and cassiopeia.dto.requests.coalesce_requests:
+        # Identical requests which are already in flight share one call. Each caller parses the content itself since the results get modified.
+        content = await _coalesce((method, url), _send, request, url, method, payload, static, tournament)
+    else:
+        content = await _send(request, url, method, payload, static, tournament)
+
+    if cache and content:
+        await run_blocking(cache.put, url, content, version)
+    return cassiopeia.dto.requests.parse_content(content, family)
+
+
+async def execute_request(url, method, payload=""):
+    """
+    Executes an HTTP request without blocking the event loop and returns the result in a string
+
+    Args:
+        url (str): the full URL to send a request to
+        method (str): the HTTP method to use
+        payload (str): the json payload to send if appropriate for HTTP method (default "")
+
+    Returns:
+        str: the content returned by the server
+    """
+    return (await _execute(url, method, payload))[0]
+
+
+async def run_blocking(method, *args):
+    """
+    Runs a blocking call (e.g. to a data store or the response cache) on the event loop's thread pool, with the calling thread's client active, so it doesn't hold up the event loop
+
+    Args:
+        method (function): the function to call
+        *args (any...): the arguments to pass to the function
+
+    Returns:
+        any: the result of the function
+    """
+    return await asyncio.get_event_loop().run_in_executor(None, cassiopeia.dto.requests.bind_client(method), *args)
+
+
+def get_rate_limiter(tournament=False):
+    """
+    Gets the rate limiter for asyncio requests. Unless one has been set explicitly, this shares its call budget with the blocking requests.
+
+    Args:
+        tournament (bool): whether to get the tournament API rate limiter (default False)
+
+    Returns:
+        AsyncRateLimiter: the rate limiter, or None if requests aren't rate limited
+    """
+    global rate_limiter, tournament_rate_limiter
+
+    limiter = tournament_rate_limiter if tournament else rate_limiter
+    if isinstance(limiter, cassiopeia.type.api.asyncrates.AsyncMultiRateLimiter):
+        return limiter
+
+    blocking_limiter = cassiopeia.dto.requests.tournament_rate_limiter if tournament else cassiopeia.dto.requests.rate_limiter
+    if not blocking_limiter:
+        return None
+    if limiter and limiter.limiter is blocking_limiter:
+        return limiter
+
+    limiter = cassiopeia.type.api.asyncrates.AsyncRateLimiter(blocking_limiter)
+    if tournament:
+        tournament_rate_limiter = limiter
+    else:
+        rate_limiter = limiter
+    return limiter
+
+
+async def _send(request, url, method, payload, static, tournament):
+    # Sends a request, retrying according to the retry policy, and returns the response content
+
+    # Static data and status calls aren't rate limited
+    limiter = None if static else get_rate_limiter(tournament)
+    family = None if static or tournament else cassiopeia.dto.requests.get_api_family(request)
+    region = cassiopeia.dto.requests.get_region()
+    method_limiters = cassiopeia.dto.requests.method_rate_limiters
+    attempt = 0
+    while True:
+        attempt += 1
+        # Method limiters are learned from the responses, so look them up again for every attempt
+        limiters = [limit for limit in (method_limiters.get(region, family) if family else None, limiter.limiter if limiter else None) if limit]
+        try:
+            content, headers = (await cassiopeia.type.api.asyncrates.call_all(limiters, _execute, url, method, payload)) if limiters else (await _execute(url, method, payload))
+            cassiopeia.dto.requests.synchronize_rate_limits(headers, limiter.limiter if limiter else None, region, family)
+            return content
+        except urllib.error.HTTPError as e:
+            if e.headers:
+                cassiopeia.dto.requests.synchronize_rate_limits(e.headers, limiter.limiter if limiter else None, region, family)
+
+            delay = cassiopeia.dto.requests.get_retry_delay(e, attempt, limiter.limiter if limiter else None, method_limiters.get(region, family) if family else None)
+            if delay is None:
+                raise cassiopeia.type.api.exception.APIError("Server returned error {code} on call: {url}".format(code=e.code, url=url), e.code)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+
+async def _coalesce(key, method, *args):
+    # Awaits the call already in flight for the key on this event loop, or starts one. Each caller is shielded, so one of them being cancelled doesn't cancel the call for the others.
+    loop = asyncio.get_event_loop()
+    key = (loop, key)
+    call = _in_flight.get(key)
+    if call is None:
+        call = loop.create_task(method(*args))
+        _in_flight[key] = call
+        call.add_done_callback(lambda _: _in_flight.pop(key, None))
+    return await asyncio.shield(call)
+
+
+async def _execute(url, method, payload=""):
+    # Same as execute_request, but also returns the response headers
+    if cassiopeia.dto.requests.print_calls:
+        print(url)
+
+    headers = {"Accept-Encoding": "gzip"}
+    if payload:
+        payload = payload.encode("UTF-8")
+        headers["Content-Type"] = "application/json"
+
+    content, response_headers = await connection_pool.request(url, method, payload or None, headers)
+    return cassiopeia.dto.requests.decode_content(content, response_headers), response_headers
@@ -14,11 +14,11 @@ def get_champion_mastery(summoner_id, champion_id):
     Returns:
         list<ChampionMastery>: the summoner's champion mastery value for the specified champion
     """
-    region = cassiopeia.type.core.common.Region(cassiopeia.dto.requests.region)
+    region = cassiopeia.type.core.common.Region(cassiopeia.dto.requests.get_region())
     platform = cassiopeia.type.core.common.Platform[region.name]
 
     # Get JSON response
-    request = "https://{server}.api.pvp.net/championmastery/location/{platform}/player/{summonerId}/champion/{championId}".format(server=cassiopeia.dto.requests.region, platform=platform.value, summonerId=summoner_id, championId=champion_id)
+    request = "https://{server}.api.pvp.net/championmastery/location/{platform}/player/{summonerId}/champion/{championId}".format(server=cassiopeia.dto.requests.get_region(), platform=platform.value, summonerId=summoner_id, championId=champion_id)
     return cassiopeia.type.dto.championmastery.ChampionMastery(cassiopeia.dto.requests.get(request, include_base=False))
 
 
@@ -32,11 +32,11 @@ def get_champion_masteries(summoner_id):
     Returns:
         list<ChampionMastery>: the summoner's champion masteries
     """
-    region = cassiopeia.type.core.common.Region(cassiopeia.dto.requests.region)
+    region = cassiopeia.type.core.common.Region(cassiopeia.dto.requests.get_region())
     platform = cassiopeia.type.core.common.Platform[region.name]
 
     # Get JSON response
-    request = "https://{server}.api.pvp.net/championmastery/location/{platform}/player/{summonerId}/champions".format(server=cassiopeia.dto.requests.region, platform=platform.value, summonerId=summoner_id)
+    request = "https://{server}.api.pvp.net/championmastery/location/{platform}/player/{summonerId}/champions".format(server=cassiopeia.dto.requests.get_region(), platform=platform.value, summonerId=summoner_id)
     response = cassiopeia.dto.requests.get(request, include_base=False)
 
     # Convert response to Dto type
@@ -53,11 +53,11 @@ def get_champion_mastery_score(summoner_id):
     Returns:
         int: the summoner's total champion mastery score
     """
-    region = cassiopeia.type.core.common.Region(cassiopeia.dto.requests.region)
+    region = cassiopeia.type.core.common.Region(cassiopeia.dto.requests.get_region())
     platform = cassiopeia.type.core.common.Platform[region.name]
 
     # Get JSON response
-    request = "https://{server}.api.pvp.net/championmastery/location/{platform}/player/{summonerId}/score".format(server=cassiopeia.dto.requests.region, platform=platform.value, summonerId=summoner_id)
+    request = "https://{server}.api.pvp.net/championmastery/location/{platform}/player/{summonerId}/score".format(server=cassiopeia.dto.requests.get_region(), platform=platform.value, summonerId=summoner_id)
     return cassiopeia.dto.requests.get(request, include_base=False)
 
 
@@ -72,11 +72,11 @@ def get_top_champion_masteries(summoner_id, count=3):
     Returns:
         list<ChampionMastery>: the summoner's top champion masteries
     """
-    region = cassiopeia.type.core.common.Region(cassiopeia.dto.requests.region)
+    region = cassiopeia.type.core.common.Region(cassiopeia.dto.requests.get_region())
     platform = cassiopeia.type.core.common.Platform[region.name]
 
     # Get JSON response
-    request = "https://{server}.api.pvp.net/championmastery/location/{platform}/player/{summonerId}/topchampions".format(server=cassiopeia.dto.requests.region, platform=platform.value, summonerId=summoner_id)
+    request = "https://{server}.api.pvp.net/championmastery/location/{platform}/player/{summonerId}/topchampions".format(server=cassiopeia.dto.requests.get_region(), platform=platform.value, summonerId=summoner_id)
     response = cassiopeia.dto.requests.get(request, {"count": count}, include_base=False)
 
     # Convert response to Dto type
@@ -14,9 +14,9 @@ def get_current_game(summoner_id):
     Returns:
         CurrentGameInfo: the summoner's current game (or None if they aren't in one)
     """
-    region = cassiopeia.type.core.common.Region(cassiopeia.dto.requests.region)
+    region = cassiopeia.type.core.common.Region(cassiopeia.dto.requests.get_region())
     platform = cassiopeia.type.core.common.Platform[region.name]
-    request = "https://{server}.api.pvp.net/observer-mode/rest/consumer/getSpectatorGameInfo/{platform}/{summoner_id}".format(server=cassiopeia.dto.requests.region, platform=platform.value, summoner_id=summoner_id)
+    request = "https://{server}.api.pvp.net/observer-mode/rest/consumer/getSpectatorGameInfo/{platform}/{summoner_id}".format(server=cassiopeia.dto.requests.get_region(), platform=platform.value, summoner_id=summoner_id)
     try:
         return cassiopeia.type.dto.currentgame.CurrentGameInfo(cassiopeia.dto.requests.get(request, include_base=False))
     except cassiopeia.type.api.exception.APIError as e:
@@ -5,12 +5,19 @@ Handles making HTTP requests to the REST API and converting the results into a u
 import urllib.parse
 import urllib.request
 import urllib.error
+import functools
 import json
 import zlib
 import time
+import threading
 
 import cassiopeia.type.api.exception
 import cassiopeia.type.api.rates
+import cassiopeia.type.api.retry
+import cassiopeia.type.api.singleflight
+import cassiopeia.type.api.connection
+import cassiopeia.type.api.responsecache
+import cassiopeia.type.api.projection
 
 
 api_versions = {
@@ -36,6 +43,14 @@ region = ""
 print_calls = False
 rate_limiter = None
 tournament_rate_limiter = None
+method_rate_limiters = cassiopeia.type.api.rates.RateLimiterRegistry()
+retry_policy = cassiopeia.type.api.retry.RetryPolicy()
+coalesce_requests = True
+in_flight = cassiopeia.type.api.singleflight.SingleFlight()
+_local = threading.local()
+connection_pool = cassiopeia.type.api.connection.ConnectionPool()
+response_cache = None
+projections = {}
 
 
 def get(request, params={}, static=False, include_base=True, tournament=False):
@@ -66,7 +81,160 @@ def make_request(request, method, params={}, payload=None, static=False, include
     Returns:
         dict: the JSON response from the Riot API as a dict
     """
-    if (not tournament and not api_key) or (tournament and not tournament_api_key):
+    url = build_url(request, params, static, include_base, tournament)
+    payload = payload.to_json(separators=(",", ":"), indent=None) if payload else ""
+
+    # Other static requests (e.g. shard status) use full URLs and are cached by their own family
+    static_data = static and include_base
+    family = "staticdata" if static_data else get_api_family(request)
+    cache = response_cache if method == "GET" and response_cache and response_cache.caches(family) else None
+    if cache:
+        ttl, version = get_cache_terms(cache, request, static_data)
+        content = cache.get(url, ttl, version)
+        if content is not None:
+            return parse_content(content, family)
+
+    if method == "GET" and coalesce_requests:
+        # Identical requests which are already in flight share one call. Each caller parses the content itself since the results get modified.
+        content = in_flight.do((method, url), _send, request, url, method, payload, static, tournament)
+    else:
+        content = _send(request, url, method, payload, static, tournament)
+
+    if cache and content:
+        cache.put(url, content, version)
+    return parse_content(content, family)
+
+
+def get_static_version():
+    """
+    Gets the current static data version for the region (from the realm), which cached static data is checked against
+
+    Returns:
+        str: the current static data version
+    """
+    return get("{version}/realm".format(version=api_versions["staticdata"]), static=True).get("v")
+
+
+def get_retry_delay(error, attempt, limiter=None, method_limiter=None):
+    """
+    Decides whether to retry a failed request using the retry policy, and how long to wait first. 429s for an application or method rate limit pause the whole rate limiter for the time the server asks for, since every other request would be rejected too.
+
+    Args:
+        error (HTTPError): the error the request failed with
+        attempt (int): the number of times the request has been sent so far
+        limiter (SingleRateLimiter | MultiRateLimiter): the application rate limiter the request counted against (default None)
+        method_limiter (SingleRateLimiter | MultiRateLimiter): the method rate limiter the request counted against (default None)
+
+    Returns:
+        float: the number of seconds to wait before retrying, or None if the request shouldn't be retried
+    """
+    policy = _setting("retry_policy")
+    if not policy or not policy.should_retry(error.code, attempt):
+        return None
+
+    headers = error.headers or {}
+    try:
+        retry_after = int(headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        retry_after = 0
+
+    limit_type = headers.get("X-Rate-Limit-Type") if error.code == 429 else None
+    if limit_type and limit_type != "service" and retry_after:
+        paused = method_limiter if limit_type == "method" and method_limiter else limiter
+        if paused:
+            paused.reset_in(retry_after + 1)
+            return 0
+
+    return policy.backoff(attempt, retry_after)
+
+
+def get_api_family(request):
+    """
+    Gets the API family (e.g. "match" or "summoner") a request belongs to, which is what Riot's method rate limits apply to
+
+    Args:
+        request (str): the request string, either of the form {version}/{family}/... or a full URL
+
+    Returns:
+        str: the API family, or None if it can't be determined
+    """
+    if "://" in request:
+        # Requests which don't use the standard base URL, e.g. https://{server}.api.pvp.net/championmastery/...
+        path = urllib.parse.urlsplit(request).path.split("/")
+        if len(path) < 2 or not path[1]:
+            return None
+        if path[1] == "observer-mode":
+            return "featuredgames" if "featured" in path else "currentgame"
+        return path[1]
+
+    parts = request.split("/", 2)
+    return parts[1] if len(parts) > 1 and parts[1] else None
+
+
+def parse_rate_limit_header(value):
+    """
+    Parses a rate limit header from the Riot API (e.g. X-App-Rate-Limit-Count: "7:10,58:600")
+
+    Args:
+        value (str): the header value
+
+    Returns:
+        list<tuple>: the (calls, seconds) tuples in the header, or an empty list if the header is missing or malformed
+    """
+    if not value:
+        return []
+
+    try:
+        return [tuple(int(number) for number in limit.split(":")) for limit in value.split(",")]
+    except ValueError:
+        return []
+
+
+def synchronize_rate_limits(headers, limiter=None, region=None, family=None):
+    """
+    Updates the rate limiters with the limits and call counts the Riot API reports in its response headers. The application limiter adopts the reported limits, and a method limiter is created for the region and API family the first time the server reports its limits.
+
+    Args:
+        headers (HTTPMessage): the response headers
+        limiter (SingleRateLimiter | MultiRateLimiter): the application rate limiter the request counted against (default None)
+        region (str): the region the request was made to (default None)
+        family (str): the API family the request belongs to (default None)
+    """
+    if limiter:
+        # Older API versions only report the application count, as X-Rate-Limit-Count
+        counts = parse_rate_limit_header(headers.get("X-App-Rate-Limit-Count") or headers.get("X-Rate-Limit-Count"))
+        if counts:
+            limiter.synchronize(counts, parse_rate_limit_header(headers.get("X-App-Rate-Limit")))
+
+    counts = parse_rate_limit_header(headers.get("X-Method-Rate-Limit-Count"))
+    if family and counts:
+        limits = parse_rate_limit_header(headers.get("X-Method-Rate-Limit"))
+        method_limiters = _setting("method_rate_limiters")
+        method_limiter = method_limiters.get(region, family)
+        if not method_limiter:
+            if not limits:
+                return
+            method_limiter = method_limiters.learn(region, family, limits)
+        method_limiter.synchronize(counts, limits)
+
+
+def build_url(request, params={}, static=False, include_base=True, tournament=False):
+    """
+    Builds the full URL for a request to the Riot API, including the API key
+
+    Args:
+        request (str): the request string
+        params (dict<str, any>): the path parameters to send with the request (default {})
+        static (bool): whether this is a call to a static (non-rate-limited) API (default False)
+        include_base (bool): whether to prepend https://{server}.api.pvp.net/api/lol/{region}/ to the request (default True)
+        tournament (bool): whether to use the tournament API key (default False)
+
+    Returns:
+        str: the full URL
+    """
+    key = _setting("tournament_api_key" if tournament else "api_key")
+    region = _setting("region")
+    if not key:
         raise cassiopeia.type.api.exception.CassiopeiaException("API Key must be set before the API can be queried.")
     if not region:
         raise cassiopeia.type.api.exception.CassiopeiaException("Region must be set before the API can be queried.")
@@ -76,39 +244,14 @@ def make_request(request, method, params={}, payload=None, static=False, include
     rgn = ("static-data/{region}" if static else "{region}").format(region=region)
 
     # Encode params
-    params["api_key"] = tournament_api_key if tournament else api_key
+    params = dict(params)
+    params["api_key"] = key
     encoded_params = urllib.parse.urlencode(params)
 
-    payload = payload.to_json(separators=(",", ":"), indent=None) if payload else ""
-
-    # Build and execute request
     if include_base:
-        url = "https://{server}.api.pvp.net/api/lol/{region}/{request}?{params}".format(server=server, region=rgn, request=request, params=encoded_params)
+        return "https://{server}.api.pvp.net/api/lol/{region}/{request}?{params}".format(server=server, region=rgn, request=request, params=encoded_params)
     else:
-        url = "{request}?{params}".format(request=request, params=encoded_params)
-
-    limiter = tournament_rate_limiter if tournament else rate_limiter
-    try:
-        content = limiter.call(execute_request, url, method, payload) if limiter else execute_request(url, method, payload)
-        return json.loads(content) if content else {}
-    except urllib.error.HTTPError as e:
-        # Reset rate limiter and retry on 429 (rate limit exceeded)
-        if e.code == 429 and limiter:
-            #print("SERVICE 429" if "X-Rate-Limit-Type" not in e.headers else "{} 429".format(e.headers["X-Rate-Limit-Type"]))
-            if "X-Rate-Limit-Type" not in e.headers or e.headers["X-Rate-Limit-Type"] == "service":
-                time.sleep(1)  # Backoff for 1 second before retrying
-                print("Service 429, sleep 1 second")
-            else:
-                retry_after = 1
-                if e.headers["Retry-After"]:
-                    retry_after += int(e.headers["Retry-After"])
-                print("Rate limit hit 429, retry after:")
-                print(retry_after)
-
-                limiter.reset_in(retry_after)
-            return make_request(request, method, params, payload, static, include_base, tournament)
-        else:
-            raise cassiopeia.type.api.exception.APIError("Server returned error {code} on call: {url}".format(code=e.code, url=url), e.code)
+        return "{request}?{params}".format(request=request, params=encoded_params)
 
 
 def execute_request(url, method, payload=""):
@@ -123,26 +266,173 @@ def execute_request(url, method, payload=""):
     Returns:
         str: the content returned by the server
     """
+    return _execute(url, method, payload)[0]
+
+
+def decode_content(content, headers):
+    """
+    Decompresses (if needed) and decodes the body of a response from the Riot API
+
+    Args:
+        content (bytes): the raw response body
+        headers (HTTPMessage): the response headers
+
+    Returns:
+        str: the decoded content
+    """
+    if content:
+        if "gzip" == headers.get("Content-Encoding"):
+            content = zlib.decompress(content, zlib.MAX_WBITS | 16).decode(encoding="UTF-8")
+        else:
+            content = content.decode("UTF-8")
+    return content
+
+
+def get_cache_terms(cache, request, static=False):
+    """
+    Gets the TTL and data version a cached response for a request is checked against. The realm and versions responses say what the current version is, so they only have a TTL.
+
+    Args:
+        cache (ResponseCache): the response cache
+        request (str): the request string
+        static (bool): whether this is a call to the static data API (default False)
+
+    Returns:
+        tuple: a (TTL, data version) tuple
+    """
+    if static and request.rsplit("/", 1)[-1] in ("realm", "versions"):
+        return cache.version_ttl, None
+    if static:
+        return cache.ttls["staticdata"], get_static_version()
+    return cache.ttls[get_api_family(request)], None
+
+
+def parse_content(content, family):
+    """
+    Parses the decoded body of a response from the Riot API, keeping only the projected fields if there's a projection for its API family (see riotapi.set_projection)
+
+    Args:
+        content (str): the decoded content
+        family (str): the API family the request belongs to
+
+    Returns:
+        dict: the JSON response as a dict
+    """
+    if not content:
+        return {}
+    projection = projections.get(family)
+    return projection.loads(content) if projection else json.loads(content)
+
+
+def get_client():
+    """
+    Gets the client whose settings requests made on this thread use
+
+    Returns:
+        Client: the client, or None if the module-level settings are used
+    """
+    return getattr(_local, "client", None)
+
+
+def set_client(client):
+    """
+    Sets the client whose settings requests made on this thread use
+
+    Args:
+        client (Client): the client to use, or None to use the module-level settings
+
+    Returns:
+        Client: the client which was used before, or None if it was the module-level settings
+    """
+    previous = getattr(_local, "client", None)
+    _local.client = client
+    return previous
+
+
+def bind_client(method):
+    """
+    Wraps a function so that it runs with the client active on this thread, for handing work to other threads (which don't inherit it)
+
+    Args:
+        method (function): the function to wrap
+
+    Returns:
+        function: the function, wrapped if a client is active
+    """
+    client = getattr(_local, "client", None)
+    return functools.partial(client.call, method) if client else method
+
+
+def get_region():
+    """
+    Gets the region requests made on this thread go to
+
+    Returns:
+        str: the region
+    """
+    return _setting("region")
+
+
+def _send(request, url, method, payload, static, tournament):
+    # Sends a request, retrying according to the retry policy, and returns the response content
+
+    # Static data and status calls aren't rate limited
+    limiter = None if static else _setting("tournament_rate_limiter" if tournament else "rate_limiter")
+    family = None if static or tournament else get_api_family(request)
+    rgn = _setting("region")
+    method_rate_limiters = _setting("method_rate_limiters")
+    attempt = 0
+    while True:
+        attempt += 1
+        # Method limiters are learned from the responses, so look them up again for every attempt
+        method_limiter = method_rate_limiters.get(rgn, family) if family else None
+        limiters = [limit for limit in (method_limiter, limiter) if limit]
+        try:
+            content, headers = cassiopeia.type.api.rates.call_all(limiters, _execute, url, method, payload) if limiters else _execute(url, method, payload)
+            synchronize_rate_limits(headers, limiter, rgn, family)
+            return content
+        except urllib.error.HTTPError as e:
+            if e.headers:
+                synchronize_rate_limits(e.headers, limiter, rgn, family)
+
+            delay = get_retry_delay(e, attempt, limiter, method_rate_limiters.get(rgn, family) if family else None)
+            if delay is None:
+                raise cassiopeia.type.api.exception.APIError("Server returned error {code} on call: {url}".format(code=e.code, url=url), e.code)
+            if delay > 0:
+                time.sleep(delay)
+
+
+def _setting(name):
+    # Reads a setting from the client active on this thread, falling back to the module-level settings
+    client = getattr(_local, "client", None)
+    return getattr(client, name) if client else globals()[name]
+
+
+def _execute(url, method, payload=""):
+    # Same as execute_request, but also returns the response headers
     if print_calls:
         print(url)
 
+    headers = {"Accept-Encoding": "gzip"}
+    if payload:
+        payload = payload.encode("UTF-8")
+        headers["Content-Type"] = "application/json"
+
+    pool = _setting("connection_pool")
+    if pool:
+        content, response_headers = pool.request(url, method, payload or None, headers)
+    else:
+        content, response_headers = _urlopen(url, method, payload, headers)
+
+    return decode_content(content, response_headers), response_headers
+
+
+def _urlopen(url, method, payload, headers):
     response = None
     try:
-        if payload:
-            payload = payload.encode("UTF-8")
-            request = urllib.request.Request(url, method=method, data=payload)
-            request.add_header("Content-Type", "application/json")
-        else:
-            request = urllib.request.Request(url, method=method)
-        request.add_header("Accept-Encoding", "gzip")
+        request = urllib.request.Request(url, method=method, data=payload or None, headers=headers)
         response = urllib.request.urlopen(request)
-        content = response.read()
-        if content:
-            if "gzip" == response.getheader("Content-Encoding"):
-                content = zlib.decompress(content, zlib.MAX_WBITS | 16).decode(encoding="UTF-8")
-            else:
-                content = content.decode("UTF-8")
-        return content
+        return response.read(), response.info()
     finally:
         if response:
             response.close()
@@ -20,5 +20,5 @@ def get_shard():
     Returns:
         ShardStatus: the status of the current region's shard
     """
-    request = "http://status.leagueoflegends.com/shards/{region}".format(region=cassiopeia.dto.requests.region)
+    request = "http://status.leagueoflegends.com/shards/{region}".format(region=cassiopeia.dto.requests.get_region())
     return cassiopeia.type.dto.status.ShardStatus(cassiopeia.dto.requests.get(request, static=True, include_base=False))
@@ -2,14 +2,23 @@
 This is the primary entry point for Cassiopeia. Accesses the LoL REST API (https://developer.riotgames.com/)and provides the results in easy-to-use Python objects.
 """
 
+import urllib.parse
 import urllib.request
 
 import cassiopeia.dto.requests
 import cassiopeia.type.api.rates
+import cassiopeia.type.api.retry
+import cassiopeia.type.api.connection
+import cassiopeia.type.api.responsecache
+import cassiopeia.type.api.projection
 import cassiopeia.dto.staticdataapi
 import cassiopeia.core.requests
+import cassiopeia.core.staticdataapi
 import cassiopeia.type.core.common
 import cassiopeia.type.api.store
+from cassiopeia.type.api.client import Client  # noqa: F401
+from cassiopeia.core.requests import fan_out  # noqa: F401
+from cassiopeia.core.crawler import MatchCrawler  # noqa: F401
 #from cassiopeia.core.championapi import *
 #from cassiopeia.core.championmasteryapi import *
 #from cassiopeia.core.currentgameapi import *
@@ -128,6 +137,86 @@ def set_tournament_rate_limits(*limits):
     cassiopeia.dto.requests.tournament_rate_limiter = cassiopeia.type.api.rates.MultiRateLimiter(*limits)
 
 
+def set_method_rate_limits(family, *limits):
+    """
+    Sets the method rate limits for one API family (e.g. "match" or "summoner") in every region. These apply on top of the application rate limits. Method rate limits are also learned from the Riot API's responses, so this is only needed to limit calls before the first response comes back.
+
+    Args:
+        family (str): the API family, as named in cassiopeia.dto.requests.api_versions
+        *limits (tuple...): the rate limits to apply. Rate limits are of the form (calls_per_epoch, seconds_per_epoch)
+    """
+    cassiopeia.dto.requests.method_rate_limiters.set_limits(family, *limits)
+
+
+def set_retry_policy(max_attempts, base_delay=1, max_delay=60, retry_codes=(429, 500, 503)):
+    """
+    Sets how requests which fail with a temporary error are retried. Waits between attempts grow exponentially (with random jitter) up to max_delay.
+
+    Args:
+        max_attempts (int): the maximum number of times to send a request, including the first attempt. 1 turns retries off.
+        base_delay (float): the maximum wait in seconds before the first retry. Later retries double it each time. (default 1)
+        max_delay (float): the longest the wait before a retry can get, in seconds (default 60)
+        retry_codes (tuple<int>): the HTTP status codes to retry (default (429, 500, 503))
+    """
+    cassiopeia.dto.requests.retry_policy = cassiopeia.type.api.retry.RetryPolicy(max_attempts, base_delay, max_delay, retry_codes)
+
+
+def set_request_coalescing(enabled):
+    """
+    Sets whether identical GET requests made at the same time by different threads share one call to the Riot API (on by default)
+
+    Args:
+        enabled (bool): whether to share identical requests
+    """
+    cassiopeia.dto.requests.coalesce_requests = enabled
+
+
+def set_response_cache(directory, ttls={"staticdata": None}, version_ttl=3600):
+    """
+    Keeps responses from the Riot API in compressed files on disk, so they can be reused by later runs of your program instead of downloaded again. By default only static data is cached, and it's kept until the Riot API reports a new data version.
+
+    Args:
+        directory (str): the directory to keep the responses in, or None to stop caching responses
+        ttls (dict<str, float>): the API families (e.g. "staticdata" or "match") to cache and the number of seconds to keep their responses for. None keeps them with no time limit. (default {"staticdata": None})
+        version_ttl (float): the number of seconds to wait before checking the current data version again (default 3600)
+    """
+    cassiopeia.dto.requests.response_cache = cassiopeia.type.api.responsecache.ResponseCache(directory, ttls, version_ttl) if directory else None
+
+
+def set_projection(family, fields):
+    """
+    Sets which fields to keep from the responses of an API family. The other fields are skipped while the response is being parsed, which saves memory when only a few fields are used (e.g. a match's participants' stats), but parsing takes longer than without a projection. Fields which aren't kept are left empty in the returned objects. No family has a projection unless one is set.
+
+    Args:
+        family (str): the API family (e.g. "match" or "staticdata")
+        fields (list<str> | dict): the fields to keep, as dotted paths (e.g. ["matchId", "participants.stats.winner"]). Paths go through lists. None keeps every field again.
+    """
+    if fields is None:
+        cassiopeia.dto.requests.projections.pop(family, None)
+    else:
+        cassiopeia.dto.requests.projections[family] = cassiopeia.type.api.projection.Projection(fields)
+
+
+def set_batch_window(seconds):
+    """
+    Turns on batching for lookups of single summoners by ID (including their names, mastery pages, and rune pages). Lookups made by different threads within the window are combined into one request for up to 40 summoners, at the cost of each lookup waiting up to the window first.
+
+    Args:
+        seconds (float): how long to wait for more lookups before making a request. 0 turns batching off. (default off)
+    """
+    cassiopeia.core.requests.batch_window = seconds
+
+
+def set_worker_count(count):
+    """
+    Sets the number of threads in the pool shared by the calls which make several requests at once (get_matches, iter_matches, chunked lookups of summoners, leagues and teams, and MatchCrawler). The threads only wait on requests, so this should match how many requests your rate limits let you make at once. (default 25)
+
+    Args:
+        count (int): the number of threads
+    """
+    cassiopeia.core.requests.set_workers(count)
+
+
 def set_proxy(url, port=80):
     """
     Sets a proxy server to tunnel requests to the Riot API through
@@ -143,6 +232,42 @@ def set_proxy(url, port=80):
         cassiopeia.dto.requests.proxy = urllib.request.ProxyHandler({})
         urllib.request.install_opener(urllib.request.build_opener(cassiopeia.dto.requests.proxy))
 
+    if cassiopeia.dto.requests.connection_pool:
+        cassiopeia.dto.requests.connection_pool.set_proxy(url, port)
+
+
+def set_connection_pool(max_connections_per_host, idle_timeout=60):
+    """
+    Sets up the pool of persistent (keep-alive) connections used to send requests to the Riot API
+
+    Args:
+        max_connections_per_host (int): the maximum number of sockets to keep open to each host. 0 or None disables pooling and opens a new connection for every request.
+        idle_timeout (int): the number of seconds an unused connection is kept open before it is closed (default 60)
+    """
+    if cassiopeia.dto.requests.connection_pool:
+        cassiopeia.dto.requests.connection_pool.close()
+
+    if not max_connections_per_host:
+        cassiopeia.dto.requests.connection_pool = None
+    else:
+        cassiopeia.dto.requests.connection_pool = cassiopeia.type.api.connection.ConnectionPool(max_connections_per_host, idle_timeout)
+        proxy = getattr(cassiopeia.dto.requests, "proxy", None)
+        if proxy and "https" in proxy.proxies:
+            proxy = urllib.parse.urlsplit(proxy.proxies["https"])
+            cassiopeia.dto.requests.connection_pool.set_proxy(proxy.hostname, proxy.port)
+
+
+def get_connection_stats():
+    """
+    Returns statistics about how well connections to the Riot API are being reused
+
+    Returns:
+        dict<str, int>: the number of requests sent, connections created, connections reused, idle connections evicted, and connections currently idle
+    """
+    if not cassiopeia.dto.requests.connection_pool:
+        return {}
+    return cassiopeia.dto.requests.connection_pool.stats
+
 
 def set_locale(locale):
     """
@@ -154,6 +279,34 @@ def set_locale(locale):
     cassiopeia.dto.staticdataapi._locale = locale
 
 
+def save_static_data(path):
+    """
+    Downloads the champions, items, masteries, runes, and summoner spells for the current version and locale, loads them into the data store, and saves them to one compressed snapshot file, which load_static_data can load without calling the API
+
+    Args:
+        path (str): the file to save the snapshot to
+
+    Returns:
+        str: the static data version the snapshot is for
+    """
+    return cassiopeia.core.staticdataapi.save_static_data(path)
+
+
+def load_static_data(path, version=None, locale=None):
+    """
+    Loads a snapshot saved by save_static_data into the data store, so the static data doesn't have to be downloaded
+
+    Args:
+        path (str): the snapshot file to load
+        version (str): the static data version the snapshot has to be for, or None to accept any version (default None)
+        locale (str): the locale the snapshot has to be for, or None to accept any locale (default None)
+
+    Returns:
+        str: the static data version the snapshot is for
+    """
+    return cassiopeia.core.staticdataapi.load_static_data(path, version, locale)
+
+
 def set_load_policy(policy):
     """
     Sets the load policy to use. Keep your load policy in mind when making calls, as different policies are better for different applications.
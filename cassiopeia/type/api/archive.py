@@ -0,0 +1,224 @@
+import json
+import mmap
+import os
+import struct
+import threading
+import zlib
+
+try:
+    import lzma
+except ImportError:
+    lzma = None
+
+import cassiopeia.type.api.store
+import cassiopeia.type.core.common
+import cassiopeia.type.core.match
+import cassiopeia.type.dto.match
+
+# Each record is a header (match ID, codec, payload length) followed by the compressed JSON of the match
+_record = struct.Struct("<QBI")
+
+# Each index entry is (match ID, segment number, offset of the record, length of the record including its header)
+_entry = struct.Struct("<QIQI")
+
+_codecs = {"zlib": 0, "lzma": 1}
+
+
+def _compress(codec, data):
+    if codec == 0:
+        return zlib.compress(data)
+    return lzma.compress(data)
+
+
+def _decompress(codec, data):
+    if codec == 0:
+        return zlib.decompress(data)
+    if lzma is None:
+        raise ValueError("This archive uses lzma compression, which isn't available in this Python install")
+    return lzma.decompress(data)
+
+
+@cassiopeia.type.core.common.inheritdocs
+class MatchArchive(cassiopeia.type.api.store.DataStore):
+    """
+    Stores matches in a directory of append-only, compressed segment files, with an index of where each match is. Matches are read back by memory-mapping the segments, so a lookup is one decompression and no queries or joins.
+
+    Only matches are archived. Every other type is passed through to another data store.
+    """
+
+    def __init__(self, directory, compression="zlib", segment_size=268435456, store=None):
+        """
+        Args:
+            directory (str): the directory to keep the archive in, which is created if it doesn't exist
+            compression (str): how to compress new matches, "zlib" or "lzma". lzma is smaller but slower. Matches already in the archive are read however they were written. (default "zlib")
+            segment_size (int): the size in bytes at which a new segment file is started (default 256MB)
+            store (DataStore): where to store everything other than matches. None uses a Cache. (default None)
+        """
+        if compression not in _codecs:
+            raise ValueError("Compression must be one of {codecs}".format(codecs=sorted(_codecs)))
+        if compression == "lzma" and lzma is None:
+            raise ValueError("lzma compression isn't available in this Python install")
+
+        self.directory = directory
+        self.codec = _codecs[compression]
+        self.segment_size = segment_size
+        self.data_store = store if store is not None else cassiopeia.type.api.store.Cache()
+        self._lock = threading.Lock()
+        self._maps = {}
+        self._index = {}
+
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        self._load_index()
+        self._index_file = open(self._index_path(), "ab")
+        self._segment = max([0] + [segment for segment, offset, length in self._index.values()])
+        self._segment_file = self._open_segment("ab")
+
+    def has_all(self, class_):
+        if class_ is cassiopeia.type.core.match.Match:
+            return False
+        return self.data_store.has_all(class_)
+
+    def get_all(self, class_):
+        if class_ is cassiopeia.type.core.match.Match:
+            return list(self.iterate(class_))
+        return self.data_store.get_all(class_)
+
+    def iterate(self, class_):
+        if class_ is not cassiopeia.type.core.match.Match:
+            return self.data_store.iterate(class_)
+
+        # Reading in file order keeps the scan sequential
+        with self._lock:
+            locations = sorted(self._index.values())
+        return (cassiopeia.type.core.match.Match(self._read(*location)) for location in locations)
+
+    def get(self, class_, keys, key_field):
+        if class_ is not cassiopeia.type.core.match.Match:
+            return self.data_store.get(class_, keys, key_field)
+
+        if not isinstance(keys, list):
+            location = self._index.get(keys)
+            return cassiopeia.type.core.match.Match(self._read(*location)) if location else None
+
+        results = []
+        for key in keys:
+            location = self._index.get(key)
+            results.append(cassiopeia.type.core.match.Match(self._read(*location)) if location else None)
+        return results
+
+    def store(self, objs, keys, complete_sets=[]):
+        is_list = isinstance(objs, list)
+        if is_list != isinstance(keys, list):
+            raise ValueError("Object(s) and Key(s) must both be lists or both be non-lists")
+
+        if not is_list:
+            objs = [objs]
+            keys = [keys]
+        elif len(objs) != len(keys):
+            raise ValueError("Objects and Keys must be the same length")
+
+        others = [i for i in range(len(objs)) if not isinstance(objs[i], cassiopeia.type.core.match.Match)]
+        if others or complete_sets:
+            self.data_store.store([objs[i] for i in others], [keys[i] for i in others], complete_sets)
+
+        # Compressing is the slow part, so it's done before taking the lock
+        records = []
+        for i in range(len(objs)):
+            if isinstance(objs[i], cassiopeia.type.core.match.Match) and objs[i].id not in self._index:
+                records.append((objs[i].id, self._encode(objs[i].data)))
+        if not records:
+            return
+
+        with self._lock:
+            entries = []
+            for id_, record in records:
+                if id_ in self._index:
+                    continue
+                if self._segment_file.tell() and self._segment_file.tell() + len(record) > self.segment_size:
+                    self._segment_file.close()
+                    self._segment += 1
+                    self._segment_file = self._open_segment("wb")
+
+                location = (self._segment, self._segment_file.tell(), len(record))
+                self._segment_file.write(record)
+                entries.append(_entry.pack(id_, *location))
+                self._index[id_] = location
+
+            # The segments are written out before the index, so every indexed match is readable
+            self._segment_file.flush()
+            self._index_file.write(b"".join(entries))
+            self._index_file.flush()
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, id_):
+        return id_ in self._index
+
+    def close(self):
+        """
+        Closes the archive's files
+        """
+        with self._lock:
+            self._segment_file.close()
+            self._index_file.close()
+            for map_ in self._maps.values():
+                map_.close()
+            self._maps = {}
+
+    def _index_path(self):
+        return os.path.join(self.directory, "index")
+
+    def _segment_path(self, segment):
+        return os.path.join(self.directory, "segment-{number:05d}".format(number=segment))
+
+    def _open_segment(self, mode):
+        segment_file = open(self._segment_path(self._segment), mode)
+        segment_file.seek(0, os.SEEK_END)
+        return segment_file
+
+    def _encode(self, match):
+        data = match.to_json(sort_keys=False, indent=None, separators=(",", ":")).encode("UTF-8")
+        data = _compress(self.codec, data)
+        return _record.pack(match.matchId, self.codec, len(data)) + data
+
+    def _read(self, segment, offset, length):
+        map_ = self._maps.get(segment)
+        if map_ is None or offset + length > len(map_):
+            # Segments grow as matches are added, so the mapping is renewed when it doesn't reach far enough
+            with self._lock:
+                map_ = self._maps.get(segment)
+                if map_ is None or offset + length > len(map_):
+                    with open(self._segment_path(segment), "rb") as segment_file:
+                        map_ = mmap.mmap(segment_file.fileno(), 0, access=mmap.ACCESS_READ)
+                    self._maps[segment] = map_
+
+        id_, codec, size = _record.unpack_from(map_, offset)
+        start = offset + _record.size
+        data = _decompress(codec, map_[start:start + size])
+        return cassiopeia.type.dto.match.MatchDetail(json.loads(data.decode("UTF-8")))
+
+    def _load_index(self):
+        if not os.path.exists(self._index_path()):
+            return
+
+        with open(self._index_path(), "rb") as index_file:
+            data = index_file.read()
+
+        # A partly written entry at the end (from a crash) is dropped
+        end = len(data) - len(data) % _entry.size
+        for i in range(0, end, _entry.size):
+            id_, segment, offset, length = _entry.unpack_from(data, i)
+            self._index[id_] = (segment, offset, length)
+        if end != len(data):
+            with open(self._index_path(), "r+b") as index_file:
+                index_file.truncate(end)
+
+        # Anything written to the last segment past its last indexed match didn't make it into the index, so it's cut off
+        if self._index:
+            segment, offset, length = max(self._index.values())
+            path = self._segment_path(segment)
+            if os.path.getsize(path) > offset + length:
+                with open(path, "r+b") as segment_file:
+                    segment_file.truncate(offset + length)
@@ -0,0 +1,206 @@
+import asyncio
+import email.parser
+import http.client
+import ssl
+import time
+import urllib.error
+import urllib.parse
+
+
+class AsyncConnectionPool(object):
+    """
+    The asyncio counterpart of cassiopeia.type.api.connection.ConnectionPool. Keeps persistent (keep-alive) HTTP/1.1 connections open to each host using asyncio streams, so many requests can be in flight without a thread per request.
+
+    Unlike ConnectionPool, it doesn't support proxies, so riotapi.set_proxy doesn't apply to asyncriotapi requests. Tunneling HTTPS through a proxy needs TLS to be started on an open stream, which asyncio can only do from Python 3.7.
+    """
+
+    def __init__(self, max_connections_per_host=100, idle_timeout=60, timeout=None):
+        """
+        Args:
+            max_connections_per_host (int): the maximum number of sockets to open to a single host at once. Requests beyond this wait for a socket to free up. (default 100)
+            idle_timeout (int): the number of seconds an unused connection is kept open before it is evicted (default 60)
+            timeout (int): the number of seconds to wait for a connection or response before giving up, or None to wait forever (default None)
+        """
+        self.max_connections_per_host = max_connections_per_host
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self._loop = None
+        self._hosts = {}
+        self._ssl_context = None
+        self._created = 0
+        self._reused = 0
+        self._evicted = 0
+        self._requests = 0
+
+    async def request(self, url, method="GET", body=None, headers={}):
+        """
+        Sends an HTTP request over a pooled connection
+
+        Args:
+            url (str): the full URL to send the request to
+            method (str): the HTTP method to use (default "GET")
+            body (bytes): the request body, if any (default None)
+            headers (dict<str, str>): the headers to send with the request (default {})
+
+        Returns:
+            tuple: a (content, headers) tuple holding the raw response body and the response headers
+
+        Raises:
+            urllib.error.HTTPError: if the server responds with an error status code
+        """
+        parts = urllib.parse.urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == "https" else 80))
+        path = "{path}?{query}".format(path=parts.path or "/", query=parts.query) if parts.query else (parts.path or "/")
+
+        host = self._get_host(key)
+        async with host.sockets:
+            connection, reused = await self._check_out(host, key)
+            try:
+                while True:
+                    try:
+                        status, reason, response_headers, content, will_close = await asyncio.wait_for(self._send(connection, key, method, path, body, headers), self.timeout)
+                        break
+                    except asyncio.TimeoutError:
+                        raise
+                    except (OSError, EOFError, http.client.HTTPException):
+                        connection[1].close()
+                        # A reused connection may have been dropped by the server while it was idle. Retry idempotent requests once on a fresh socket.
+                        if not reused or method not in ("GET", "HEAD", "PUT", "DELETE"):
+                            raise
+                        connection, reused = await self._connect(key), False
+            except BaseException:
+                # The connection may be partway through a response (e.g. if the request was cancelled), so it can't be reused
+                connection[1].close()
+                raise
+
+            if will_close:
+                connection[1].close()
+            else:
+                host.idle.append((connection, time.monotonic()))
+
+        if status >= 400:
+            raise urllib.error.HTTPError(url, status, reason, response_headers, None)
+        return content, response_headers
+
+    def close(self):
+        """
+        Closes all idle connections
+        """
+        for host in self._hosts.values():
+            for connection, _ in host.idle:
+                connection[1].close()
+            host.idle = []
+
+    @property
+    def stats(self):
+        """
+        Returns:
+            dict<str, int>: the number of requests sent, connections created, connections reused, idle connections evicted, and connections currently idle
+        """
+        return {
+            "requests": self._requests,
+            "created": self._created,
+            "reused": self._reused,
+            "evicted": self._evicted,
+            "idle": sum(len(host.idle) for host in self._hosts.values())
+        }
+
+    def _get_host(self, key):
+        # Streams and semaphores belong to a single event loop, so start over if the pool is used from a new one
+        loop = asyncio.get_event_loop()
+        if loop is not self._loop:
+            self.close()
+            self._hosts = {}
+            self._loop = loop
+
+        try:
+            return self._hosts[key]
+        except KeyError:
+            host = _AsyncHostConnections(self.max_connections_per_host)
+            self._hosts[key] = host
+            return host
+
+    async def _check_out(self, host, key):
+        now = time.monotonic()
+        while host.idle and now - host.idle[0][1] > self.idle_timeout:
+            host.idle.pop(0)[0][1].close()
+            self._evicted += 1
+
+        if host.idle:
+            self._reused += 1
+            return host.idle.pop()[0], True
+        return await self._connect(key), False
+
+    async def _connect(self, key):
+        scheme, hostname, port = key
+        if scheme == "https":
+            if not self._ssl_context:
+                self._ssl_context = ssl.create_default_context()
+            connection = await asyncio.wait_for(asyncio.open_connection(hostname, port, ssl=self._ssl_context), self.timeout)
+        else:
+            connection = await asyncio.wait_for(asyncio.open_connection(hostname, port), self.timeout)
+
+        self._created += 1
+        return connection
+
+    async def _send(self, connection, key, method, path, body, headers):
+        reader, writer = connection
+        scheme, hostname, port = key
+
+        lines = ["{method} {path} HTTP/1.1".format(method=method, path=path), "Host: {host}".format(host=hostname if port in (80, 443) else "{host}:{port}".format(host=hostname, port=port))]
+        for name, value in headers.items():
+            lines.append("{name}: {value}".format(name=name, value=value))
+        if body:
+            lines.append("Content-Length: {length}".format(length=len(body)))
+        lines.append("\r\n")
+        writer.write("\r\n".join(lines).encode("latin-1"))
+        if body:
+            writer.write(body)
+        await writer.drain()
+
+        # Status line and headers
+        status_line = await reader.readline()
+        if not status_line:
+            raise EOFError("Connection closed by server")
+        version, status, reason = (status_line.decode("latin-1").rstrip("\r\n").split(" ", 2) + [""])[:3]
+        status = int(status)
+
+        header_lines = []
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            header_lines.append(line.decode("latin-1"))
+        response_headers = email.parser.Parser(_class=http.client.HTTPMessage).parsestr("".join(header_lines))
+
+        # Body
+        connection_header = (response_headers.get("Connection") or "").lower()
+        will_close = connection_header == "close" or (version == "HTTP/1.0" and connection_header != "keep-alive")
+        if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            content = b""
+        elif (response_headers.get("Transfer-Encoding") or "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";", 1)[0], 16)
+                if not size:
+                    # Skip trailers
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            content = b"".join(chunks)
+        elif response_headers.get("Content-Length") is not None:
+            content = await reader.readexactly(int(response_headers["Content-Length"]))
+        else:
+            content = await reader.read()
+            will_close = True
+
+        self._requests += 1
+        return status, reason, response_headers, content, will_close
+
+
+class _AsyncHostConnections(object):
+    def __init__(self, max_connections):
+        self.sockets = asyncio.Semaphore(max_connections)
+        self.idle = []
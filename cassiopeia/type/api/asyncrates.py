@@ -0,0 +1,109 @@
+import asyncio
+
+import cassiopeia.type.api.rates
+
+
+class AsyncRateLimiter(object):
+    """
+    Lets coroutines wait on a blocking rate limiter (SingleRateLimiter or MultiRateLimiter) without blocking the event loop. The call budget is shared with any threads using the same limiter.
+    """
+
+    def __init__(self, limiter):
+        """
+        Args:
+            limiter (SingleRateLimiter | MultiRateLimiter): the limiter which keeps track of the calls
+        """
+        self.limiter = limiter
+
+    async def call(self, method=None, *args):
+        """
+        Waits until a call becomes available, then awaits the coroutine function
+
+        Args:
+            method (coroutine function): the coroutine function to call once the rate limit allows (default None)
+            *args (any...): the arguments to pass to the method
+
+        Returns:
+            any: the result of the method
+        """
+        await self._sleep_until(self.limiter.reserve())
+
+        successful_call = True
+        try:
+            return (await method(*args)) if method else None
+        except BaseException:
+            successful_call = False
+            raise
+        finally:
+            self.limiter.record_call(successful_call)
+
+    async def wait(self):
+        """
+        Waits until a call becomes available without using it
+        """
+        await self._sleep_until(self.limiter.available_at())
+
+    def reset_in(self, seconds):
+        """
+        Stops all calls for a number of seconds
+
+        Args:
+            seconds (int): the number of seconds to wait before allowing calls again
+        """
+        self.limiter.reset_in(seconds)
+
+    @property
+    def calls(self):
+        """
+        Returns the number of successful calls (no exceptions in the call) and total calls served by this limiter
+
+        Returns:
+            tuple: a (successful calls, total calls) tuple
+        """
+        return self.limiter.calls
+
+    async def _sleep_until(self, when):
+        # Check again after waking up in case reset_in pushed the call back while we slept
+        delay = self.limiter.delay(when)
+        while delay > 0:
+            await asyncio.sleep(delay)
+            delay = self.limiter.delay(when)
+
+
+class AsyncMultiRateLimiter(AsyncRateLimiter):
+    """
+    The asyncio counterpart of cassiopeia.type.api.rates.MultiRateLimiter, with its own call budget
+    """
+
+    def __init__(self, *limits):
+        """
+        Args:
+            *limits (tuple...): the rate limits to apply. Rate limits are of the form (calls_per_epoch, seconds_per_epoch)
+        """
+        super().__init__(cassiopeia.type.api.rates.MultiRateLimiter(*limits))
+
+
+async def call_all(limiters, method=None, *args):
+    """
+    Waits for a slot in each of several rate limiters in turn (e.g. a method and then an application rate limit), then awaits the coroutine function
+
+    Args:
+        limiters (list<SingleRateLimiter | MultiRateLimiter>): the blocking rate limiters the call counts against
+        method (coroutine function): the coroutine function to call once the rate limits allow (default None)
+        *args (any...): the arguments to pass to the method
+
+    Returns:
+        any: the result of the method
+    """
+    for limiter in limiters:
+        await AsyncRateLimiter(limiter)._sleep_until(limiter.reserve())
+
+    successful_call = True
+    try:
+        return (await method(*args)) if method else None
+    except BaseException:
+        successful_call = False
+        raise
+    finally:
+        for limiter in limiters:
+            limiter.record_call(successful_call)
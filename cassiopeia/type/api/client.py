@@ -0,0 +1,87 @@
+import threading
+
+import cassiopeia.dto.requests
+import cassiopeia.type.api.connection
+import cassiopeia.type.api.rates
+import cassiopeia.type.api.store
+import cassiopeia.type.core.common
+
+
+class Client(object):
+    """
+    Holds its own region, API key, rate limiters, connection pool, and data store, so that several regions can be queried from one process at the same time
+
+    riotapi and baseriotapi calls use the client's settings instead of the module-level ones while it is active on the calling thread:
+
+        with Client("euw", key):
+            summoner = riotapi.get_summoner_by_name("Froggen")
+    """
+
+    def __init__(self, region, api_key=None, tournament_api_key=None, rate_limits=((10, 10), (500, 600)), max_connections_per_host=25, data_store=None, retry_policy=None):
+        """
+        Args:
+            region (str | Region): the region to query against
+            api_key (str): the API key to use. Riot applies rate limits per region, so the same key can be used by clients for different regions. (default the key set with set_api_key)
+            tournament_api_key (str): the tournament API key to use (default the key set with set_tournament_api_key)
+            rate_limits (tuple<tuple>): the application rate limits for this client. Rate limits are of the form (calls_per_epoch, seconds_per_epoch). (default ((10, 10), (500, 600)))
+            max_connections_per_host (int): the maximum number of sockets to keep open to each host. 0 opens a new connection for every request. (default 25)
+            data_store (DataStore): where to cache the data loaded through this client. IDs are only unique within a region, so clients shouldn't share a data store. (default a new Cache)
+            retry_policy (RetryPolicy): when to retry this client's failed requests and how long to wait first (default the policy set with set_retry_policy)
+        """
+        if not isinstance(region, cassiopeia.type.core.common.Region):
+            region = cassiopeia.type.core.common.Region(region.lower())
+        self.region = region.value
+
+        self.api_key = api_key if api_key is not None else cassiopeia.dto.requests.api_key
+        self.tournament_api_key = tournament_api_key if tournament_api_key is not None else cassiopeia.dto.requests.tournament_api_key
+        self.rate_limiter = cassiopeia.type.api.rates.MultiRateLimiter(*rate_limits)
+        self.tournament_rate_limiter = cassiopeia.type.api.rates.MultiRateLimiter(*rate_limits) if self.tournament_api_key else None
+        self.method_rate_limiters = cassiopeia.type.api.rates.RateLimiterRegistry()
+        self.connection_pool = cassiopeia.type.api.connection.ConnectionPool(max_connections_per_host) if max_connections_per_host else None
+        self.data_store = data_store if data_store is not None else cassiopeia.type.api.store.Cache()
+        self.retry_policy = retry_policy if retry_policy is not None else cassiopeia.dto.requests.retry_policy
+        self._previous = threading.local()
+
+    def __enter__(self):
+        if not hasattr(self._previous, "clients"):
+            self._previous.clients = []
+        self._previous.clients.append(cassiopeia.dto.requests.set_client(self))
+        return self
+
+    def __exit__(self, type_, value, traceback):
+        cassiopeia.dto.requests.set_client(self._previous.clients.pop())
+
+    def __str__(self):
+        return "Client ({region})".format(region=self.region)
+
+    def call(self, method, *args, **kwargs):
+        """
+        Calls a function with this client active
+
+        Args:
+            method (function): the function to call (e.g. riotapi.get_summoner_by_name)
+            *args (any...): the arguments to pass to the function
+            **kwargs (any...): the keyword arguments to pass to the function
+
+        Returns:
+            any: the result of the function
+        """
+        with self:
+            return method(*args, **kwargs)
+
+    def close(self):
+        """
+        Closes the client's open connections
+        """
+        if self.connection_pool:
+            self.connection_pool.close()
+
+    @property
+    def calls(self):
+        """
+        Returns the number of successful calls (no exceptions in the call) and total calls made through this client
+
+        Returns:
+            tuple: a (successful calls, total calls) tuple
+        """
+        return self.rate_limiter.calls
@@ -0,0 +1,22 @@
+import os
+import tempfile
+
+_replace = getattr(os, "replace", os.rename)
+
+
+def atomic_write(path, data):
+    """
+    Writes a file by writing a temporary file next to it and moving that into place, so other processes (or this one after a crash) never read a partly written file
+
+    Args:
+        path (str): the file to write
+        data (bytes): the file's contents
+    """
+    handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(handle, "wb") as temp_file:
+            temp_file.write(data)
+        _replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
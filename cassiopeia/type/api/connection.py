@@ -0,0 +1,207 @@
+import http.client
+import socket
+import threading
+import time
+import urllib.error
+import urllib.parse
+
+
+class ConnectionPool(object):
+    """
+    Keeps persistent (keep-alive) HTTP connections open to each host so that consecutive requests don't pay for a new TCP/TLS handshake
+    """
+
+    def __init__(self, max_connections_per_host=25, idle_timeout=60, timeout=None):
+        """
+        Args:
+            max_connections_per_host (int): the maximum number of sockets to open to a single host at once. Requests beyond this wait for a socket to free up. (default 25)
+            idle_timeout (int): the number of seconds an unused connection is kept open before it is evicted (default 60)
+            timeout (int): the socket timeout in seconds for new connections, or None to use the global default (default None)
+        """
+        self.max_connections_per_host = max_connections_per_host
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.proxy = None
+        self._lock = threading.Lock()
+        self._hosts = {}
+        self._created = 0
+        self._reused = 0
+        self._evicted = 0
+        self._requests = 0
+
+    def request(self, url, method="GET", body=None, headers={}):
+        """
+        Sends an HTTP request over a pooled connection
+
+        Args:
+            url (str): the full URL to send the request to
+            method (str): the HTTP method to use (default "GET")
+            body (bytes): the request body, if any (default None)
+            headers (dict<str, str>): the headers to send with the request (default {})
+
+        Returns:
+            tuple: a (content, headers) tuple holding the raw response body and the response headers
+
+        Raises:
+            urllib.error.HTTPError: if the server responds with an error status code
+            urllib.error.URLError: if the request couldn't be sent or the response couldn't be read
+        """
+        parts = urllib.parse.urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port)
+        path = "{path}?{query}".format(path=parts.path or "/", query=parts.query) if parts.query else (parts.path or "/")
+
+        host = self._get_host(key)
+        host.sockets.acquire()
+        try:
+            connection, reused, generation = self._check_out(host, key)
+            while True:
+                try:
+                    response, content = self._send(connection, method, path, body, headers)
+                    break
+                except (http.client.HTTPException, socket.error) as e:
+                    connection.close()
+                    # A reused connection may have been dropped by the server while it was idle. Retry idempotent requests once on a fresh socket.
+                    if not reused or method not in ("GET", "HEAD", "PUT", "DELETE"):
+                        # Transport errors are raised the same way urllib.request.urlopen raised them
+                        raise urllib.error.URLError(e)
+                    connection, reused = self._connect(key), False
+                except BaseException:
+                    # Anything else may leave the response half read, so the connection can't be reused
+                    connection.close()
+                    raise
+
+            if response.will_close:
+                connection.close()
+            else:
+                self._check_in(host, connection, generation)
+        finally:
+            host.sockets.release()
+
+        if response.status >= 400:
+            raise urllib.error.HTTPError(url, response.status, response.reason, response.msg, None)
+        return content, response.msg
+
+    def set_proxy(self, host, port=80):
+        """
+        Tunnels all new connections through a proxy server. Open connections are closed.
+
+        Args:
+            host (str): the hostname of the proxy server, or None to stop using a proxy
+            port (int): the port of the proxy server (default 80)
+        """
+        self.proxy = (host, port) if host else None
+        self.close()
+
+    def evict_idle(self):
+        """
+        Closes every connection that has been idle for longer than the idle timeout
+        """
+        with self._lock:
+            hosts = list(self._hosts.values())
+
+        for host in hosts:
+            with host.lock:
+                self._evict(host, time.time())
+
+    def close(self):
+        """
+        Closes all idle connections. Connections which are currently in use are closed when they are returned.
+        """
+        with self._lock:
+            hosts = list(self._hosts.values())
+
+        # The hosts are kept, so requests which are still running keep counting against the per-host limit
+        for host in hosts:
+            with host.lock:
+                host.generation += 1
+                for connection, _ in host.idle:
+                    connection.close()
+                host.idle = []
+
+    @property
+    def stats(self):
+        """
+        Returns:
+            dict<str, int>: the number of requests sent, connections created, connections reused, idle connections evicted, and connections currently idle
+        """
+        with self._lock:
+            idle = sum(len(host.idle) for host in self._hosts.values())
+            return {
+                "requests": self._requests,
+                "created": self._created,
+                "reused": self._reused,
+                "evicted": self._evicted,
+                "idle": idle
+            }
+
+    def _get_host(self, key):
+        with self._lock:
+            try:
+                return self._hosts[key]
+            except KeyError:
+                host = _HostConnections(self.max_connections_per_host)
+                self._hosts[key] = host
+                return host
+
+    def _check_out(self, host, key):
+        with host.lock:
+            self._evict(host, time.time())
+            connection = host.idle.pop()[0] if host.idle else None
+            generation = host.generation
+
+        if connection:
+            with self._lock:
+                self._reused += 1
+            return connection, True, generation
+        return self._connect(key), False, generation
+
+    def _check_in(self, host, connection, generation):
+        with host.lock:
+            # Connections which were checked out before the pool was closed are closed instead of kept
+            if generation != host.generation:
+                connection.close()
+                return
+            # Connections are handed out LIFO so the warmest socket is reused first and the cold ones age out
+            host.idle.append((connection, time.time()))
+
+    def _evict(self, host, now):
+        stale = 0
+        while host.idle and now - host.idle[0][1] > self.idle_timeout:
+            host.idle.pop(0)[0].close()
+            stale += 1
+
+        if stale:
+            with self._lock:
+                self._evicted += stale
+
+    def _connect(self, key):
+        scheme, hostname, port = key
+        connection_type = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        kwargs = {"timeout": self.timeout} if self.timeout is not None else {}
+
+        if self.proxy:
+            connection = connection_type(self.proxy[0], self.proxy[1], **kwargs)
+            connection.set_tunnel(hostname, port)
+        else:
+            connection = connection_type(hostname, port, **kwargs)
+
+        with self._lock:
+            self._created += 1
+        return connection
+
+    def _send(self, connection, method, path, body, headers):
+        connection.request(method, path, body, headers)
+        response = connection.getresponse()
+        content = response.read()
+
+        with self._lock:
+            self._requests += 1
+        return response, content
+
+
+class _HostConnections(object):
+    def __init__(self, max_connections):
+        self.lock = threading.Lock()
+        self.sockets = threading.BoundedSemaphore(max_connections)
+        self.idle = []
+        self.generation = 0
@@ -0,0 +1,140 @@
+import json
+import json.decoder
+
+_scan_once = json.JSONDecoder().scan_once
+_scanstring = json.decoder.scanstring
+_whitespace = json.decoder.WHITESPACE.match
+_blank = " \t\n\r"
+
+
+class Projection(object):
+    """
+    Decodes JSON responses keeping only the fields that are asked for. The document is walked as it's read, and values which aren't kept are dropped as soon as they've been read past, so a response's runes, masteries, unused stats, etc. are never all in memory at once.
+    """
+
+    def __init__(self, fields):
+        """
+        Args:
+            fields (list<str> | dict): the fields to keep. Either a list of dotted paths (e.g. ["matchId", "participants.stats.winner"]) or the same as a nested dict, where None keeps the whole value (e.g. {"matchId": None, "participants": {"stats": {"winner": None}}}). Paths go through lists, so "participants.stats" is the stats of every participant.
+        """
+        self.fields = fields if isinstance(fields, dict) else Projection._tree(fields)
+        self._fields = Projection._compile(self.fields)
+
+    def loads(self, content):
+        """
+        Decodes a JSON document
+
+        Args:
+            content (str): the JSON document
+
+        Returns:
+            any: the decoded document, with only the projected fields
+        """
+        try:
+            value, end = _value(content, _whitespace(content, 0).end(), self._fields)
+        except StopIteration as e:
+            raise ValueError("Expecting value at position {position}".format(position=e.args[0] if e.args else "?"))
+        except IndexError:
+            raise ValueError("Unexpected end of JSON document")
+
+        end = _whitespace(content, end).end()
+        if end != len(content):
+            raise ValueError("Extra data at position {position}".format(position=end))
+        return value
+
+    @staticmethod
+    def _tree(paths):
+        # Turns dotted paths into a nested dict. A path that keeps a whole value wins over deeper paths into it.
+        tree = {}
+        for path in paths:
+            parts = path.split(".")
+            node = tree
+            for part in parts[:-1]:
+                if part in node and node[part] is None:
+                    break
+                node = node.setdefault(part, {})
+            else:
+                node[parts[-1]] = None
+        return tree
+
+    @staticmethod
+    def _compile(fields):
+        # Fields which only keep whole values become a frozenset, so objects for them can be read in one go
+        if all(field is None for field in fields.values()):
+            return frozenset(fields)
+        return {key: Projection._compile(field) if field is not None else None for key, field in fields.items()}
+
+
+def _value(s, i, fields):
+    # Reads the value starting at s[i] and returns it with the position just after it
+    char = s[i]
+    if char == "{":
+        if fields.__class__ is frozenset:
+            # Objects which only keep plain fields are quicker to read whole and pick from
+            obj, i = _scan_once(s, i)
+            return {key: obj[key] for key in fields if key in obj}, i
+        return _object(s, i + 1, fields)
+    if char == "[":
+        return _array(s, i + 1, fields)
+    return _scan_once(s, i)
+
+
+def _object(s, i, fields):
+    obj = {}
+    if s[i] in _blank:
+        i = _whitespace(s, i).end()
+    if s[i] == "}":
+        return obj, i + 1
+
+    while True:
+        if s[i] != "\"":
+            raise ValueError("Expecting property name at position {position}".format(position=i))
+        key, i = _scanstring(s, i + 1)
+        if s[i] != ":":
+            i = _whitespace(s, i).end()
+            if s[i] != ":":
+                raise ValueError("Expecting ':' at position {position}".format(position=i))
+        i += 1
+        if s[i] in _blank:
+            i = _whitespace(s, i).end()
+
+        if key in fields:
+            field = fields[key]
+            if field is None:
+                obj[key], i = _scan_once(s, i)
+            else:
+                obj[key], i = _value(s, i, field)
+        else:
+            # The value is read past and dropped straight away
+            i = _scan_once(s, i)[1]
+
+        if s[i] in _blank:
+            i = _whitespace(s, i).end()
+        if s[i] == "}":
+            return obj, i + 1
+        if s[i] != ",":
+            raise ValueError("Expecting ',' at position {position}".format(position=i))
+        i += 1
+        if s[i] in _blank:
+            i = _whitespace(s, i).end()
+
+
+def _array(s, i, fields):
+    array = []
+    if s[i] in _blank:
+        i = _whitespace(s, i).end()
+    if s[i] == "]":
+        return array, i + 1
+
+    while True:
+        value, i = _value(s, i, fields)
+        array.append(value)
+        if s[i] in _blank:
+            i = _whitespace(s, i).end()
+        if s[i] == "]":
+            return array, i + 1
+        if s[i] != ",":
+            raise ValueError("Expecting ',' at position {position}".format(position=i))
+        i += 1
+        if s[i] in _blank:
+            i = _whitespace(s, i).end()
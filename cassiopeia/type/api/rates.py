@@ -1,190 +1,307 @@
+import array
 import threading
+import time
+
+try:
+    _clock = time.monotonic
+except AttributeError:
+    _clock = time.time
 
 
 class SingleRateLimiter(object):
     """
     Handles a single rate limit, ensuring that calls don't exceed it
+
+    Every call reserves a slot in a sliding window log. The log is a ring buffer holding the start times of the last calls_per_epoch calls, so a new call is allowed once the oldest of them is seconds_per_epoch old.
+    Reserving a slot is O(1) and no background threads are used. Calls that don't fit in the current window are scheduled in the future, first come first serve, and the calling thread sleeps until its slot.
     """
 
     def __init__(self, calls_per_epoch, seconds_per_epoch):
         """
-        Handles a single rate limit, ensuring that calls don't exceed it
+        Args:
+            calls_per_epoch (int): the number of calls allowed in each epoch
+            seconds_per_epoch (int): the number of seconds per epoch
         """
+        self.limit = calls_per_epoch
         self.seconds_per_epoch = seconds_per_epoch
-        self.semaphore = threading.Semaphore(calls_per_epoch)
         self.lock = threading.Lock()
-        self.current = 0
-        self.limit = calls_per_epoch
-        self.resetter = None
+        self._issued = array.array("d", [float("-inf")]) * calls_per_epoch
+        self._oldest = 0
+        self._last = float("-inf")
+        self._blocked_until = float("-inf")
+        self._shifts = []
         self._total_calls = 0
         self._successful_calls = 0
 
     def call(self, method=None, *args):
         """
+        Calls a function when the rate limit allows (first come first serve)
+
         Args:
-            calls_per_epoch (int): the number of calls allowed in each epoch
-            seconds_per_epoch (int): the number of seconds per epoch
-        """
-        # Block until a call opens up
-        self.semaphore.acquire()
+            method (function): the function which will be called when the rate limit allows (default None)
+            *args (any...): the arguments to be passed to the functions when it is called
 
-        # Current tracks how many calls are currently inside the method body
-        with self.lock:
-            self.current += 1
+        Returns:
+            any: the result of the function once it has been called
+        """
+        _sleep_until(self, self.reserve())
 
         successful_call = True
         try:
             return method(*args) if method else None
-        except:
+        except BaseException:
             successful_call = False
             raise
         finally:
-            # If we don't have an epoch timer running, start one. Also count that we've completed a call.
-            with self.lock:
-                if not self.resetter:
-                    self.resetter = threading.Timer(self.seconds_per_epoch, self._reset)
-                    self.resetter.daemon = True
-                    self.resetter.start()
-
-                self.current -= 1
-                self._total_calls += 1
-                if successful_call:
-                    self._successful_calls += 1
+            self.record_call(successful_call)
 
-    def _drain(self):
+    def reserve(self):
         """
-        Calls a function when the rate limit allows (first come first serve)
-
-        Args:
-            method (function): the function which will be called when the rate limit allows
-            *args (any...): the arguments to be passed to the functions when it is called
+        Reserves the next free call slot without waiting for it
 
         Returns:
-            any: the result of the function once it has been called
+            float: the (monotonic clock) time at which the reserved call may be made
         """
-        while self.semaphore.acquire(False):
-            pass
+        with self.lock:
+            when = self._next_slot(_clock())
+            self._take(when)
+        return when
 
-    def _reset(self):
+    def delay(self, until):
         """
-        Calls a function when the rate limit allows (first come first serve)
+        Gets how long to wait before a reserved call may be made, taking any later reset_in into account
 
         Args:
-            method (function): the function which will be called when the rate limit allows
-            *args (any...): the arguments to be passed to the functions when it is called
+            until (float): the time returned by reserve
 
         Returns:
-            any: the result of the function once it has been called
+            float: the number of seconds to wait (0 or less if the call may be made now)
         """
-        self.lock.acquire()
+        # Called by every waiting thread each time it wakes up, so it doesn't take the lock. reset_in replaces the pauses in one go, so they're never seen half updated.
+        return max(_shifted(self, until), self._blocked_until) - _clock()
 
-        self._drain()
-        for _ in range(self.limit - self.current):
-            self.semaphore.release()
-        self.resetter = None
+    def record_call(self, successful_call):
+        """
+        Counts a completed call
 
-        self.lock.release()
+        Args:
+            successful_call (bool): whether the call completed without an exception
+        """
+        with self.lock:
+            self._total_calls += 1
+            if successful_call:
+                self._successful_calls += 1
 
     def wait(self):
         """
-        Calls a function when the rate limit allows (first come first serve)
+        Waits until a call becomes available without using it
+        """
+        _sleep_until(self, self.available_at())
 
-        Args:
-            method (function): the function which will be called when the rate limit allows
-            *args (any...): the arguments to be passed to the functions when it is called
+    def available_at(self):
+        """
+        Gets when the next call may be made, without reserving it
 
         Returns:
-            any: the result of the function once it has been called
+            float: the (monotonic clock) time at which the next call may be made
         """
-        self.semaphore.acquire()
-        self.semaphore.release()
+        with self.lock:
+            return self._next_slot(_clock())
 
     def reset_in(self, seconds):
         """
-        Calls a function when the rate limit allows (first come first serve)
+        Stops all calls (including ones which have already been scheduled) for a number of seconds. Calls which were already scheduled are pushed back by the length of the pause, keeping their spacing, so they don't all go out at once when it ends.
 
         Args:
-            method (function): the function which will be called when the rate limit allows
-            *args (any...): the arguments to be passed to the functions when it is called
-
-        Returns:
-            any: the result of the function once it has been called
+            seconds (int): the number of seconds to wait before allowing calls again
         """
         with self.lock:
+            _pause(self, [self], _clock() + seconds)
 
-            if self.resetter:
-                self.resetter.cancel()
-
-            self._drain()
-            self.resetter = threading.Timer(seconds, self._reset)
-            self.resetter.daemon = True
-            self.resetter.start()
+    def synchronize(self, counts, limits=None):
+        """
+        Brings the number of calls made in the current epoch up to what the server reports (e.g. from an X-App-Rate-Limit-Count header), so calls made by other processes or before a restart are accounted for
 
-    def _decrease_successful_calls(self):
+        Args:
+            counts (list<tuple>): the server's call counts, as (calls_made, seconds_per_epoch) tuples. Only the count for this limiter's epoch is used.
+            limits (list<tuple>): the server's rate limits. A single rate limit can't change its epochs, so these are ignored. (default None)
+        """
         with self.lock:
-            self._successful_calls -= 1
+            now = _clock()
+            for count, seconds in counts:
+                if seconds == self.seconds_per_epoch:
+                    self._catch_up(count, now, max(now, self._last))
 
     @property
     def calls(self):
         """
-        Drains all remaining calls
+        Returns the number of successful calls (no exceptions in the call) and total calls served by this limiter
+
+        Returns:
+            tuple: a (successful calls, total calls) tuple
         """
         with self.lock:
             return (self._successful_calls, self._total_calls)
 
+    def _next_slot(self, now):
+        return max(self._next_available(now), self._last)
+
+    def _take(self, when):
+        self._record(when)
+        self._last = when
+
+    def _next_available(self, now):
+        return max(now, self._blocked_until, self._issued[self._oldest] + self.seconds_per_epoch)
+
+    def _record(self, when):
+        # Reservations are handed out in non-decreasing order, so the ring buffer stays sorted and the slot being overwritten is always the oldest
+        self._issued[self._oldest] = when
+        self._oldest += 1
+        if self._oldest == self.limit:
+            self._oldest = 0
+
+    def _count_since(self, start):
+        # Binary search the (sorted) ring buffer for the first call made after start
+        low = 0
+        high = self.limit
+        while low < high:
+            middle = (low + high) // 2
+            if self._issued[(self._oldest + middle) % self.limit] > start:
+                high = middle
+            else:
+                low = middle + 1
+        return self.limit - low
+
+    def _catch_up(self, count, now, when):
+        # Calls the server has seen but we haven't are logged at when (no earlier than any logged call) to keep the ring buffer sorted.
+        # The server uses fixed windows, so a lower count than ours doesn't mean calls are free and is ignored.
+        missing = min(count, self.limit) - self._count_since(now - self.seconds_per_epoch)
+        for _ in range(missing):
+            self._record(when)
+
+    def _shift(self, after, amount):
+        # Pushes back the calls logged after a time. They're the newest ones, so the ring buffer stays sorted.
+        for i in range(self.limit):
+            index = (self._oldest - 1 - i) % self.limit
+            if self._issued[index] <= after:
+                break
+            self._issued[index] += amount
+
+    def _entries(self):
+        return [self._issued[(self._oldest + i) % self.limit] for i in range(self.limit)]
+
+    def _resized(self, calls_per_epoch):
+        # Makes a limiter for the same epoch with a different number of calls, keeping the most recent calls
+        limiter = SingleRateLimiter(calls_per_epoch, self.seconds_per_epoch)
+        entries = self._entries()[-calls_per_epoch:]
+        limiter._issued[calls_per_epoch - len(entries):] = array.array("d", entries)
+        limiter._last = self._last
+        limiter._blocked_until = self._blocked_until
+        return limiter
+
 
 class MultiRateLimiter(object):
     """
-    Resets the rate limit
+    Handles several rate limits at once (e.g. 10 calls per 10 seconds and 500 calls per 10 minutes), scheduling each call so that it respects all of them
     """
 
     def __init__(self, *limits):
         """
-        Resets the rate limit
+        Args:
+            *limits (tuple...): the rate limits to apply. Rate limits are of the form (calls_per_epoch, seconds_per_epoch)
         """
-        self.limits = []
-
-        for limit in limits:
-            self.limits.append(SingleRateLimiter(limit[0], limit[1]))
+        self.limits = [SingleRateLimiter(limit[0], limit[1]) for limit in limits]
+        self.lock = threading.Lock()
+        self._last = float("-inf")
+        self._blocked_until = float("-inf")
+        self._shifts = []
+        self._total_calls = 0
+        self._successful_calls = 0
 
-    def call(self, method=None, *args):  # TODO
+    def call(self, method=None, *args):
         """
-        Waits until a call becomes available
+        Calls a function when all the rate limits allow (first come first serve)
+
+        Args:
+            method (function): the function which will be called when the rate limits allow (default None)
+            *args (any...): the arguments to be passed to the functions when it is called
+
+        Returns:
+            any: the result of the function once it has been called
         """
-        self.wait()
+        _sleep_until(self, self.reserve())
 
         successful_call = True
         try:
             return method(*args) if method else None
-        except:
+        except BaseException:
             successful_call = False
             raise
         finally:
-            for limit in self.limits:
-                # call with method=None always updates the successful calls
-                limit.call()
-                if not successful_call:
-                    limit._decrease_successful_calls()
+            self.record_call(successful_call)
 
-    def wait(self):
+    def reserve(self):
+        """
+        Reserves the next call slot which is free in every rate limit without waiting for it
+
+        Returns:
+            float: the (monotonic clock) time at which the reserved call may be made
+        """
+        with self.lock:
+            when = self._next_slot(_clock())
+            self._take(when)
+        return when
+
+    def delay(self, until):
+        """
+        Gets how long to wait before a reserved call may be made, taking any later reset_in into account
+
+        Args:
+            until (float): the time returned by reserve
+
+        Returns:
+            float: the number of seconds to wait (0 or less if the call may be made now)
         """
-        Resets the rate limiter after waiting
+        # Called by every waiting thread each time it wakes up, so it doesn't take the lock. reset_in replaces the pauses in one go, so they're never seen half updated.
+        return max(_shifted(self, until), self._blocked_until) - _clock()
+
+    def record_call(self, successful_call):
+        """
+        Counts a completed call
 
         Args:
-            seconds (int): the number of seconds to wait before resetting
+            successful_call (bool): whether the call completed without an exception
         """
-        for limit in self.limits:
-            limit.wait()
+        with self.lock:
+            self._total_calls += 1
+            if successful_call:
+                self._successful_calls += 1
+
+    def wait(self):
+        """
+        Waits until a call becomes available without using it
+        """
+        _sleep_until(self, self.available_at())
+
+    def available_at(self):
+        """
+        Gets when the next call may be made, without reserving it
+
+        Returns:
+            float: the (monotonic clock) time at which the next call may be made
+        """
+        with self.lock:
+            return self._next_slot(_clock())
 
     def reset_in(self, seconds):
         """
-        Resets the rate limiter after waiting
+        Stops all calls (including ones which have already been scheduled) for a number of seconds. Calls which were already scheduled are pushed back by the length of the pause, keeping their spacing, so they don't all go out at once when it ends.
 
         Args:
-            seconds (int): the number of seconds to wait before resetting
+            seconds (int): the number of seconds to wait before allowing calls again
         """
-        for limit in self.limits:
-            limit.reset_in(seconds)
+        with self.lock:
+            _pause(self, self.limits, _clock() + seconds)
 
     @property
     def calls(self):
@@ -192,10 +309,179 @@ class MultiRateLimiter(object):
         Returns the number of successful calls (no exceptions in the call) and total calls served by this limiter
 
         Returns:
-            return: tuple   A (successful calls, total calls) tuple
+            tuple: a (successful calls, total calls) tuple
         """
-        try:
-            return self.limits[0].calls
-        except IndexError:
-            # Disable the counting if no limits are enforced
-            return 0
+        with self.lock:
+            return (self._successful_calls, self._total_calls)
+
+    def synchronize(self, counts, limits=None):
+        """
+        Adopts the rate limits the server reports (e.g. from an X-App-Rate-Limit header) and brings the number of calls made in each epoch up to the server's counts, so calls made by other processes or before a restart are accounted for
+
+        Args:
+            counts (list<tuple>): the server's call counts, as (calls_made, seconds_per_epoch) tuples
+            limits (list<tuple>): the server's rate limits, as (calls_per_epoch, seconds_per_epoch) tuples. If given, these replace the current rate limits. (default None)
+        """
+        with self.lock:
+            if limits and sorted(limits) != sorted((limit.limit, limit.seconds_per_epoch) for limit in self.limits):
+                self._adopt(limits)
+
+            now = _clock()
+            for count, seconds in counts:
+                for limit in self.limits:
+                    if limit.seconds_per_epoch == seconds:
+                        limit._catch_up(count, now, max(now, self._last))
+
+    def _next_slot(self, now):
+        when = max(now, self._last, self._blocked_until)
+        for limit in self.limits:
+            when = max(when, limit._next_available(now))
+        return when
+
+    def _take(self, when):
+        for limit in self.limits:
+            limit._record(when)
+        self._last = when
+
+    def _adopt(self, limits):
+        current = {limit.seconds_per_epoch: limit for limit in self.limits}
+        adopted = []
+        for calls_per_epoch, seconds_per_epoch in limits:
+            limit = current.get(seconds_per_epoch)
+            if not limit:
+                limit = SingleRateLimiter(calls_per_epoch, seconds_per_epoch)
+            elif limit.limit != calls_per_epoch:
+                limit = limit._resized(calls_per_epoch)
+            adopted.append(limit)
+        self.limits = adopted
+
+
+class RateLimiterRegistry(object):
+    """
+    Keeps a separate rate limiter for each region and API family (match, summoner, league, etc.), which is how Riot applies method rate limits
+    """
+
+    def __init__(self):
+        self.limits = {}
+        self.lock = threading.Lock()
+        self._limiters = {}
+
+    def get(self, region, family):
+        """
+        Gets the rate limiter for an API family in a region, creating it if rate limits have been set for that family
+
+        Args:
+            region (str): the region
+            family (str): the API family
+
+        Returns:
+            MultiRateLimiter: the rate limiter, or None if that API family isn't rate limited
+        """
+        limiter = self._limiters.get((region, family))
+        if limiter is None and family in self.limits:
+            limiter = self.learn(region, family, self.limits[family])
+        return limiter
+
+    def learn(self, region, family, limits):
+        """
+        Gets the rate limiter for an API family in a region, creating it with the given rate limits if there isn't one yet
+
+        Args:
+            region (str): the region
+            family (str): the API family
+            limits (list<tuple>): the rate limits to use for a new limiter. Rate limits are of the form (calls_per_epoch, seconds_per_epoch)
+
+        Returns:
+            MultiRateLimiter: the rate limiter
+        """
+        with self.lock:
+            limiter = self._limiters.get((region, family))
+            if limiter is None:
+                limiter = MultiRateLimiter(*limits)
+                self._limiters[(region, family)] = limiter
+            return limiter
+
+    def set_limits(self, family, *limits):
+        """
+        Sets the rate limits for an API family in every region, replacing any limits learned so far
+
+        Args:
+            family (str): the API family
+            *limits (tuple...): the rate limits to apply. Rate limits are of the form (calls_per_epoch, seconds_per_epoch). If none are given, the API family won't be rate limited until new limits are learned.
+        """
+        with self.lock:
+            if limits:
+                self.limits[family] = limits
+            else:
+                self.limits.pop(family, None)
+            for key in [key for key in self._limiters if key[1] == family]:
+                del self._limiters[key]
+
+    def limiters(self):
+        """
+        Gets all the rate limiters created so far
+
+        Returns:
+            dict<tuple, MultiRateLimiter>: the rate limiters, keyed by (region, API family)
+        """
+        with self.lock:
+            return dict(self._limiters)
+
+
+def call_all(limiters, method=None, *args):
+    """
+    Calls a function once each of several rate limiters (e.g. a method and an application rate limit) allows it
+
+    The call waits for a slot in each limiter in turn, so a call held back by one limiter doesn't hold up the calls queued in the next one. Pass the most specific limiter first.
+
+    Args:
+        limiters (list<SingleRateLimiter | MultiRateLimiter>): the rate limiters the call counts against
+        method (function): the function which will be called when the rate limits allow (default None)
+        *args (any...): the arguments to be passed to the functions when it is called
+
+    Returns:
+        any: the result of the function once it has been called
+    """
+    for limiter in limiters:
+        _sleep_until(limiter, limiter.reserve())
+
+    successful_call = True
+    try:
+        return method(*args) if method else None
+    except BaseException:
+        successful_call = False
+        raise
+    finally:
+        for limiter in limiters:
+            limiter.record_call(successful_call)
+
+
+def _pause(limiter, limits, until):
+    # Blocks calls until a time. Calls which are scheduled but haven't gone out yet are pushed back by as long as the pause, in the log and for the threads waiting on them.
+    now = _clock()
+    if until <= max(now, limiter._blocked_until):
+        return
+
+    amount = until - max(now, limiter._blocked_until)
+    if limiter._last > now:
+        for limit in limits:
+            limit._shift(now, amount)
+        limiter._shifts = [shift for shift in limiter._shifts if shift[1] + shift[2] > now] + [(now, limiter._last, amount)]
+        limiter._last += amount
+    limiter._blocked_until = until
+
+
+def _shifted(limiter, when):
+    # Gets when a reserved call goes out, taking the pauses since it was reserved into account. Calls reserved after a pause are later than any call it pushed back, so they aren't pushed back by it.
+    for after, until, amount in limiter._shifts:
+        if after < when <= until:
+            when += amount
+    return when
+
+
+def _sleep_until(limiter, when):
+    # Check again after waking up in case reset_in pushed the call back while we slept
+    delay = limiter.delay(when)
+    while delay > 0:
+        time.sleep(delay)
+        delay = limiter.delay(when)
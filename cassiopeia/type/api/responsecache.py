@@ -0,0 +1,118 @@
+import hashlib
+import os
+import struct
+import threading
+import time
+import urllib.parse
+import zlib
+
+import cassiopeia.type.api.common
+
+# Each file is a header (the time it was stored and the length of the data version) followed by the data version and the compressed response body
+_header = struct.Struct("<dH")
+
+
+class ResponseCache(object):
+    """
+    Keeps the bodies of Riot API responses in compressed files on disk, keyed by the request URL without the API key, so they don't have to be downloaded again by the next process
+    """
+
+    def __init__(self, directory, ttls={"staticdata": None}, version_ttl=3600):
+        """
+        Args:
+            directory (str): the directory to keep the responses in, which is created if it doesn't exist
+            ttls (dict<str, float>): the API families (e.g. "staticdata" or "match") to cache and the number of seconds to keep their responses for. None keeps them with no time limit. Static data is also dropped when the data version changes. Families which aren't listed aren't cached. (default {"staticdata": None})
+            version_ttl (float): the number of seconds to keep the realm and versions responses for, which say what the current data version is (default 3600)
+        """
+        self.directory = directory
+        self.ttls = dict(ttls)
+        self.version_ttl = version_ttl
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+
+    def caches(self, family):
+        """
+        Checks whether responses for an API family are cached
+
+        Args:
+            family (str): the API family
+
+        Returns:
+            bool: whether responses for the family are cached
+        """
+        return family in self.ttls
+
+    def get(self, url, ttl=None, version=None):
+        """
+        Gets a cached response body
+
+        Args:
+            url (str): the request URL
+            ttl (float): the number of seconds the response is good for after it was stored. None doesn't expire it. (default None)
+            version (str): the current data version. Responses stored with a different version aren't returned. None skips the check. (default None)
+
+        Returns:
+            str: the response body, or None if it isn't cached, has expired, or is for another data version
+        """
+        try:
+            with open(self._path(url), "rb") as cache_file:
+                data = cache_file.read()
+            stored, length = _header.unpack_from(data)
+            start = _header.size + length
+            stored_version = data[_header.size:start].decode("UTF-8") or None
+
+            if (ttl is None or time.time() - stored < ttl) and (version is None or stored_version == version):
+                content = zlib.decompress(data[start:]).decode("UTF-8")
+                with self._lock:
+                    self._hits += 1
+                return content
+        except (IOError, OSError, struct.error, zlib.error, UnicodeDecodeError):
+            # Missing or damaged files are just misses
+            pass
+
+        with self._lock:
+            self._misses += 1
+        return None
+
+    def put(self, url, content, version=None):
+        """
+        Stores a response body
+
+        Args:
+            url (str): the request URL
+            content (str): the response body
+            version (str): the data version the response is for (default None)
+        """
+        version = (version or "").encode("UTF-8")
+        data = _header.pack(time.time(), len(version)) + version + zlib.compress(content.encode("UTF-8"))
+
+        cassiopeia.type.api.common.atomic_write(self._path(url), data)
+
+    def clear(self):
+        """
+        Deletes every cached response
+        """
+        for name in os.listdir(self.directory):
+            os.remove(os.path.join(self.directory, name))
+
+    @property
+    def stats(self):
+        """
+        Returns the number of responses which were and weren't found in the cache
+
+        Returns:
+            dict: the "hits" and "misses" counts
+        """
+        with self._lock:
+            return {"hits": self._hits, "misses": self._misses}
+
+    def _path(self, url):
+        # The API key is left out so responses are shared between keys
+        parts = urllib.parse.urlsplit(url)
+        query = urllib.parse.urlencode([(key, value) for key, value in urllib.parse.parse_qsl(parts.query) if key != "api_key"])
+        key = urllib.parse.urlunsplit((parts.scheme, parts.netloc, parts.path, query, ""))
+        return os.path.join(self.directory, hashlib.sha1(key.encode("UTF-8")).hexdigest())
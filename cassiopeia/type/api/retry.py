@@ -0,0 +1,49 @@
+import random
+
+
+class RetryPolicy(object):
+    """
+    Decides whether a failed request to the Riot API should be retried, and how long to wait first
+
+    Waits grow exponentially with each attempt up to a cap, and are jittered ("full jitter": a random wait between 0 and the exponential delay) so that many threads or coroutines which failed together don't all retry at the same moment.
+    """
+
+    def __init__(self, max_attempts=5, base_delay=1, max_delay=60, retry_codes=(429, 500, 503)):
+        """
+        Args:
+            max_attempts (int): the maximum number of times to send a request, including the first attempt (default 5)
+            base_delay (float): the maximum wait in seconds before the first retry. Later retries double it each time. (default 1)
+            max_delay (float): the longest the wait before a retry can get, in seconds (default 60)
+            retry_codes (tuple<int>): the HTTP status codes to retry (default (429, 500, 503))
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_codes = retry_codes
+
+    def should_retry(self, code, attempt):
+        """
+        Checks whether a request that failed should be sent again
+
+        Args:
+            code (int): the HTTP status code the request failed with
+            attempt (int): the number of times the request has been sent so far
+
+        Returns:
+            bool: whether to retry the request
+        """
+        return code in self.retry_codes and attempt < self.max_attempts
+
+    def backoff(self, attempt, retry_after=0):
+        """
+        Gets how long to wait before sending a request again
+
+        Args:
+            attempt (int): the number of times the request has been sent so far
+            retry_after (float): the wait the server asked for, if any. The backoff is never shorter than this. (default 0)
+
+        Returns:
+            float: the number of seconds to wait
+        """
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return max(retry_after, random.uniform(0, delay))
@@ -0,0 +1,72 @@
+import sys
+import threading
+
+
+class _Call(object):
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """
+    Deduplicates concurrent calls. While a call for a key is running, other threads asking for the same key wait for it and share its result (or exception) instead of making the call themselves.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._calls = {}
+        self._made = 0
+        self._shared = 0
+
+    def do(self, key, method, *args):
+        """
+        Calls a function, unless a call for the same key is already running, in which case its result is returned once it finishes
+
+        Args:
+            key (any): identifies calls which can share a result
+            method (function): the function to call
+            *args (any...): the arguments to pass to the function
+
+        Returns:
+            any: the result of the function
+        """
+        with self.lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self._made += 1
+            else:
+                self._shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = method(*args)
+            return call.result
+        except BaseException:
+            call.error = sys.exc_info()[1]
+            raise
+        finally:
+            # Calls which start after this point make a new request rather than getting a stale result
+            with self.lock:
+                del self._calls[key]
+            call.done.set()
+
+    @property
+    def stats(self):
+        """
+        Returns how many calls were made and how many were answered by sharing another call's result
+
+        Returns:
+            dict: the "made" and "shared" counts
+        """
+        with self.lock:
+            return {"made": self._made, "shared": self._shared}
@@ -1,10 +1,25 @@
+import atexit
+import collections
+import threading
+import time
+
 import cassiopeia.type.dto.common
 import cassiopeia.type.core.common
 
 
 if cassiopeia.type.dto.common.sqlalchemy_imported:
     import sqlalchemy
+    import sqlalchemy.dialects.postgresql
+    import sqlalchemy.dialects.sqlite
+    import sqlalchemy.event
+    import sqlalchemy.exc
     import sqlalchemy.orm
+    import sqlalchemy.pool
+
+try:
+    _clock = time.monotonic
+except AttributeError:
+    _clock = time.time
 
 
 class DataStore(object):
@@ -104,66 +119,329 @@ class VoidDataStore(DataStore):
 #############################
 # In-memory Cache resources #
 #############################
+class _Segment(object):
+    # One lock stripe of the entries for a class, in least to most recently used order
+    def __init__(self, capacity):
+        self.lock = threading.Lock()
+        self.capacity = capacity
+        self.entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+
+class _ClassCache(object):
+    # The entries for one class, split across lock stripes by key
+    def __init__(self, capacity, ttl, stripes):
+        if capacity:
+            stripes = max(1, min(stripes, capacity // 64))
+        self.ttl = ttl
+        self.segments = [_Segment(-(-capacity // stripes) if capacity else None) for _ in range(stripes)]
+        self.has_all = False
+
+        # When the first object of the complete set expires, after which it isn't complete any more
+        self.complete_until = None
+
+    def segment(self, key):
+        return self.segments[hash(key) % len(self.segments)]
+
+
 @cassiopeia.type.core.common.inheritdocs
 class Cache(DataStore):
     """
-    Stores objects in the data store
+    Stores objects in memory. The number of objects kept for each class can be capped (least recently used objects are evicted first) and objects can be set to expire after some time.
 
-    Args:
-        objs (any): the objects to store
-        keys (any | list<any>): the keys to store those values with
-        complete_sets (list<type>): include any types for which it should be marked that all possible values are stored
+    Keys are split across several locks (lock striping), so threads storing and getting different keys rarely wait on each other. With a capacity set, each lock stripe evicts on its own, which approximates LRU for the class as a whole.
     """
 
-    def __init__(self):
-        self._cache = {}
-        self._has_all = {}
+    def __init__(self, capacity=None, ttl=None, capacities={}, ttls={}, stripes=16):
+        """
+        Args:
+            capacity (int): the most objects to keep for each class. None keeps everything. (default None)
+            ttl (float): the number of seconds objects stay in the cache. None keeps them until they are evicted. (default None)
+            capacities (dict<type, int>): capacities for specific classes, overriding capacity (default {})
+            ttls (dict<type, float>): times to live for specific classes, overriding ttl (e.g. {Summoner: 3600} while keeping static data forever) (default {})
+            stripes (int): the number of locks to split each class's objects across (default 16)
+        """
+        self.capacity = capacity
+        self.ttl = ttl
+        self.capacities = dict(capacities)
+        self.ttls = dict(ttls)
+        self.stripes = stripes
+        self._classes = {}
+        self._lock = threading.Lock()
 
     def has_all(self, class_):
-        try:
-            return self._has_all[class_]
-        except KeyError:
+        cache = self._classes.get(class_)
+        if not cache or not cache.has_all:
             return False
+        if cache.complete_until is not None and cache.complete_until <= _clock():
+            cache.has_all = False
+        return cache.has_all
 
     def get_all(self, class_):
-        results = []
-        try:
-            for obj in self._cache[class_].items():
-                results.append(obj[1])
-        except KeyError:
-            pass
-
-        return results
+        return list(self.iterate(class_))
 
     def iterate(self, class_):
-        try:
-            iter(self._cache[class_].values())
-        except KeyError:
+        cache = self._classes.get(class_)
+        if not cache:
             return iter([])
 
-    def get(self, class_, keys, key_field):
-        if class_ not in self._cache:
-            if not isinstance(keys, list):
-                return None
-            else:
-                results = []
-                for _ in range(len(keys)):
-                    results.append(None)
-                return results
+        now = _clock()
+        results = []
+        for segment in cache.segments:
+            with segment.lock:
+                expired = []
+                for key, (expires, value) in segment.entries.items():
+                    if expires is None or expires > now:
+                        results.append(value)
+                    else:
+                        expired.append(key)
+
+                # Expired objects are dropped, so the set isn't complete any more
+                for key in expired:
+                    del segment.entries[key]
+                    segment.expirations += 1
+                    cache.has_all = False
+        return iter(results)
 
+    def get(self, class_, keys, key_field):
+        cache = self._classes.get(class_)
         if not isinstance(keys, list):
+            return self._get(cache, keys, _clock()) if cache else None
+
+        if not cache:
+            return [None for _ in range(len(keys))]
+        now = _clock()
+        return [self._get(cache, key, now) for key in keys]
+
+    def store(self, objs, keys, complete_sets=[]):
+        is_list = isinstance(objs, list)
+        if is_list != isinstance(keys, list):
+            raise ValueError("Object(s) and Key(s) must both be lists or both be non-lists")
+
+        if not is_list:
+            objs = [objs]
+            keys = [keys]
+        elif len(objs) != len(keys):
+            raise ValueError("Objects and Keys must be the same length")
+
+        now = _clock()
+        for i in range(len(objs)):
+            self._store(self._class_cache(type(objs[i])), keys[i], objs[i], now)
+
+        if complete_sets:
+            for class_ in complete_sets:
+                cache = self._class_cache(class_)
+                expiries = []
+                for segment in cache.segments:
+                    with segment.lock:
+                        expiries.extend(expires for expires, _ in segment.entries.values() if expires is not None)
+                cache.complete_until = min(expiries) if expiries else None
+                cache.has_all = True
+
+    @property
+    def stats(self):
+        """
+        Returns the number of cache hits, misses, evictions (to stay under the capacity), and expirations for each class, along with the number of objects stored
+
+        Returns:
+            dict<type, dict>: the stats for each class that has been stored
+        """
+        stats = {}
+        for class_, cache in list(self._classes.items()):
+            stats[class_] = {
+                "size": sum(len(segment.entries) for segment in cache.segments),
+                "hits": sum(segment.hits for segment in cache.segments),
+                "misses": sum(segment.misses for segment in cache.segments),
+                "evictions": sum(segment.evictions for segment in cache.segments),
+                "expirations": sum(segment.expirations for segment in cache.segments)
+            }
+        return stats
+
+    def _class_cache(self, class_):
+        cache = self._classes.get(class_)
+        if not cache:
+            with self._lock:
+                cache = self._classes.get(class_)
+                if not cache:
+                    cache = _ClassCache(self.capacities.get(class_, self.capacity), self.ttls.get(class_, self.ttl), self.stripes)
+                    self._classes[class_] = cache
+        return cache
+
+    def _get(self, cache, key, now):
+        segment = cache.segment(key)
+        with segment.lock:
             try:
-                return self._cache[class_][keys]
+                expires, value = segment.entries.pop(key)
             except KeyError:
+                segment.misses += 1
                 return None
-        else:
-            results = []
-            for key in keys:
-                try:
-                    results.append(self._cache[class_][key])
-                except KeyError:
-                    results.append(None)
-            return results
+
+            if expires is not None and expires <= now:
+                segment.misses += 1
+                segment.expirations += 1
+                cache.has_all = False
+                return None
+
+            # Move it to the most recently used end
+            segment.entries[key] = (expires, value)
+            segment.hits += 1
+            return value
+
+    def _store(self, cache, key, value, now):
+        segment = cache.segment(key)
+        with segment.lock:
+            segment.entries.pop(key, None)
+            segment.entries[key] = (now + cache.ttl if cache.ttl is not None else None, value)
+            if segment.capacity is not None:
+                while len(segment.entries) > segment.capacity:
+                    segment.entries.popitem(last=False)
+                    segment.evictions += 1
+                    cache.has_all = False
+
+
+####################
+# Tiered resources #
+####################
+@cassiopeia.type.core.common.inheritdocs
+class TieredDataStore(DataStore):
+    """
+    Puts an in-memory cache in front of a slower data store (e.g. a database). Lookups check the cache first and copy anything found in the slower store into it. Stores are written to both.
+    """
+
+    def __init__(self, store, cache=None):
+        """
+        Args:
+            store (DataStore): the slower data store that everything is written to
+            cache (DataStore): the in-memory data store checked first. None uses a Cache holding up to 10000 objects of each type. (default None)
+        """
+        self.data_store = store
+        self.cache = cache if cache is not None else Cache(capacity=10000)
+
+    def has_all(self, class_):
+        return self.cache.has_all(class_) or self.data_store.has_all(class_)
+
+    def get_all(self, class_):
+        if self.cache.has_all(class_):
+            return self.cache.get_all(class_)
+
+        results = self.data_store.get_all(class_)
+
+        # Complete sets (static data) are copied into the cache so later calls don't go to the slower store. They are all stored by ID.
+        if results and all(hasattr(obj, "id") for obj in results) and self.data_store.has_all(class_):
+            self.cache.store(results, [obj.id for obj in results], [class_])
+        return results
+
+    def iterate(self, class_):
+        if self.cache.has_all(class_):
+            return self.cache.iterate(class_)
+        return self.data_store.iterate(class_)
+
+    def get(self, class_, keys, key_field):
+        is_list = isinstance(keys, list)
+        if not is_list:
+            keys = [keys]
+
+        results = self.cache.get(class_, keys, key_field)
+        missing = [i for i in range(len(keys)) if results[i] is None]
+        if missing:
+            found = self.data_store.get(class_, [keys[i] for i in missing], key_field)
+            promote = []
+            for i, value in zip(missing, found):
+                results[i] = value
+                if value is not None:
+                    promote.append(i)
+
+            if promote:
+                self.cache.store([results[i] for i in promote], [keys[i] for i in promote])
+        return results if is_list else results[0]
+
+    def store(self, objs, keys, complete_sets=[]):
+        # The slower store is written first so the cache never has objects the slower store failed to take
+        self.data_store.store(objs, keys, complete_sets)
+        self.cache.store(objs, keys, complete_sets)
+
+    def close(self):
+        """
+        Closes the slower data store
+        """
+        if hasattr(self.data_store, "close"):
+            self.data_store.close()
+
+
+##########################
+# Write-behind resources #
+##########################
+@cassiopeia.type.core.common.inheritdocs
+class WriteBehindDataStore(DataStore):
+    """
+    Wraps another data store so that stores return right away and are written to it in large batches by a background thread. Objects waiting to be written are still returned by get.
+
+    Once max_pending objects are waiting, store blocks until the writer catches up. Call flush() to wait for everything queued so far to be written, and close() when you are done with the store. Calls to the wrapped store are made one at a time, so it doesn't have to be thread-safe.
+    """
+
+    def __init__(self, store, max_pending=10000, batch_size=1000, flush_interval=1.0):
+        """
+        Args:
+            store (DataStore): the data store to write to
+            max_pending (int): the most objects which can wait to be written before store blocks (default 10000)
+            batch_size (int): the most objects to write to the wrapped store at once (default 1000)
+            flush_interval (float): the longest time in seconds that objects wait for a full batch before being written (default 1.0)
+        """
+        self.data_store = store
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = collections.deque()
+        self._pending = {}
+        self._complete_sets = collections.Counter()
+        self._condition = threading.Condition()
+        self._store_lock = threading.Lock()
+        self._writing = 0
+        self._flushes = 0
+        self._closed = False
+        self._error = None
+
+        self._writer = threading.Thread(target=self._write)
+        self._writer.daemon = True
+        self._writer.start()
+        atexit.register(self.flush)
+
+    def has_all(self, class_):
+        with self._condition:
+            if self._complete_sets[class_]:
+                return True
+        with self._store_lock:
+            return self.data_store.has_all(class_)
+
+    def get_all(self, class_):
+        self.flush()
+        with self._store_lock:
+            return self.data_store.get_all(class_)
+
+    def iterate(self, class_):
+        self.flush()
+        with self._store_lock:
+            return self.data_store.iterate(class_)
+
+    def get(self, class_, keys, key_field):
+        is_list = isinstance(keys, list)
+        if not is_list:
+            keys = [keys]
+
+        with self._condition:
+            results = [self._pending.get((class_, key)) for key in keys]
+        results = [item[2] if item else None for item in results]
+
+        missing = [i for i in range(len(keys)) if results[i] is None]
+        if missing:
+            with self._store_lock:
+                found = self.data_store.get(class_, [keys[i] for i in missing], key_field)
+            for i, value in zip(missing, found):
+                results[i] = value
+        return results if is_list else results[0]
 
     def store(self, objs, keys, complete_sets=[]):
         is_list = isinstance(objs, list)
@@ -171,23 +449,131 @@ class Cache(DataStore):
             raise ValueError("Object(s) and Key(s) must both be lists or both be non-lists")
 
         if not is_list:
-            class_ = type(objs)
-            if class_ not in self._cache:
-                self._cache[class_] = {}
-            self._cache[class_][keys] = objs
-        else:
-            if len(objs) != len(keys):
-                raise ValueError("Objects and Keys must be the same length")
+            objs = [objs]
+            keys = [keys]
+        elif len(objs) != len(keys):
+            raise ValueError("Objects and Keys must be the same length")
 
-            for i in range(len(objs)):
-                class_ = type(objs[i])
-                if class_ not in self._cache:
-                    self._cache[class_] = {}
-                self._cache[class_][keys[i]] = objs[i]
+        with self._condition:
+            if self._closed:
+                raise ValueError("The data store has been closed")
 
-        if complete_sets:
+            # Backpressure. A single store larger than max_pending is let through once nothing else is pending.
+            while (self._queue or self._writing) and len(self._queue) + self._writing + len(objs) > self.max_pending:
+                self._condition.wait()
+
+            for i in range(len(objs)):
+                item = (type(objs[i]), keys[i], objs[i], complete_sets if i == len(objs) - 1 else [])
+                self._queue.append(item)
+                self._pending[(item[0], item[1])] = item
+            if not objs and complete_sets:
+                self._queue.append((None, None, None, complete_sets))
             for class_ in complete_sets:
-                self._has_all[class_] = True
+                self._complete_sets[class_] += 1
+            self._condition.notify_all()
+
+    def flush(self):
+        """
+        Waits for every object stored so far to be written to the wrapped store
+
+        Raises:
+            Exception: the first error the wrapped store raised while writing since the last flush. The objects in the batch that failed are dropped.
+        """
+        with self._condition:
+            self._flushes += 1
+            self._condition.notify_all()
+            try:
+                while self._queue or self._writing:
+                    self._condition.wait()
+            finally:
+                self._flushes -= 1
+            error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def close(self):
+        """
+        Writes everything still waiting, stops the background writer, and closes the wrapped store
+        """
+        with self._condition:
+            if self._closed:
+                return
+        try:
+            self.flush()
+        finally:
+            with self._condition:
+                self._closed = True
+                self._condition.notify_all()
+            self._writer.join()
+            if hasattr(atexit, "unregister"):
+                atexit.unregister(self.flush)
+            if hasattr(self.data_store, "close"):
+                self.data_store.close()
+
+    @property
+    def pending(self):
+        """
+        Returns the number of objects waiting to be written
+
+        Returns:
+            int: the number of objects waiting to be written
+        """
+        with self._condition:
+            return len(self._queue) + self._writing
+
+    def _write(self):
+        while True:
+            with self._condition:
+                while not self._queue:
+                    if self._closed:
+                        return
+                    self._condition.wait()
+
+                # Give the batch a chance to fill up, unless someone is waiting for it
+                deadline = _clock() + self.flush_interval
+                while len(self._queue) < self.batch_size and not self._flushes and not self._closed:
+                    remaining = deadline - _clock()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+
+                batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+                self._writing = len(batch)
+                self._condition.notify_all()
+
+            try:
+                self._write_batch(batch)
+            except Exception as e:
+                with self._condition:
+                    if self._error is None:
+                        self._error = e
+
+            with self._condition:
+                for item in batch:
+                    # A newer object stored with the same key stays pending
+                    if item[0] is not None and self._pending.get((item[0], item[1])) is item:
+                        del self._pending[(item[0], item[1])]
+                    for class_ in item[3]:
+                        self._complete_sets[class_] -= 1
+                self._writing = 0
+                self._condition.notify_all()
+
+    def _write_batch(self, batch):
+        # One store call per run of objects of the same class, so each class is written in a single transaction
+        with self._store_lock:
+            i = 0
+            while i < len(batch):
+                class_ = batch[i][0]
+                objs = []
+                keys = []
+                complete_sets = []
+                while i < len(batch) and batch[i][0] is class_:
+                    if class_ is not None:
+                        objs.append(batch[i][2])
+                        keys.append(batch[i][1])
+                    complete_sets.extend(batch[i][3])
+                    i += 1
+                self.data_store.store(objs, keys, complete_sets)
 
 
 ########################
@@ -225,37 +611,63 @@ if cassiopeia.type.dto.common.sqlalchemy_imported:
                 self.index = 0
                 return self
 
-        def __init__(self, flavor, host, database, username, password):
+        def __init__(self, flavor, host, database, username, password, bulk_inserts=True, batch_size=1000, pool_size=25, max_overflow=10):
             """
-            Stores objects in the data store
+            Each thread gets its own session, with connections taken from a shared pool, so many threads can read at once. Writes are made one at a time.
 
             Args:
-                objs (any): the objects to store
-                keys (any | list<any>): the keys to store those values with
-                complete_sets (list<type>): include any types for which it should be marked that all possible values are stored
+                flavor (str): the SQLAlchemy dialect and driver to use (e.g. "mysql+mysqlconnector" or "sqlite")
+                host (str): the database host
+                database (str): the name of the database
+                username (str): the username to log in with
+                password (str): the password to log in with
+                bulk_inserts (bool): whether to store lists of objects with bulk Core-level inserts instead of through the ORM session (default True)
+                batch_size (int): the number of objects to insert per transaction when using bulk inserts (default 1000)
+                pool_size (int): the number of connections to keep open to the database. Ignored for SQLite. (default 25)
+                max_overflow (int): the number of connections which can be opened past pool_size while every pooled one is in use. Ignored for SQLite. (default 10)
             """
+            pool_args = {} if flavor.startswith("sqlite") else {"pool_size": pool_size, "max_overflow": max_overflow}
+            engine = sqlalchemy.create_engine("{flavor}://{username}:{password}@{host}/{database}".format(flavor=flavor, host=host, database=database, username=username, password=password), **pool_args)
+            self._connect(engine, bulk_inserts, batch_size)
+
+        def _connect(self, engine, bulk_inserts, batch_size):
             _sa_bind_typesystem()
-            self.db = sqlalchemy.create_engine("{flavor}://{username}:{password}@{host}/{database}".format(flavor=flavor, host=host, database=database, username=username, password=password))
+            self.db = engine
             cassiopeia.type.dto.common.BaseDB.metadata.create_all(self.db)
-            self.session = sqlalchemy.orm.sessionmaker(bind=self.db)(expire_on_commit=False)
+            self.session = sqlalchemy.orm.scoped_session(sqlalchemy.orm.sessionmaker(bind=self.db, expire_on_commit=False))
+            self.bulk_inserts = bulk_inserts
+            self.batch_size = batch_size
+            self._plans = {}
+            self._write_lock = threading.Lock()
+
+            # SQLite and PostgreSQL can skip existing rows and hand back generated keys for a whole batch in one insert.
+            # That needs SQLAlchemy 2.0; older versions don't have the dialect flag and use the row at a time path.
+            self._native_upserts = self.db.dialect.name in ("sqlite", "postgresql") and getattr(self.db.dialect, "insert_executemany_returning", False)
 
         def has_all(self, class_):
             class_name = HasAllStatus.get_name(class_)
             has_all = self.session.query(HasAllStatus).filter(HasAllStatus.class_ == class_name).first()
+            self._release()
             return has_all.have_all if has_all else False
 
         def get_all(self, class_):
-            return [class_(dto) for dto in self.session.query(class_.dto_type).all()]
+            dtos = self.session.query(class_.dto_type).all()
+            self._release()
+            return [class_(dto) for dto in dtos]
 
         def iterate(self, class_):
-            return SQLAlchemyDB.Iterator(class_, self.session.query(class_.dto_type).all())
+            dtos = self.session.query(class_.dto_type).all()
+            self._release()
+            return SQLAlchemyDB.Iterator(class_, dtos)
 
         def get(self, class_, keys, key_field):
             if not isinstance(keys, list):
                 val = self.session.query(class_.dto_type).filter(getattr(class_.dto_type, key_field) == keys).first()
+                self._release()
                 return class_(val) if val else None
             else:
                 from_db = self.session.query(class_.dto_type).filter(getattr(class_.dto_type, key_field).in_(keys)).all()
+                self._release()
                 from_db = {getattr(x, key_field): x for x in from_db}
 
                 results = []
@@ -268,38 +680,192 @@ if cassiopeia.type.dto.common.sqlalchemy_imported:
                 return results
 
         def store(self, objs, keys=None, complete_sets=[]):
-            if not isinstance(objs, list):
-                class_ = objs.data.__class__
-                p_key = class_.__mapper__.primary_key[0].name.split("\\.")[-1]
-                val = self.session.query(class_).filter(getattr(class_, p_key) == getattr(objs.data, p_key)).first()
-                if not val:
-                    self.session.add(objs.data)
-            else:
-                class_ = objs[0].data.__class__
-                p_key = class_.__mapper__.primary_key[0].name.split("\\.")[-1]
-                to_store = {getattr(obj.data, p_key): obj.data for obj in objs}
+            # Writes are serialized so that concurrent stores of the same object don't both pass the existence check and collide on insert
+            with self._write_lock:
+                if not isinstance(objs, list):
+                    class_ = objs.data.__class__
+                    p_key = class_.__mapper__.primary_key[0].name.split("\\.")[-1]
+                    val = self.session.query(class_).filter(getattr(class_, p_key) == getattr(objs.data, p_key)).first()
+                    if not val:
+                        self.session.add(objs.data)
+                elif objs and self.bulk_inserts:
+                    self._bulk_store(objs)
+                elif objs:
+                    class_ = objs[0].data.__class__
+                    p_key = class_.__mapper__.primary_key[0].name.split("\\.")[-1]
+                    to_store = {getattr(obj.data, p_key): obj.data for obj in objs}
+
+                    for obj in self.session.query(class_).filter(getattr(class_, p_key).in_(to_store.keys())).all():
+                        del to_store[getattr(obj, p_key)]
+
+                    self.session.add_all(to_store.values())
+
+                if complete_sets:
+                    classes = {HasAllStatus.get_name(class_): HasAllStatus(class_) for class_ in complete_sets}
+                    for obj in self.session.query(HasAllStatus).filter(HasAllStatus.class_.in_(classes.keys())).all():
+                        if not obj.have_all:
+                            obj.have_all = True
+                        del classes[obj.class_]
+                    self.session.add_all(classes.values())
+
+                self.session.commit()
+
+        def close(self):
+            """
+            A mock cache that doesn't actually store anything
+            """
+            self.session.remove()
+            self.db.dispose()
 
-                for obj in self.session.query(class_).filter(getattr(class_, p_key).in_(to_store.keys())).all():
-                    del to_store[getattr(obj, p_key)]
+        def _release(self):
+            # Ends the thread's read transaction so its connection goes back to the pool. Loaded objects stay usable since they aren't expired on commit.
+            self.session.commit()
 
-                self.session.add_all(to_store.values())
+        def _bulk_store(self, objs):
+            # Inserts the objects a table at a time with one multi-row insert per table, skipping objects which are already stored
+            mapper = objs[0].data.__class__.__mapper__
+            p_key_name = mapper.get_property_by_column(mapper.primary_key[0]).key
+            dtos = list({getattr(obj.data, p_key_name): obj.data for obj in objs}.values())
+
+            for i in range(0, len(dtos), self.batch_size):
+                batch = dtos[i:i + self.batch_size]
+                self._insert_all(mapper, batch, [{}] * len(batch), True)
+                self.session.commit()
+
+        def _insert_all(self, mapper, objs, foreign_keys, skip_existing):
+            # Inserts the objects' rows, then their children's rows with the keys the database gave the parents. Children of objects which were skipped aren't inserted.
+            table, columns, id_column, relationships = self._plan(mapper)
+
+            # Reading the instance dict directly skips the ORM's attribute instrumentation, which is most of the cost otherwise
+            values = [sqlalchemy.orm.attributes.instance_dict(obj) for obj in objs]
+            rows = []
+            for obj_values, obj_foreign_keys in zip(values, foreign_keys):
+                row = {column: obj_values.get(attribute) for attribute, column in columns}
+                row.update(obj_foreign_keys)
+                rows.append(row)
+
+            keys = self._insert(table, rows, id_column, skip_existing)
+            inserted = [(row, obj_values) for row, obj_values, key in zip(rows, values, keys) if key is not None]
+            if id_column is not None:
+                for row, key in zip(rows, keys):
+                    row[id_column.key] = key
+
+            for attribute, uselist, child_mapper, pairs in relationships:
+                children = []
+                child_keys = []
+                for row, obj_values in inserted:
+                    value = obj_values.get(attribute)
+                    if value is None:
+                        continue
+                    parent_keys = {remote: row[local] for local, remote in pairs}
+                    for child in (value if uselist else [value]):
+                        children.append(child)
+                        child_keys.append(parent_keys)
+                if children:
+                    self._insert_all(child_mapper, children, child_keys, False)
+
+        def _insert(self, table, rows, key, skip_existing):
+            # Returns the primary key of each row (True if it has no single-column key), or None if it was skipped because it's already stored
+            generated = key is not None and all(row.get(key.key) is None for row in rows)
+            if generated:
+                for row in rows:
+                    row.pop(key.key, None)
+
+            # The database skips existing rows and generates the keys itself, so several processes can write at once
+            dialect = self.db.dialect.name
+            if self._native_upserts:
+                insert = sqlalchemy.dialects.sqlite.insert if dialect == "sqlite" else sqlalchemy.dialects.postgresql.insert
+                statement = insert(table)
+                if skip_existing and not generated:
+                    statement = statement.on_conflict_do_nothing()
+                if key is None:
+                    self.session.execute(statement, rows)
+                    return [True] * len(rows)
+                if generated:
+                    return list(self.session.execute(statement.returning(key, sort_by_parameter_order=True), rows).scalars())
+                stored = set(self.session.execute(statement.returning(key), rows).scalars())
+                return [row[key.key] if row[key.key] in stored else None for row in rows]
+
+            # Other databases insert a row at a time to get each generated key
+            keys = []
+            for row in rows:
+                statement = table.insert()
+                if dialect == "mysql" and skip_existing:
+                    statement = statement.prefix_with("IGNORE")
+                try:
+                    with self.session.begin_nested():
+                        result = self.session.execute(statement, row)
+                except sqlalchemy.exc.IntegrityError:
+                    if not skip_existing:
+                        raise
+                    keys.append(None)
+                    continue
+
+                if not result.rowcount:
+                    keys.append(None)
+                elif key is None:
+                    keys.append(True)
+                else:
+                    keys.append(result.inserted_primary_key[0])
+            return keys
+
+        def _plan(self, mapper):
+            # Works out (once per class) which attributes go in which columns and how the class's rows link to their children's
+            try:
+                return self._plans[mapper]
+            except KeyError:
+                pass
 
-            if complete_sets:
-                classes = {HasAllStatus.get_name(class_): HasAllStatus(class_) for class_ in complete_sets}
-                for obj in self.session.query(HasAllStatus).filter(HasAllStatus.class_.in_(classes.keys())).all():
-                    if not obj.have_all:
-                        obj.have_all = True
-                    del classes[obj.class_]
-                self.session.add_all(classes.values())
+            table = mapper.local_table
+            columns = [(prop.key, prop.columns[0].key) for prop in mapper.column_attrs]
 
-            self.session.commit()
+            p_key = table.primary_key.columns.values()
+            id_column = p_key[0] if len(p_key) == 1 and p_key[0].autoincrement is not False and isinstance(p_key[0].type, sqlalchemy.Integer) else None
 
-        def close(self):
+            relationships = [(relationship.key, relationship.uselist, relationship.mapper, [(local.key, remote.key) for local, remote in relationship.local_remote_pairs]) for relationship in mapper.relationships]
+
+            plan = (table, columns, id_column, relationships)
+            self._plans[mapper] = plan
+            return plan
+
+    @cassiopeia.type.core.common.inheritdocs
+    class SQLiteDB(SQLAlchemyDB):
+        """
+        Stores objects in a local SQLite database file, for when running a database server isn't worth it.
+
+        The database is opened in write-ahead logging mode, so lookups from other threads aren't blocked while objects are being written, and is read through memory-mapped I/O.
+        """
+
+        def __init__(self, path, bulk_inserts=True, batch_size=1000, mmap_size=268435456, cache_size=65536, timeout=30):
             """
-            A mock cache that doesn't actually store anything
+            Args:
+                path (str): the path of the database file, which is created if it doesn't exist. ":memory:" keeps the database in memory.
+                bulk_inserts (bool): whether to store lists of objects with bulk Core-level inserts instead of through the ORM session (default True)
+                batch_size (int): the number of objects to insert per transaction when using bulk inserts (default 1000)
+                mmap_size (int): the most bytes of the database file to memory-map (default 256MB)
+                cache_size (int): the size in KB of the page cache kept by each connection (default 64MB)
+                timeout (float): the number of seconds to wait for another process's write to finish before failing (default 30)
             """
-            self.session.close()
-            self.db.dispose()
+            # Statements are compiled once by SQLAlchemy and kept prepared by each connection's statement cache
+            connect_args = {"check_same_thread": False, "timeout": timeout, "cached_statements": 256}
+            if path == ":memory:":
+                # Every connection to ":memory:" would get its own empty database, so they all share one
+                engine = sqlalchemy.create_engine("sqlite://", connect_args=connect_args, poolclass=sqlalchemy.pool.StaticPool)
+            else:
+                engine = sqlalchemy.create_engine("sqlite:///{path}".format(path=path), connect_args=connect_args)
+
+            @sqlalchemy.event.listens_for(engine, "connect")
+            def set_pragmas(connection, record):
+                cursor = connection.cursor()
+                cursor.execute("PRAGMA journal_mode=WAL")
+                cursor.execute("PRAGMA synchronous=NORMAL")
+                cursor.execute("PRAGMA temp_store=MEMORY")
+                cursor.execute("PRAGMA mmap_size={size}".format(size=int(mmap_size)))
+                cursor.execute("PRAGMA cache_size=-{size}".format(size=int(cache_size)))
+                cursor.close()
+
+            self.path = path
+            self._connect(engine, bulk_inserts, batch_size)
 
 
 __sa_bound = False
@@ -1,5 +1,4 @@
 import enum
-import weakref
 import functools
 
 import cassiopeia.type.api.exception
@@ -18,6 +17,26 @@ class CassiopeiaObject(object):
             raise cassiopeia.type.api.exception.CassiopeiaException("Tried to instantiate a core {class_} with a {dto} dto!".format(class_=self.__class__.__name__, dto=data.__class__.__name__))
         self.data = data
 
+    def __setattr__(self, name, value):
+        if name == "data":
+            # The lazy properties were computed from the old data, so they're dropped
+            self.invalidate()
+        elif name in lazy_names(type(self)):
+            raise AttributeError("can't set attribute")
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name):
+        if name in lazy_names(type(self)):
+            raise AttributeError("can't delete attribute")
+        object.__delattr__(self, name)
+
+    def invalidate(self):
+        """
+        Drops the computed values of this object's lazy properties, so they're computed again from the current data the next time they're accessed. This happens automatically when the object's data is replaced.
+        """
+        for name in lazy_names(type(self)):
+            self.__dict__.pop(name, None)
+
     def to_json(self, **kwargs):
         """
         Args:
@@ -39,27 +58,27 @@ class CassiopeiaObject(object):
 
 
 class LazyProperty(object):
+    """
+    A read-only property which is computed the first time it's accessed and then kept on the instance. Since the value is kept in the instance's __dict__ under the property's name, later lookups find it there without calling back into the descriptor.
+    """
+
     def __init__(self, method):
         """
-        Gets a JSON representation of the object
-        Returns:
-            str: a JSON representation of the object
+        Args:
+            method (function): the method which computes the value
         """
         self.method = method
-        self.values = weakref.WeakKeyDictionary()
-
-    def __set__(self, obj, value):
-        raise AttributeError("can't set attribute")
-
-    def __delete__(self, obj):
-        raise AttributeError("can't delete attribute")
+        self.name = method.__name__
+        self.__doc__ = method.__doc__
+        self.__name__ = method.__name__
+        self.__module__ = method.__module__
 
     def __get__(self, obj, t=None):
-        try:
-            return self.values[obj]
-        except KeyError:
-            self.values[obj] = self.method(obj)
-            return self.values[obj]
+        if obj is None:
+            return self
+        value = self.method(obj)
+        obj.__dict__[self.name] = value
+        return value
 
 
 def lazyproperty(method):
@@ -67,14 +86,25 @@ def lazyproperty(method):
     Args:
         method (function): the method to turn into a lazy property
     """
-    prop = LazyProperty(method)
+    return LazyProperty(method)
+
+
+def lazy_names(class_):
+    """
+    Gets the names of a class's lazy properties
 
-    @property
-    @functools.wraps(method)
-    def lazy(self):
-        return prop.__get__(self)
+    Args:
+        class_ (type): the class to check
 
-    return lazy
+    Returns:
+        tuple<str>: the names of the lazy properties on the class and its bases
+    """
+    try:
+        return class_.__dict__["_lazy_names"]
+    except KeyError:
+        names = tuple(sorted(set(name for base in class_.__mro__ for name, value in vars(base).items() if isinstance(value, LazyProperty))))
+        setattr(class_, "_lazy_names", names)
+        return names
 
 
 class immutablemethod(object):
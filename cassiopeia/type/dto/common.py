@@ -9,10 +9,26 @@ except ImportError:
     sqlalchemy_imported = False
 
 
+def _fields(obj):
+    # Gets an object's attributes, whether they're kept in __slots__ or in __dict__
+    fields = {}
+    for class_ in type(obj).__mro__:
+        for name in getattr(class_, "__slots__", ()):
+            try:
+                fields[name] = getattr(obj, name)
+            except AttributeError:
+                pass
+    fields.update(getattr(obj, "__dict__", {}))
+    return fields
+
+
 class CassiopeiaDto(object):
     """
     A Python representation of an object returned by the RiotAPI
+
+    Dtos which are created in large numbers (e.g. the parts of a match) list their fields in __slots__ so they don't each need a __dict__. Their __slots__ have to include every field their __init__ sets.
     """
+    __slots__ = ()
 
     def __init__(self, dictionary):
         """
@@ -26,8 +42,8 @@ class CassiopeiaDto(object):
         Args:
             dictionary (dict): the JSON data returned from the Riot API as a dict
         """
-        dictionary = {k: v for k, v in self.__dict__.items() if not k.startswith("_")}
-        default = kwargs.pop("default", lambda o: {k: v for k, v in o.__dict__.items() if not k.startswith("_")})
+        dictionary = {k: v for k, v in _fields(self).items() if not k.startswith("_")}
+        default = kwargs.pop("default", lambda o: {k: v for k, v in _fields(o).items() if not k.startswith("_")})
         sort_keys = kwargs.pop("sort_keys", True)
         indent = kwargs.pop("indent", 4)
         return json.dumps(dictionary, default=default, sort_keys=sort_keys, indent=indent, **kwargs)
@@ -36,13 +52,13 @@ class CassiopeiaDto(object):
         return self.to_json()
 
     def __repr__(self):
-        return "{class_}({dict_})".format(class_=self.__class__.__name__, dict_=self.__dict__)
+        return "{class_}({dict_})".format(class_=self.__class__.__name__, dict_=_fields(self))
 
     def __eq__(self, other):
-        return self.__dict__ == other.__dict__ if other else False
+        return _fields(self) == _fields(other) if other else False
 
     def __ne__(self, other):
-        return self.__dict__ != other.__dict__ if other else True
+        return _fields(self) != _fields(other) if other else True
 
     def __hash__(self):
         return hash(id(self))
@@ -63,8 +79,8 @@ class CassiopeiaParametersDto(CassiopeiaDto):
         Returns:
             str: a JSON representation of the object
         """
-        dictionary = {k: v for k, v in self.__dict__.items() if not k.startswith("_") and v}
-        default = kwargs.pop("default", lambda o: {k: v for k, v in o.__dict__.items() if not k.startswith("_") and v})
+        dictionary = {k: v for k, v in _fields(self).items() if not k.startswith("_") and v}
+        default = kwargs.pop("default", lambda o: {k: v for k, v in _fields(o).items() if not k.startswith("_") and v})
         sort_keys = kwargs.pop("sort_keys", True)
         indent = kwargs.pop("indent", 4)
         return json.dumps(dictionary, default=default, sort_keys=sort_keys, indent=indent, **kwargs)
@@ -28,6 +28,8 @@ class MatchDetail(cassiopeia.type.dto.common.CassiopeiaDto):
         teams (list<Team>): team information
         timeline (Timeline): match timeline data (not included by default)
     """
+    __slots__ = ("matchId", "participantIdentities", "participants", "timeline")
+
     def __init__(self, dictionary):
 ##        self.mapId = dictionary.get("mapId", 0)
 ##        self.matchCreation = dictionary.get("matchCreation", 0)
@@ -64,6 +66,8 @@ class Participant(cassiopeia.type.dto.common.CassiopeiaDto):
     """
     Gets all item IDs contained in this object
     """
+    __slots__ = ("participantId", "stats", "teamId", "timeline")
+
     def __init__(self, dictionary):
 ##        self.championId = dictionary.get("championId", 0)
 ##        self.highestAchievedSeasonTier = dictionary.get("highestAchievedSeasonTier", "")
@@ -84,6 +88,8 @@ class ParticipantIdentity(cassiopeia.type.dto.common.CassiopeiaDto):
     """
     Gets all champion IDs contained in this object
     """
+    __slots__ = ("participantId", "player")
+
     def __init__(self, dictionary):
         self.participantId = dictionary.get("participantId", 0)
         val = dictionary.get("player", None)
@@ -95,6 +101,8 @@ class ParticipantStats(cassiopeia.type.dto.common.CassiopeiaDto):
     """
     Gets all summoner spell IDs contained in this object
     """
+    __slots__ = ("champLevel", "winner")
+
     def __init__(self, dictionary):
         self.champLevel = dictionary.get("champLevel", 0)
         self.winner = dictionary.get("winner", False)
@@ -115,6 +123,8 @@ class ParticipantTimeline(cassiopeia.type.dto.common.CassiopeiaDto):
         teamId (int): team ID
         timeline (ParticipantTimeline): timeline data. Delta fields refer to values for the specified period (e.g., the gold per minute over the first 10 minutes of the game versus the second 20 minutes of the game. Diffs fields refer to the deltas versus the calculated lane opponent(s).
     """
+    __slots__ = ("lane", "role")
+
     def __init__(self, dictionary):
         self.lane = dictionary.get("lane", "")
         self.role = dictionary.get("role", "")
@@ -142,6 +152,8 @@ class Player(cassiopeia.type.dto.common.CassiopeiaDto):
         vilemawKills (int): number of times the team killed vilemaw
         winner (bool): flag indicating whether or not the team won
     """
+    __slots__ = ("summonerId",)
+
     def __init__(self, dictionary):
         #self.matchHistoryUri = dictionary.get("matchHistoryUri", "")
         #self.profileIcon = dictionary.get("profileIcon", 0)
@@ -194,7 +206,7 @@ def _sa_bind_participant():
         teamId = sqlalchemy.Column(sqlalchemy.Integer)
         timeline = sqlalchemy.orm.relationship("cassiopeia.type.dto.match.ParticipantTimeline", uselist=False, cascade="all, delete-orphan", passive_deletes=True)
         _id = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True)
-        _match_id = sqlalchemy.Column(sqlalchemy.BigInteger, sqlalchemy.ForeignKey("MatchDetail.matchId", ondelete="CASCADE"))
+        _match_id = sqlalchemy.Column(sqlalchemy.BigInteger, sqlalchemy.ForeignKey("MatchDetail.matchId", ondelete="CASCADE"), index=True)
 
 
 def _sa_bind_participant_identity():
@@ -206,7 +218,7 @@ def _sa_bind_participant_identity():
         participantId = sqlalchemy.Column(sqlalchemy.Integer)
         player = sqlalchemy.orm.relationship("cassiopeia.type.dto.match.Player", uselist=False, cascade="all, delete-orphan", passive_deletes=True)
         _id = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True)
-        _match_id = sqlalchemy.Column(sqlalchemy.BigInteger, sqlalchemy.ForeignKey("MatchDetail.matchId", ondelete="CASCADE"))
+        _match_id = sqlalchemy.Column(sqlalchemy.BigInteger, sqlalchemy.ForeignKey("MatchDetail.matchId", ondelete="CASCADE"), index=True)
 
 
 def _sa_bind_participant_stats():
@@ -218,7 +230,7 @@ def _sa_bind_participant_stats():
         champLevel = sqlalchemy.Column(sqlalchemy.Integer)
         winner = sqlalchemy.Column(sqlalchemy.Boolean)
         _id = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True)
-        _participant_id = sqlalchemy.Column(sqlalchemy.Integer, sqlalchemy.ForeignKey("MatchParticipant._id", ondelete="CASCADE"))
+        _participant_id = sqlalchemy.Column(sqlalchemy.Integer, sqlalchemy.ForeignKey("MatchParticipant._id", ondelete="CASCADE"), index=True)
 
 
 def _sa_bind_participant_timeline():
@@ -230,7 +242,7 @@ def _sa_bind_participant_timeline():
         lane = sqlalchemy.Column(sqlalchemy.String(30))
         role = sqlalchemy.Column(sqlalchemy.String(30))
         _id = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True)
-        _participant_id = sqlalchemy.Column(sqlalchemy.Integer, sqlalchemy.ForeignKey("MatchParticipant._id", ondelete="CASCADE"))
+        _participant_id = sqlalchemy.Column(sqlalchemy.Integer, sqlalchemy.ForeignKey("MatchParticipant._id", ondelete="CASCADE"), index=True)
 
 
 def _sa_bind_player():
@@ -239,12 +251,14 @@ def _sa_bind_player():
     @cassiopeia.type.core.common.inheritdocs
     class Player(Player, cassiopeia.type.dto.common.BaseDB):
         __tablename__ = "MatchPlayer"
+        # Covers finding the matches a summoner played in without reading the table
+        __table_args__ = (sqlalchemy.Index("ix_MatchPlayer_summonerId", "summonerId", "_participant_id"),)
         #matchHistoryUri = sqlalchemy.Column(sqlalchemy.String(50))
         #profileIcon = sqlalchemy.Column(sqlalchemy.Integer)
         summonerId = sqlalchemy.Column(sqlalchemy.Integer)
         #summonerName = sqlalchemy.Column(sqlalchemy.String(30))
         _id = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True)
-        _participant_id = sqlalchemy.Column(sqlalchemy.Integer, sqlalchemy.ForeignKey("MatchParticipantIdentity._id", ondelete="CASCADE"))
+        _participant_id = sqlalchemy.Column(sqlalchemy.Integer, sqlalchemy.ForeignKey("MatchParticipantIdentity._id", ondelete="CASCADE"), index=True)
 
 
 
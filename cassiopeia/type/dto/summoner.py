@@ -12,6 +12,8 @@ class Summoner(cassiopeia.type.dto.common.CassiopeiaDto):
     """
     Gets all mastery IDs contained in this object
     """
+    __slots__ = ("id", "name")
+
     def __init__(self, dictionary):
         self.id = dictionary.get("id", 0)
         self.name = dictionary.get("name", "")
@@ -24,7 +24,6 @@ collection.
 
 import os
 from datetime import datetime
-from collections import deque
 
 from cassiopeia import riotapi
 from cassiopeia.type.api.exception import APIError
@@ -32,25 +31,14 @@ from cassiopeia.type.core.common import LoadPolicy
 from cassiopeia.type.api.store import SQLAlchemyDB
 
 
-def auto_retry(api_call_method):
-    """ A decorator to automatically retry 500s (Service Unavailable) and skip 400s (Bad Request) or 404s (Not Found). """
+def skip_missing(api_call_method):
+    """ A decorator to skip 400s (Bad Request) or 404s (Not Found). Cassiopeia already retries 429s, 500s, and 503s itself (see riotapi.set_retry_policy). """
     def call_wrapper(*args, **kwargs):
         try:
             return api_call_method(*args, **kwargs)
         except APIError as error:
-            # Try Again Once
-            if error.error_code in [500]:
-                try:
-                    print("Got a 500, trying again...")
-                    return api_call_method(*args, **kwargs)
-                except APIError as another_error:
-                    if another_error.error_code in [500, 400, 404]:
-                        pass
-                    else:
-                        raise another_error
-
             # Skip
-            elif error.error_code in [400, 404]:
+            if error.error_code in [400, 404]:
                 print("Got a 400 or 404")
                 pass
 
@@ -60,11 +48,11 @@ def auto_retry(api_call_method):
     return call_wrapper
 
 
-# Set get_match and get_summoner_by* to automatically retry if we get a 500, or skip if we get a 400 or 403
+# Set get_match and get_summoner_by* to skip matches and summoners we get a 400 or 404 for
 # The above decorator wraps these functions, applying the functionality in the decorator to the wrapped functions.
-riotapi.get_match = auto_retry(riotapi.get_match)
-riotapi.get_summoner_by_id = auto_retry(riotapi.get_summoner_by_id)
-riotapi.get_summoner_by_name = auto_retry(riotapi.get_summoner_by_name)
+riotapi.get_match = skip_missing(riotapi.get_match)
+riotapi.get_summoner_by_id = skip_missing(riotapi.get_summoner_by_id)
+riotapi.get_summoner_by_name = skip_missing(riotapi.get_summoner_by_name)
 
 
 def main():
@@ -74,35 +62,27 @@ def main():
     key = os.environ["DEV_KEY"]  # You can create an env var called "DEV_KEY" that holds your developer key. It will be loaded here.
     riotapi.set_api_key(key)
     riotapi.set_load_policy(LoadPolicy.lazy)
+    riotapi.set_retry_policy(10)  # Keep retrying temporary errors (429s, 500s, and 503s) for longer than usual
 
     # Load and connect to your database. (Comment this code to use local memory. Don't forget to comment db.close() below too.)
     db = SQLAlchemyDB("mysql+mysqlconnector", "databse_hostname", "database_name", "username", "password")
     riotapi.set_data_store(db)
 
     # We will seed with all the summoners in Master's tier
-    unpulled_summoners = deque(entry.summoner for entry in riotapi.get_master())
-    print("Pulled Master tier for seeding. Got {0} summoners.".format(len(unpulled_summoners)))
-
-    # We need this so that we don't get a recursive loop of summoners
-    pulled_summoners = deque()
+    seeds = [entry.summoner for entry in riotapi.get_master()]
+    seeds = [summoner for summoner in seeds if summoner is not None]
+    print("Pulled Master tier for seeding. Got {0} summoners.".format(len(seeds)))
 
     gather_start = datetime(2015, 7, 23)  # 1 day after patch 5.14
 
-    while len(unpulled_summoners) > 0:
-        summoner = unpulled_summoners.popleft()
-        for match_reference in summoner.match_list(begin_time=gather_start):
-            # If you are connected to a database, the match will automatically be stored in it without you having to do anything.
-            # Simply pull the match, and it's in your database for whenever you need it again!
-            # If you pull a match twice, the second time it will be loaded from the database rather than pulled from Riot
-            # and therefore will not count against your rate limit. This is true of all datatypes, include Summoner.
-            match = riotapi.get_match(match_reference)
-            if match is None:  # If the match still fails to load, continue on to the next one
-                continue
-            print("Stored {0} in my database".format(match))
-            for participant in match.participants:
-                if participant.summoner not in unpulled_summoners and participant.summoner not in pulled_summoners:
-                    unpulled_summoners.append(participant.summoner)
-        pulled_summoners.append(summoner)
+    # The crawler keeps track of which summoners and matches it has already seen, so nothing is pulled twice.
+    # Its progress is saved to crawl.json, so if you stop this program and run it again it carries on where it left off.
+    crawler = riotapi.MatchCrawler(seeds, checkpoint="crawl.json", max_in_flight=10, begin_time=gather_start)
+    for match in crawler:
+        # Every match the crawler pulls is stored in your database (or in local memory if you aren't using one).
+        # Matches that are already in the data store are loaded from there rather than pulled from Riot,
+        # and therefore do not count against your rate limit.
+        print("Stored {0} in my database".format(match))
 
     db.close()
 
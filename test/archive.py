@@ -0,0 +1,74 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+import cassiopeia.type.dto.match
+from cassiopeia.type.api.archive import MatchArchive
+from cassiopeia.type.core.match import Match
+
+
+class Thing(object):
+    def __init__(self, id_):
+        self.id = id_
+
+
+def match(id_):
+    return Match(cassiopeia.type.dto.match.MatchDetail({
+        "matchId": id_,
+        "participants": [{"participantId": p, "teamId": 100, "stats": {"champLevel": p}} for p in range(1, 11)],
+        "participantIdentities": [{"participantId": p, "player": {"summonerId": id_ * 10 + p}} for p in range(1, 11)]
+    }))
+
+
+class MatchArchiveTests(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_store_and_get(self):
+        archive = MatchArchive(self.directory, segment_size=4096)
+        archive.store([match(i) for i in range(100)], list(range(100)))
+        archive.store(match(5), 5)
+        assert len(archive) == 100
+        assert len(os.listdir(self.directory)) > 2
+
+        stored = archive.get(Match, [3, 100, 99], "matchId")
+        assert stored[1] is None
+        assert [m.id for m in (stored[0], stored[2])] == [3, 99]
+        assert [p.stats.champLevel for p in stored[0].data.participants] == list(range(1, 11))
+        assert stored[0].data.participantIdentities[9].player.summonerId == 40
+        assert sorted(m.id for m in archive.iterate(Match)) == list(range(100))
+
+        # Other types go to the other store
+        archive.store(Thing(1), 1, [Thing])
+        assert archive.get(Thing, 1, "id").id == 1
+        assert archive.has_all(Thing)
+        archive.close()
+
+        archive = MatchArchive(self.directory)
+        assert len(archive) == 100
+        assert archive.get(Match, 42, "matchId").data.participantIdentities[0].player.summonerId == 421
+        archive.store(match(100), 100)
+        assert archive.get(Match, 100, "matchId").id == 100
+        archive.close()
+
+    def test_partial_writes_are_dropped(self):
+        archive = MatchArchive(self.directory, compression="lzma")
+        archive.store([match(1), match(2)], [1, 2])
+        archive.close()
+
+        # As if the program died partway through storing the next match
+        with open(os.path.join(self.directory, "segment-00000"), "ab") as segment_file:
+            segment_file.write(b"garbage")
+        with open(os.path.join(self.directory, "index"), "ab") as index_file:
+            index_file.write(b"\x03\x00")
+
+        archive = MatchArchive(self.directory)
+        assert len(archive) == 2
+        archive.store(match(3), 3)
+        assert [m.id for m in archive.get(Match, [1, 2, 3], "matchId")] == [1, 2, 3]
+        archive.close()
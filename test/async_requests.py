@@ -0,0 +1,213 @@
+import asyncio
+import json
+import shutil
+import tempfile
+import threading
+import time
+import urllib.parse
+from unittest import TestCase
+
+import cassiopeia.dto.requests
+import cassiopeia.dto.asyncrequests
+import cassiopeia.core.matchapi
+import cassiopeia.core.requests
+import cassiopeia.type.api.store
+import cassiopeia.type.api.responsecache
+from cassiopeia import asyncriotapi
+from cassiopeia.type.api.asyncconnection import AsyncConnectionPool
+from cassiopeia.type.api.asyncrates import AsyncMultiRateLimiter
+
+from .stubs import KeepAliveHandler, ThreadedServer
+
+
+def run(coroutine):
+    # asyncio.run needs Python 3.7
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+
+
+class StubPool(object):
+    """Answers summoner and match requests locally instead of going to the Riot API"""
+
+    def __init__(self, delay=0):
+        self.urls = []
+        self.delay = delay
+
+    async def request(self, url, method="GET", body=None, headers={}):
+        self.urls.append(url)
+        await asyncio.sleep(self.delay)
+        path = urllib.parse.urlsplit(url).path.split("/")
+        if path[-2] == "match":
+            content = json.dumps({"matchId": int(path[-1]), "participantIdentities": [{"participantId": 1, "player": {"summonerId": 7}}]})
+        else:
+            content = json.dumps({id_: {"id": int(id_), "name": "summoner{id}".format(id=id_)} for id_ in path[-1].split(",")})
+        return content.encode("UTF-8"), {}
+
+
+class ThreadRecordingCache(cassiopeia.type.api.store.Cache):
+    """Remembers which threads it was used from"""
+
+    def __init__(self):
+        super().__init__()
+        self.threads = set()
+
+    def get(self, *args, **kwargs):
+        self.threads.add(threading.current_thread())
+        return super().get(*args, **kwargs)
+
+    def store(self, *args, **kwargs):
+        self.threads.add(threading.current_thread())
+        return super().store(*args, **kwargs)
+
+
+class AsyncRequestTests(TestCase):
+
+    def setUp(self):
+        self.server = ThreadedServer(("127.0.0.1", 0), KeepAliveHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base = "http://127.0.0.1:{port}".format(port=self.server.server_address[1])
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_pool_reuses_connections_under_concurrency(self):
+        pool = AsyncConnectionPool(max_connections_per_host=5)
+
+        async def fetch_all():
+            return await asyncio.gather(*[pool.request("{base}/match/{i}".format(base=self.base, i=i)) for i in range(50)])
+
+        results = run(fetch_all())
+        assert [json.loads(content.decode("UTF-8"))["path"] for content, _ in results] == ["/match/{i}".format(i=i) for i in range(50)]
+        assert pool.stats["created"] <= 5
+        assert pool.stats["requests"] == 50
+
+    def test_pool_reads_chunked_responses(self):
+        pool = AsyncConnectionPool()
+        content, _ = run(pool.request("{base}/chunked/response".format(base=self.base)))
+        assert json.loads(content.decode("UTF-8")) == {"path": "/chunked/response"}
+
+    def test_connections_are_closed_when_requests_fail(self):
+        pool = AsyncConnectionPool()
+        connections = []
+        connect = pool._connect
+
+        async def record(key):
+            connection = await connect(key)
+            connections.append(connection)
+            return connection
+
+        async def fail(*args):
+            raise ValueError("bad response")
+
+        async def hang(*args):
+            await asyncio.sleep(10)
+
+        async def cancel():
+            request = asyncio.ensure_future(pool.request("{base}/match/1".format(base=self.base)))
+            await asyncio.sleep(0.05)
+            request.cancel()
+            try:
+                await request
+            except asyncio.CancelledError:
+                pass
+
+        # Neither an unexpected error nor cancellation leaves a connection open or puts it back in the pool
+        pool._connect = record
+        pool._send = fail
+        self.assertRaises(ValueError, run, pool.request("{base}/match/1".format(base=self.base)))
+        pool._send = hang
+        run(cancel())
+        assert len(connections) == 2
+        assert all(writer.transport.is_closing() for _, writer in connections)
+        assert pool.stats["idle"] == 0
+
+    def test_rate_limiter_spaces_calls(self):
+        limiter = AsyncMultiRateLimiter((3, 0.2))
+
+        async def call_all():
+            async def nothing():
+                return 1
+            return await asyncio.gather(*[limiter.call(nothing) for _ in range(7)])
+
+        start = time.monotonic()
+        assert run(call_all()) == [1] * 7
+        assert time.monotonic() - start >= 0.4
+        assert limiter.calls == (7, 7)
+
+    def test_get_summoners_by_id(self):
+        old = (cassiopeia.dto.requests.api_key, cassiopeia.dto.requests.region, cassiopeia.dto.asyncrequests.connection_pool, cassiopeia.core.requests.data_store)
+        stub = StubPool()
+        cassiopeia.dto.requests.api_key = "key"
+        cassiopeia.dto.requests.region = "na"
+        cassiopeia.dto.asyncrequests.connection_pool = stub
+        cassiopeia.core.requests.data_store = cassiopeia.type.api.store.Cache()
+        try:
+            summoners = run(asyncriotapi.get_summoners_by_id(list(range(1, 46))))
+            assert [summoner.id for summoner in summoners] == list(range(1, 46))
+            assert len(stub.urls) == 2
+
+            # Served from the data store the second time
+            assert run(asyncriotapi.get_summoner_by_id(7)).name == "summoner7"
+            assert len(stub.urls) == 2
+        finally:
+            cassiopeia.dto.requests.api_key, cassiopeia.dto.requests.region, cassiopeia.dto.asyncrequests.connection_pool, cassiopeia.core.requests.data_store = old
+
+    def test_requests_are_cached_and_coalesced(self):
+        old = (cassiopeia.dto.requests.api_key, cassiopeia.dto.requests.region, cassiopeia.dto.asyncrequests.connection_pool, cassiopeia.dto.requests.response_cache)
+        directory = tempfile.mkdtemp()
+
+        # The responses are slow enough that the second request is sent while the first is still in flight
+        stub = StubPool(delay=0.2)
+        cassiopeia.dto.requests.api_key = "key"
+        cassiopeia.dto.requests.region = "na"
+        cassiopeia.dto.asyncrequests.connection_pool = stub
+        cassiopeia.dto.requests.response_cache = cassiopeia.type.api.responsecache.ResponseCache(directory, {"summoner": None})
+        try:
+            async def get_twice():
+                return await asyncio.gather(*[cassiopeia.dto.asyncrequests.get("v1.4/summoner/3") for _ in range(2)])
+
+            # Identical requests in flight at the same time share one call, and each caller gets its own result
+            first, second = run(get_twice())
+            assert first == second == {"3": {"id": 3, "name": "summoner3"}}
+            assert first is not second
+            assert len(stub.urls) == 1
+
+            # The response cache is shared with blocking requests
+            assert run(cassiopeia.dto.asyncrequests.get("v1.4/summoner/3")) == first
+            assert len(stub.urls) == 1
+            assert cassiopeia.dto.requests.response_cache.stats["hits"] == 1
+        finally:
+            cassiopeia.dto.requests.api_key, cassiopeia.dto.requests.region, cassiopeia.dto.asyncrequests.connection_pool, cassiopeia.dto.requests.response_cache = old
+            shutil.rmtree(directory)
+
+    def test_get_match_shares_post_processing_and_keeps_store_off_loop(self):
+        old = (cassiopeia.dto.requests.api_key, cassiopeia.dto.requests.region, cassiopeia.dto.asyncrequests.connection_pool, cassiopeia.core.requests.data_store, cassiopeia.core.matchapi.load_required_data)
+        stub = StubPool()
+        store = ThreadRecordingCache()
+        loaded = []
+        cassiopeia.dto.requests.api_key = "key"
+        cassiopeia.dto.requests.region = "na"
+        cassiopeia.dto.asyncrequests.connection_pool = stub
+        cassiopeia.core.requests.data_store = store
+        cassiopeia.core.matchapi.load_required_data = lambda matches: loaded.extend((match.matchId, threading.current_thread()) for match in matches)
+        try:
+            async def get_match():
+                return threading.current_thread(), await asyncriotapi.get_match(5)
+
+            loop_thread, match = run(get_match())
+            assert match.id == 5
+            assert [id_ for id_, _ in loaded] == [5]
+            assert loop_thread not in [thread for _, thread in loaded]
+
+            # The data store is only used from other threads
+            assert store.threads and loop_thread not in store.threads
+            assert run(asyncriotapi.get_match(5)) is match
+            assert len(stub.urls) == 1
+        finally:
+            cassiopeia.dto.requests.api_key, cassiopeia.dto.requests.region, cassiopeia.dto.asyncrequests.connection_pool, cassiopeia.core.requests.data_store, cassiopeia.core.matchapi.load_required_data = old
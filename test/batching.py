@@ -0,0 +1,55 @@
+import threading
+import urllib.parse
+from unittest import TestCase
+
+import cassiopeia.dto.requests
+import cassiopeia.core.requests
+import cassiopeia.type.api.store
+from cassiopeia import riotapi
+
+from .stubs import SummonerPool
+
+
+class BatchingTests(TestCase):
+
+    def setUp(self):
+        self.old = (cassiopeia.dto.requests.api_key, cassiopeia.dto.requests.region, cassiopeia.dto.requests.connection_pool, cassiopeia.dto.requests.rate_limiter, cassiopeia.core.requests.data_store, cassiopeia.core.requests.batch_window)
+        cassiopeia.dto.requests.api_key = "key"
+        cassiopeia.dto.requests.region = "na"
+        cassiopeia.dto.requests.connection_pool = SummonerPool([13])
+        cassiopeia.dto.requests.rate_limiter = None
+        cassiopeia.core.requests.data_store = cassiopeia.type.api.store.Cache()
+        riotapi.set_batch_window(0.2)
+
+    def tearDown(self):
+        cassiopeia.dto.requests.api_key, cassiopeia.dto.requests.region, cassiopeia.dto.requests.connection_pool, cassiopeia.dto.requests.rate_limiter, cassiopeia.core.requests.data_store, cassiopeia.core.requests.batch_window = self.old
+
+    def get_concurrently(self, ids):
+        results = {}
+
+        def worker(id_):
+            results[id_] = riotapi.get_summoner_by_id(id_)
+
+        threads = [threading.Thread(target=worker, args=(id_,)) for id_ in ids]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_single_lookups_are_batched(self):
+        summoners = self.get_concurrently(range(1, 11))
+        assert len(cassiopeia.dto.requests.connection_pool.urls) == 1
+        assert all(summoners[id_].name == "na{id}".format(id=id_) for id_ in range(1, 11))
+
+    def test_full_batches_are_sent_right_away(self):
+        summoners = self.get_concurrently(range(1, 46))
+        assert len(cassiopeia.dto.requests.connection_pool.urls) == 2
+        assert max(len(urllib.parse.urlsplit(url).path.split("/")[-1].split(",")) for url in cassiopeia.dto.requests.connection_pool.urls) == 40
+        assert summoners[13] is None
+        assert summoners[45].id == 45
+
+    def test_batching_off(self):
+        riotapi.set_batch_window(0)
+        self.get_concurrently(range(1, 4))
+        assert len(cassiopeia.dto.requests.connection_pool.urls) == 3
@@ -0,0 +1,118 @@
+import email.message
+import json
+import threading
+import time
+import urllib.error
+import urllib.parse
+from unittest import TestCase
+
+import cassiopeia.dto.requests
+import cassiopeia.core.requests
+import cassiopeia.type.core.common
+from cassiopeia import riotapi
+from cassiopeia.type.api.exception import APIError
+from cassiopeia.type.api.retry import RetryPolicy
+from cassiopeia.type.core.summoner import Summoner
+from cassiopeia.type.api.client import Client
+from cassiopeia.core.requests import fan_out
+
+from .stubs import SummonerPool
+
+
+class FlakyPool(SummonerPool):
+    """Fails each request once with a 500 before answering it"""
+
+    def request(self, url, method="GET", body=None, headers={}):
+        if url not in self.urls:
+            self.urls.append(url)
+            raise urllib.error.HTTPError(url, 500, "Error", email.message.Message(), None)
+        return super().request(url, method, body, headers)
+
+
+class MatchPool(object):
+    """Answers match requests slowly, keeping track of the most requests made at once"""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def request(self, url, method="GET", body=None, headers={}):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.05)
+        with self._lock:
+            self.in_flight -= 1
+        return json.dumps({"matchId": int(urllib.parse.urlsplit(url).path.split("/")[-1])}).encode("UTF-8"), {}
+
+
+class ClientTests(TestCase):
+
+    def setUp(self):
+        self.old = (cassiopeia.dto.requests.api_key, cassiopeia.dto.requests.region, cassiopeia.dto.requests.connection_pool)
+        cassiopeia.dto.requests.api_key = "default-key"
+        cassiopeia.dto.requests.region = "na"
+        cassiopeia.dto.requests.connection_pool = SummonerPool()
+
+    def tearDown(self):
+        cassiopeia.dto.requests.api_key, cassiopeia.dto.requests.region, cassiopeia.dto.requests.connection_pool = self.old
+
+    def test_client_settings_apply_while_active(self):
+        client = Client("EUW", "euw-key")
+        client.connection_pool = SummonerPool()
+
+        with client:
+            assert cassiopeia.dto.requests.get_client() is client
+            assert riotapi.get_summoner_by_id(1).name == "euw1"
+        assert cassiopeia.dto.requests.get_client() is None
+
+        url = client.connection_pool.urls[0]
+        assert url.startswith("https://euw.api.pvp.net/api/lol/euw/")
+        assert "api_key=euw-key" in url
+        assert client.calls == (1, 1)
+        assert cassiopeia.dto.requests.connection_pool.urls == []
+
+        # The client's data store is separate from the module-level one
+        assert client.data_store.get(Summoner, 1, "id").name == "euw1"
+        assert cassiopeia.core.requests.data_store.get(Summoner, 1, "id") is None
+
+    def test_fan_out_runs_each_region_in_parallel(self):
+        clients = [Client(region) for region in ("na", "euw", "kr")]
+        for client in clients:
+            client.connection_pool = SummonerPool()
+
+        # Every region has to be running at once to get past the barrier
+        barrier = threading.Barrier(3, timeout=5)
+
+        def names(ids):
+            barrier.wait()
+            return [summoner.name for summoner in riotapi.get_summoners_by_id(ids)]
+
+        assert fan_out(clients, names, [1, 2]) == [["na1", "na2"], ["euw1", "euw2"], ["kr1", "kr2"]]
+        assert all("api_key=default-key" in client.connection_pool.urls[0] for client in clients)
+
+    def test_fan_out_keeps_bulk_calls_concurrent(self):
+        old = cassiopeia.core.requests.load_policy
+        cassiopeia.core.requests.load_policy = cassiopeia.type.core.common.LoadPolicy.lazy
+        clients = [Client(region) for region in ("na", "euw")]
+        for client in clients:
+            client.connection_pool = MatchPool()
+        try:
+            results = fan_out(clients, lambda: [match.id for match in riotapi.get_matches(list(range(1, 11)))])
+        finally:
+            cassiopeia.core.requests.load_policy = old
+
+        # Each region's matches are requested at the same time, not one after another
+        assert results == [list(range(1, 11))] * 2
+        assert all(client.connection_pool.max_in_flight > 1 for client in clients)
+
+    def test_clients_have_their_own_retry_policies(self):
+        patient = Client("na", retry_policy=RetryPolicy(2, base_delay=0.01))
+        impatient = Client("euw", retry_policy=RetryPolicy(1))
+        for client in (patient, impatient):
+            client.connection_pool = FlakyPool()
+
+        assert patient.call(riotapi.get_summoner_by_id, 1).name == "na1"
+        self.assertRaises(APIError, impatient.call, riotapi.get_summoner_by_id, 1)
+        assert Client("kr").retry_policy is cassiopeia.dto.requests.retry_policy
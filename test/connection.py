@@ -0,0 +1,134 @@
+import socket
+import threading
+import time
+import urllib.error
+import zlib
+from unittest import TestCase
+
+import cassiopeia.dto.requests
+from cassiopeia.type.api.connection import ConnectionPool
+
+from .stubs import KeepAliveHandler, ThreadedServer
+
+
+class ConnectionPoolTests(TestCase):
+
+    def setUp(self):
+        self.server = ThreadedServer(("127.0.0.1", 0), KeepAliveHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base = "http://127.0.0.1:{port}".format(port=self.server.server_address[1])
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_connections_are_reused(self):
+        pool = ConnectionPool()
+        for i in range(5):
+            content, headers = pool.request("{base}/match/{i}?api_key=x".format(base=self.base, i=i))
+            assert content == '{{"path": "/match/{i}?api_key=x"}}'.format(i=i).encode("UTF-8")
+            assert headers["X-Test"] == "yes"
+        stats = pool.stats
+        assert stats["created"] == 1
+        assert stats["reused"] == 4
+        assert stats["requests"] == 5
+        pool.close()
+
+    def test_sockets_per_host_are_limited(self):
+        pool = ConnectionPool(max_connections_per_host=2)
+        threads = [threading.Thread(target=pool.request, args=("{base}/slow".format(base=self.base),)) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert pool.stats["created"] <= 2
+        assert pool.stats["requests"] == 6
+        pool.close()
+
+    def test_idle_connections_are_evicted(self):
+        pool = ConnectionPool(idle_timeout=0.05)
+        pool.request("{base}/first".format(base=self.base))
+        time.sleep(0.1)
+        pool.evict_idle()
+        assert pool.stats["evicted"] == 1
+        assert pool.stats["idle"] == 0
+        pool.request("{base}/second".format(base=self.base))
+        assert pool.stats["created"] == 2
+        pool.close()
+
+    def test_close_closes_connections_in_use_when_returned(self):
+        pool = ConnectionPool(max_connections_per_host=1)
+        KeepAliveHandler.most_running = 0
+        first = threading.Thread(target=pool.request, args=("{base}/slow/1".format(base=self.base),))
+        first.start()
+        time.sleep(0.02)
+        pool.close()
+        second = threading.Thread(target=pool.request, args=("{base}/slow/2".format(base=self.base),))
+        second.start()
+        first.join()
+        second.join()
+        # The first connection was closed when it came back, and the second request still waited for it
+        assert KeepAliveHandler.most_running == 1
+        assert pool.stats["created"] == 2
+        assert pool.stats["idle"] == 1
+        pool.close()
+
+    def test_error_status_raises_http_error(self):
+        pool = ConnectionPool()
+        try:
+            pool.request("{base}/missing".format(base=self.base))
+            assert False
+        except urllib.error.HTTPError as e:
+            assert e.code == 404
+            assert e.headers["X-Test"] == "yes"
+        # The connection is still usable after an error response
+        pool.request("{base}/found".format(base=self.base))
+        assert pool.stats["reused"] == 1
+        pool.close()
+
+    def test_transport_errors_raise_url_error(self):
+        listener = socket.socket()
+        listener.bind(("127.0.0.1", 0))
+        port = listener.getsockname()[1]
+        listener.close()
+        pool = ConnectionPool()
+        try:
+            pool.request("http://127.0.0.1:{port}/summoner".format(port=port))
+            assert False
+        except urllib.error.HTTPError:
+            assert False
+        except urllib.error.URLError as e:
+            assert isinstance(e.reason, socket.error)
+        pool.close()
+
+    def test_connections_are_closed_when_reading_fails(self):
+        pool = ConnectionPool()
+        connections = []
+
+        def send(connection, method, path, body, headers):
+            connections.append(connection)
+            connection.request(method, path, body, headers)
+            connection.getresponse()
+            raise zlib.error("bad gzip")
+
+        pool._send = send
+        try:
+            pool.request("{base}/summoner".format(base=self.base))
+            assert False
+        except zlib.error:
+            pass
+        assert connections[0].sock is None
+        assert pool.stats["idle"] == 0
+        pool.close()
+
+    def test_execute_request_uses_pool(self):
+        pool = ConnectionPool()
+        old_pool = cassiopeia.dto.requests.connection_pool
+        cassiopeia.dto.requests.connection_pool = pool
+        try:
+            for _ in range(3):
+                assert cassiopeia.dto.requests.execute_request("{base}/summoner".format(base=self.base), "GET") == '{"path": "/summoner"}'
+        finally:
+            cassiopeia.dto.requests.connection_pool = old_pool
+        assert pool.stats["reused"] == 2
+        pool.close()
@@ -0,0 +1,46 @@
+from unittest import TestCase
+
+import cassiopeia.type.core.match
+import cassiopeia.type.dto.match
+
+
+def _match(champion_level):
+    return cassiopeia.type.dto.match.MatchDetail({
+        "matchId": 1,
+        "participants": [{"participantId": p, "teamId": 100, "stats": {"champLevel": champion_level}} for p in (2, 1)],
+        "participantIdentities": [{"participantId": p, "player": {"summonerId": p}} for p in (2, 1)]
+    })
+
+
+class LazyPropertyTests(TestCase):
+
+    def test_values_are_kept_on_the_instance(self):
+        match = cassiopeia.type.core.match.Match(_match(18))
+        participants = match.participants
+        assert [participant.id for participant in participants] == [1, 2]
+        assert match.participants is participants
+        assert vars(match)["participants"] is participants
+        assert participants[0].stats is participants[0].stats
+        assert participants[0].stats.champion_level == 18
+
+        # Values aren't shared between instances
+        other = cassiopeia.type.core.match.Match(_match(18))
+        assert other.participants is not participants
+
+    def test_replacing_data_invalidates(self):
+        match = cassiopeia.type.core.match.Match(_match(18))
+        participants = match.participants
+        match.data = _match(6)
+        assert match.participants is not participants
+        assert match.participants[0].stats.champion_level == 6
+
+        participants = match.participants
+        match.invalidate()
+        assert match.participants is not participants
+
+    def test_read_only(self):
+        match = cassiopeia.type.core.match.Match(_match(18))
+        match.participants
+        self.assertRaises(AttributeError, setattr, match, "participants", [])
+        self.assertRaises(AttributeError, delattr, match, "participants")
+        assert isinstance(cassiopeia.type.core.match.Match.participants.__doc__, str)
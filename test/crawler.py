@@ -0,0 +1,111 @@
+import email.message
+import json
+import os
+import shutil
+import tempfile
+import threading
+import urllib.error
+import urllib.parse
+from unittest import TestCase
+
+import cassiopeia.dto.requests
+import cassiopeia.core.requests
+import cassiopeia.type.api.store
+import cassiopeia.type.core.common
+import cassiopeia.type.core.match
+from cassiopeia.riotapi import MatchCrawler
+
+
+class LadderPool(object):
+    """Answers match list and match requests for summoners 1-5, where summoner s played matches s, s + 1 and 7. Match 6 has no participants and match 7 doesn't exist."""
+
+    def __init__(self):
+        self.paths = []
+        self._lock = threading.Lock()
+
+    def request(self, url, method="GET", body=None, headers={}):
+        path = urllib.parse.urlsplit(url).path
+        with self._lock:
+            self.paths.append(path)
+        id_ = int(path.split("/")[-1])
+        if "/matchlist/" in path:
+            content = {"matches": [{"matchId": match_id} for match_id in (id_, id_ + 1, 7)]}
+        elif id_ == 6:
+            content = {"matchId": id_}
+        elif id_ > 6:
+            raise urllib.error.HTTPError(url, 404, "Not Found", email.message.Message(), None)
+        else:
+            summoners = [s for s in (id_ - 1, id_) if s > 0]
+            content = {
+                "matchId": id_,
+                "participants": [{"participantId": p + 1, "teamId": 100} for p in range(len(summoners))],
+                "participantIdentities": [{"participantId": p + 1, "player": {"summonerId": summoners[p]}} for p in range(len(summoners))]
+            }
+        return json.dumps(content).encode("UTF-8"), {}
+
+
+class MatchCrawlerTests(TestCase):
+
+    def setUp(self):
+        self.old = (cassiopeia.dto.requests.api_key, cassiopeia.dto.requests.region, cassiopeia.dto.requests.connection_pool, cassiopeia.dto.requests.rate_limiter, cassiopeia.core.requests.data_store, cassiopeia.core.requests.load_policy)
+        cassiopeia.dto.requests.api_key = "key"
+        cassiopeia.dto.requests.region = "na"
+        cassiopeia.dto.requests.connection_pool = LadderPool()
+        cassiopeia.dto.requests.rate_limiter = None
+        cassiopeia.core.requests.data_store = cassiopeia.type.api.store.Cache()
+        cassiopeia.core.requests.load_policy = cassiopeia.type.core.common.LoadPolicy.lazy
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        cassiopeia.dto.requests.api_key, cassiopeia.dto.requests.region, cassiopeia.dto.requests.connection_pool, cassiopeia.dto.requests.rate_limiter, cassiopeia.core.requests.data_store, cassiopeia.core.requests.load_policy = self.old
+        shutil.rmtree(self.directory)
+
+    def test_crawl(self):
+        crawler = MatchCrawler([1], max_in_flight=4)
+        assert sorted(match.id for match in crawler) == [1, 2, 3, 4, 5, 6]
+
+        # Every summoner and match is requested once
+        paths = cassiopeia.dto.requests.connection_pool.paths
+        assert len(paths) == len(set(paths)) == 12
+        assert crawler.seen_summoners == set([1, 2, 3, 4, 5])
+        assert cassiopeia.core.requests.data_store.get(cassiopeia.type.core.match.Match, 3, "matchId").id == 3
+
+    def test_resume(self):
+        checkpoint = os.path.join(self.directory, "crawl.json")
+        crawler = MatchCrawler([1], checkpoint=checkpoint, max_in_flight=1)
+        first = [match.id for match in crawler.crawl(max_matches=2)]
+        assert len(first) == 2
+        assert os.path.exists(checkpoint)
+
+        # A new crawler (with an empty data store) carries on without requesting anything again
+        cassiopeia.core.requests.data_store = cassiopeia.type.api.store.Cache()
+        crawler = MatchCrawler([1], checkpoint=checkpoint, max_in_flight=1)
+        rest = [match.id for match in crawler]
+        assert sorted(first + rest) == [1, 2, 3, 4, 5, 6]
+        assert crawler.crawled == 6
+
+        paths = cassiopeia.dto.requests.connection_pool.paths
+        assert len(paths) == len(set(paths)) == 12
+        assert list(MatchCrawler([2], checkpoint=checkpoint)) == []
+
+    def test_checkpoint_only_holds_what_is_left(self):
+        checkpoint = os.path.join(self.directory, "crawl.json")
+        crawler = MatchCrawler([1], checkpoint=checkpoint, max_in_flight=1, checkpoint_interval=1)
+        list(crawler)
+
+        # The IDs seen are appended to the seen file a save at a time rather than rewritten into the checkpoint
+        with open(checkpoint, "r") as checkpoint_file:
+            assert json.load(checkpoint_file) == {"frontier": [], "pending": [], "crawled": 6}
+        with open(checkpoint + ".seen", "r") as seen_file:
+            lines = [json.loads(line) for line in seen_file if line.strip()]
+        assert len(lines) > 1
+        assert sorted(id_ for line in lines for id_ in line["summoners"]) == [1, 2, 3, 4, 5]
+        assert sorted(id_ for line in lines for id_ in line["matches"]) == [1, 2, 3, 4, 5, 6, 7]
+
+        # A line cut off by a crash is skipped, and the next save starts on a new line
+        with open(checkpoint + ".seen", "a") as seen_file:
+            seen_file.write('\n{"summoners": [8')
+        crawler = MatchCrawler([9], checkpoint=checkpoint)
+        assert crawler.seen_summoners == set([1, 2, 3, 4, 5, 9])
+        crawler.save()
+        assert MatchCrawler([], checkpoint=checkpoint).seen_summoners == set([1, 2, 3, 4, 5, 9])
@@ -0,0 +1,38 @@
+import copy
+import json
+import pickle
+from unittest import TestCase
+
+import cassiopeia.type.dto.match
+import cassiopeia.type.dto.summoner
+
+_match = {
+    "matchId": 1,
+    "participants": [{"participantId": 1, "teamId": 100, "stats": {"champLevel": 18, "winner": True}, "timeline": {"lane": "TOP", "role": "SOLO"}}],
+    "participantIdentities": [{"participantId": 1, "player": {"summonerId": 11}}]
+}
+
+
+class SlottedDtoTests(TestCase):
+
+    def test_no_instance_dict(self):
+        match = cassiopeia.type.dto.match.MatchDetail(_match)
+        summoner = cassiopeia.type.dto.summoner.Summoner({"id": 1, "name": "summoner1"})
+        for dto in (match, match.participants[0], match.participants[0].stats, match.participants[0].timeline, match.participantIdentities[0], match.participantIdentities[0].player, summoner):
+            # Once a database has been set up the Dtos are mapped by SQLAlchemy, which needs a __dict__
+            if not hasattr(type(dto), "__mapper__"):
+                assert not hasattr(dto, "__dict__")
+
+    def test_json_and_equality(self):
+        match = cassiopeia.type.dto.match.MatchDetail(_match)
+        data = json.loads(match.to_json())
+        assert data["participants"][0]["stats"] == {"champLevel": 18, "winner": True}
+        assert data["participantIdentities"][0]["player"] == {"summonerId": 11}
+
+        copied = cassiopeia.type.dto.match.MatchDetail(data)
+        assert copied == match
+        copied.participants[0].stats.champLevel = 17
+        assert copied != match
+
+        assert pickle.loads(pickle.dumps(match)) == match
+        assert copy.deepcopy(match) == match
@@ -0,0 +1,94 @@
+import json
+import threading
+import time
+import urllib.parse
+from unittest import TestCase
+
+import cassiopeia.dto.requests
+import cassiopeia.core.requests
+import cassiopeia.type.api.store
+import cassiopeia.type.core.common
+import cassiopeia.type.core.match
+from cassiopeia import riotapi
+from cassiopeia.type.api.client import Client
+
+
+class SlowMatchPool(object):
+    """Answers match requests, taking longer for lower match IDs, and keeps track of how many requests are made at once"""
+
+    def __init__(self):
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.queries = []
+        self._lock = threading.Lock()
+
+    def request(self, url, method="GET", body=None, headers={}):
+        id_ = int(urllib.parse.urlsplit(url).path.split("/")[-1])
+        with self._lock:
+            self.requests += 1
+            self.queries.append(urllib.parse.urlsplit(url).query)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.02 * (10 - id_ % 10))
+        with self._lock:
+            self.in_flight -= 1
+        return json.dumps({"matchId": id_}).encode("UTF-8"), {}
+
+
+class IterMatchesTests(TestCase):
+
+    def setUp(self):
+        self.old = (cassiopeia.dto.requests.api_key, cassiopeia.dto.requests.region, cassiopeia.dto.requests.connection_pool, cassiopeia.dto.requests.rate_limiter, cassiopeia.core.requests.data_store, cassiopeia.core.requests.load_policy)
+        cassiopeia.dto.requests.api_key = "key"
+        cassiopeia.dto.requests.region = "na"
+        cassiopeia.dto.requests.connection_pool = SlowMatchPool()
+        cassiopeia.dto.requests.rate_limiter = None
+        cassiopeia.core.requests.data_store = cassiopeia.type.api.store.Cache()
+        cassiopeia.core.requests.load_policy = cassiopeia.type.core.common.LoadPolicy.lazy
+
+    def tearDown(self):
+        cassiopeia.dto.requests.api_key, cassiopeia.dto.requests.region, cassiopeia.dto.requests.connection_pool, cassiopeia.dto.requests.rate_limiter, cassiopeia.core.requests.data_store, cassiopeia.core.requests.load_policy = self.old
+
+    def test_unordered(self):
+        matches = riotapi.iter_matches(range(1, 11), max_in_flight=10)
+        first = next(matches)
+
+        # The quickest match comes first, and is already stored
+        assert first.id == 9
+        assert cassiopeia.core.requests.data_store.get(cassiopeia.type.core.match.Match, 9, "matchId") is first
+        assert sorted([first.id] + [match.id for match in matches]) == list(range(1, 11))
+
+    def test_ordered(self):
+        cassiopeia.core.requests.data_store.store(cassiopeia.type.core.match.Match(cassiopeia.type.dto.match.MatchDetail({"matchId": 3})), 3)
+        ids = list(range(1, 21))
+        assert [match.id for match in riotapi.iter_matches(ids, ordered=True, max_in_flight=4)] == ids
+
+        # Stored matches aren't requested, and no more than max_in_flight are requested at once
+        pool = cassiopeia.dto.requests.connection_pool
+        assert pool.requests == 19
+        assert pool.max_in_flight <= 4
+
+    def test_with_client(self):
+        client = Client("euw")
+        client.connection_pool = SlowMatchPool()
+        with client:
+            assert sorted(match.id for match in riotapi.iter_matches(range(1, 6))) == [1, 2, 3, 4, 5]
+
+        # The matches are requested and stored with the client's settings, even though they're fetched on other threads
+        assert client.connection_pool.requests == 5
+        assert cassiopeia.dto.requests.connection_pool.requests == 0
+        assert client.data_store.get(cassiopeia.type.core.match.Match, 3, "matchId").id == 3
+
+    def test_get_matches_loads_required_data_once(self):
+        loaded = []
+        old = cassiopeia.core.matchapi.load_required_data
+        cassiopeia.core.requests.load_policy = cassiopeia.type.core.common.LoadPolicy.eager
+        cassiopeia.core.matchapi.load_required_data = lambda matches: loaded.append(sorted(match.matchId for match in matches))
+        try:
+            assert [match.id for match in riotapi.get_matches([1, 2, 3], include_timeline=True)] == [1, 2, 3]
+        finally:
+            cassiopeia.core.matchapi.load_required_data = old
+
+        assert loaded == [[1, 2, 3]]
+        assert all("includeTimeline=True" in query for query in cassiopeia.dto.requests.connection_pool.queries)
@@ -0,0 +1,66 @@
+import json
+from unittest import TestCase
+
+import cassiopeia.dto.requests
+import cassiopeia.dto.matchapi
+from cassiopeia import baseriotapi
+from cassiopeia.type.api.projection import Projection
+
+_match = {
+    "matchId": 1,
+    "matchMode": "CLASSIC",
+    "participants": [{"participantId": p, "teamId": 100, "stats": {"champLevel": 18, "winner": True, "kills": 3}, "runes": [{"runeId": 5001, "rank": 9}], "masteries": [{"masteryId": 6111, "rank": 1}]} for p in (1, 2)],
+    "participantIdentities": [{"participantId": p, "player": {"summonerId": p, "summonerName": "summoner{p}".format(p=p)}} for p in (1, 2)],
+    "timeline": {"frames": [{"timestamp": 0, "events": [{"eventType": "ITEM_PURCHASED", "description": "[\"}]"}]}]}
+}
+
+
+class MatchPool(object):
+    """Answers every request with the same match"""
+
+    def request(self, url, method="GET", body=None, headers={}):
+        return json.dumps(_match).encode("UTF-8"), {}
+
+
+class ProjectionTests(TestCase):
+
+    def test_only_projected_fields_are_kept(self):
+        projection = Projection(["matchId", "participants.participantId", "participants.stats.winner", "participantIdentities.player", "nothing.here"])
+        for separators in ((", ", ": "), (",", ":")):
+            content = "\n " + json.dumps(_match, separators=separators, indent=1 if separators[0] == ", " else None) + " \n"
+            assert projection.loads(content) == {
+                "matchId": 1,
+                "participants": [{"participantId": p, "stats": {"winner": True}} for p in (1, 2)],
+                "participantIdentities": [{"player": {"summonerId": p, "summonerName": "summoner{p}".format(p=p)}} for p in (1, 2)]
+            }
+
+    def test_whole_values_win_over_paths(self):
+        projection = Projection(["timeline", "timeline.frames.timestamp"])
+        assert projection.fields == {"timeline": None}
+        assert projection.loads(json.dumps(_match)) == {"timeline": _match["timeline"]}
+        assert Projection({"matchId": None}).loads("[{\"matchId\": 1}, {}, null]") == [{"matchId": 1}, {}, None]
+
+    def test_bad_documents(self):
+        projection = Projection(["matchId"])
+        for content in ("", "{\"matchId\": 1", "{\"matchId\" 1}", "{\"matchId\": 1} 2", "{matchId: 1}", "{\"a\": x}"):
+            self.assertRaises(ValueError, projection.loads, content)
+
+    def test_set_projection(self):
+        old = (cassiopeia.dto.requests.api_key, cassiopeia.dto.requests.region, cassiopeia.dto.requests.connection_pool, cassiopeia.dto.requests.rate_limiter, dict(cassiopeia.dto.requests.projections))
+        cassiopeia.dto.requests.api_key = "key"
+        cassiopeia.dto.requests.region = "na"
+        cassiopeia.dto.requests.connection_pool = MatchPool()
+        cassiopeia.dto.requests.rate_limiter = None
+        try:
+            baseriotapi.set_projection("match", ["matchId", "participants.participantId", "participants.stats.winner", "participantIdentities"])
+            match = cassiopeia.dto.matchapi.get_match(1)
+            assert match.matchId == 1
+            assert [participant.stats.winner for participant in match.participants] == [True, True]
+            assert match.participants[0].stats.champLevel == 0
+            assert match.participants[0].teamId == 0
+            assert match.participantIdentities[1].player.summonerId == 2
+
+            baseriotapi.set_projection("match", None)
+            assert cassiopeia.dto.requests.projections == {}
+        finally:
+            cassiopeia.dto.requests.api_key, cassiopeia.dto.requests.region, cassiopeia.dto.requests.connection_pool, cassiopeia.dto.requests.rate_limiter, cassiopeia.dto.requests.projections = old
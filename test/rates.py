@@ -0,0 +1,295 @@
+import email.message
+import threading
+import time
+import urllib.error
+from unittest import TestCase
+
+import cassiopeia.dto.requests
+from cassiopeia.type.api.exception import APIError
+from cassiopeia.type.api.retry import RetryPolicy
+from cassiopeia.type.api.rates import SingleRateLimiter, MultiRateLimiter, RateLimiterRegistry, call_all
+
+
+class RateLimiterTests(TestCase):
+
+    def test_no_timer_threads_are_started(self):
+        limiter = MultiRateLimiter((5, 0.1), (100, 10))
+        threads = threading.active_count()
+        for _ in range(12):
+            limiter.call()
+        assert threading.active_count() == threads
+
+    def test_sustained_rate_matches_limit(self):
+        limiter = SingleRateLimiter(50, 0.5)
+        start = time.monotonic()
+        for _ in range(200):
+            limiter.call()
+        elapsed = time.monotonic() - start
+        # The first 50 calls go out immediately, then 50 more every half second
+        assert 1.5 <= elapsed < 1.5 * 1.01 + 0.05
+        assert limiter.calls == (200, 200)
+
+    def test_every_window_is_respected_across_threads(self):
+        limiter = MultiRateLimiter((10, 0.2), (25, 1.0))
+        times = []
+        lock = threading.Lock()
+
+        def record():
+            with lock:
+                times.append(time.monotonic())
+
+        def worker():
+            for _ in range(5):
+                limiter.call(record)
+
+        threads = [threading.Thread(target=worker) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        times.sort()
+        assert len(times) == 30
+        for i in range(len(times)):
+            assert len([t for t in times[i:] if t - times[i] < 0.2 - 0.005]) <= 10
+            assert len([t for t in times[i:] if t - times[i] < 1.0 - 0.005]) <= 25
+
+    def test_reset_in_delays_calls(self):
+        limiter = MultiRateLimiter((100, 1))
+        limiter.reset_in(0.2)
+        start = time.monotonic()
+        limiter.wait()
+        limiter.call()
+        assert time.monotonic() - start >= 0.2
+
+    def test_reset_in_under_load_keeps_every_window(self):
+        for limiter in (SingleRateLimiter(10, 0.2), MultiRateLimiter((10, 0.2), (25, 1.0))):
+            times = []
+            lock = threading.Lock()
+
+            def record():
+                with lock:
+                    times.append(time.monotonic())
+
+            def worker():
+                for _ in range(5):
+                    limiter.call(record)
+
+            threads = [threading.Thread(target=worker) for _ in range(6)]
+            for thread in threads:
+                thread.start()
+            # Calls are already scheduled for the next windows when the pause starts
+            time.sleep(0.05)
+            paused = time.monotonic()
+            limiter.reset_in(0.3)
+            for thread in threads:
+                thread.join()
+
+            times.sort()
+            assert len(times) == 30
+            assert not [t for t in times if paused + 0.005 < t < paused + 0.3 - 0.005]
+            for i in range(len(times)):
+                assert len([t for t in times[i:] if t - times[i] < 0.2 - 0.005]) <= 10
+
+    def test_failed_calls_are_counted(self):
+        limiter = MultiRateLimiter((10, 1))
+
+        def fail():
+            raise ValueError()
+
+        try:
+            limiter.call(fail)
+        except ValueError:
+            pass
+        limiter.call()
+        assert limiter.calls == (1, 2)
+
+    def test_synchronize_catches_up_to_server_counts(self):
+        limiter = MultiRateLimiter((10, 1), (100, 60))
+        limiter.call()
+        limiter.synchronize([(10, 1), (40, 60)])
+        # The server has seen the whole short window, so the next call has to wait for it
+        assert limiter.available_at() - time.monotonic() > 0.9
+        assert limiter.limits[1]._count_since(time.monotonic() - 60) == 40
+
+        # Lower counts than ours are ignored
+        limiter.synchronize([(0, 1)])
+        assert limiter.limits[0]._count_since(time.monotonic() - 1) == 10
+
+    def test_synchronize_adopts_server_limits(self):
+        limiter = MultiRateLimiter((10, 10), (500, 600))
+        for _ in range(3):
+            limiter.call()
+        limiter.synchronize([(3, 1), (3, 120)], [(20, 1), (100, 120)])
+        assert sorted((limit.limit, limit.seconds_per_epoch) for limit in limiter.limits) == [(20, 1), (100, 120)]
+        assert limiter.limits[1]._count_since(time.monotonic() - 120) == 3
+
+        limiter.synchronize([(4, 1)], [(5, 1), (100, 120)])
+        assert limiter.limits[0].limit == 5
+        assert limiter.limits[0]._count_since(time.monotonic() - 1) == 4
+
+    def test_call_all_respects_every_limiter(self):
+        application = MultiRateLimiter((100, 1))
+        method = SingleRateLimiter(3, 0.2)
+        start = time.monotonic()
+        for _ in range(7):
+            call_all([method, application])
+        assert time.monotonic() - start >= 0.4
+        assert application.calls == (7, 7)
+        assert method.calls == (7, 7)
+
+    def test_throttled_family_does_not_hold_up_others(self):
+        application = MultiRateLimiter((100, 1))
+        slow = SingleRateLimiter(1, 10)
+        call_all([slow, application])
+
+        thread = threading.Thread(target=call_all, args=([slow, application],), daemon=True)
+        thread.start()
+        time.sleep(0.05)
+
+        # The call waiting on the slow family hasn't taken an application slot ahead of this one
+        start = time.monotonic()
+        call_all([application])
+        assert time.monotonic() - start < 0.1
+
+    def test_registry(self):
+        registry = RateLimiterRegistry()
+        assert registry.get("na", "match") is None
+
+        registry.set_limits("match", (500, 10))
+        na = registry.get("na", "match")
+        assert na is registry.get("na", "match")
+        assert na is not registry.get("euw", "match")
+        assert registry.get("na", "summoner") is None
+
+        learned = registry.learn("na", "summoner", [(20, 1)])
+        assert registry.get("na", "summoner") is learned
+        assert len(registry.limiters()) == 3
+
+        registry.set_limits("match")
+        assert registry.get("na", "match") is None
+
+
+class HeaderPool(object):
+    """Answers every request with an empty body and the given headers"""
+
+    def __init__(self, headers):
+        self.headers = headers
+
+    def request(self, url, method="GET", body=None, headers={}):
+        return b"{}", self.headers
+
+
+class FailingPool(object):
+    """Fails with the given status codes, then answers with an empty body"""
+
+    def __init__(self, *codes):
+        self.codes = list(codes)
+        self.requests = 0
+
+    def request(self, url, method="GET", body=None, headers={}):
+        self.requests += 1
+        if self.codes:
+            raise urllib.error.HTTPError(url, self.codes.pop(0), "Error", email.message.Message(), None)
+        return b"{}", {}
+
+
+class RateLimitHeaderTests(TestCase):
+
+    def setUp(self):
+        self.old = (cassiopeia.dto.requests.api_key, cassiopeia.dto.requests.region, cassiopeia.dto.requests.connection_pool, cassiopeia.dto.requests.rate_limiter, cassiopeia.dto.requests.method_rate_limiters, cassiopeia.dto.requests.retry_policy)
+        cassiopeia.dto.requests.api_key = "key"
+        cassiopeia.dto.requests.region = "na"
+        cassiopeia.dto.requests.rate_limiter = MultiRateLimiter((10, 10), (500, 600))
+        cassiopeia.dto.requests.method_rate_limiters = RateLimiterRegistry()
+
+    def tearDown(self):
+        cassiopeia.dto.requests.api_key, cassiopeia.dto.requests.region, cassiopeia.dto.requests.connection_pool, cassiopeia.dto.requests.rate_limiter, cassiopeia.dto.requests.method_rate_limiters, cassiopeia.dto.requests.retry_policy = self.old
+
+    def test_parse_rate_limit_header(self):
+        assert cassiopeia.dto.requests.parse_rate_limit_header("7:10,58:600") == [(7, 10), (58, 600)]
+        assert cassiopeia.dto.requests.parse_rate_limit_header("") == []
+        assert cassiopeia.dto.requests.parse_rate_limit_header("garbage") == []
+
+    def test_responses_calibrate_limiters(self):
+        cassiopeia.dto.requests.connection_pool = HeaderPool({
+            "X-App-Rate-Limit": "20:1,100:120",
+            "X-App-Rate-Limit-Count": "1:1,60:120",
+            "X-Method-Rate-Limit": "500:10",
+            "X-Method-Rate-Limit-Count": "1:10"
+        })
+        cassiopeia.dto.requests.get("v2.2/match/1")
+
+        limiter = cassiopeia.dto.requests.rate_limiter
+        assert sorted((limit.limit, limit.seconds_per_epoch) for limit in limiter.limits) == [(20, 1), (100, 120)]
+        assert limiter.limits[1]._count_since(time.monotonic() - 120) == 60
+
+        method_limiter = cassiopeia.dto.requests.method_rate_limiters.get("na", "match")
+        assert [(limit.limit, limit.seconds_per_epoch) for limit in method_limiter.limits] == [(500, 10)]
+
+        # The learned method limiter is used for the next call to the same API family only
+        cassiopeia.dto.requests.get("v2.2/match/2")
+        cassiopeia.dto.requests.connection_pool = HeaderPool({})
+        cassiopeia.dto.requests.get("v1.4/summoner/1")
+        assert method_limiter.calls == (1, 1)
+        assert cassiopeia.dto.requests.method_rate_limiters.get("na", "summoner") is None
+        assert cassiopeia.dto.requests.method_rate_limiters.get("euw", "match") is None
+
+    def test_legacy_count_header(self):
+        cassiopeia.dto.requests.connection_pool = HeaderPool({"X-Rate-Limit-Count": "10:10,12:600"})
+        cassiopeia.dto.requests.get("v2.2/match/1")
+        assert cassiopeia.dto.requests.rate_limiter.available_at() - time.monotonic() > 9
+
+    def test_static_calls_bypass_limiters(self):
+        cassiopeia.dto.requests.connection_pool = HeaderPool({})
+        cassiopeia.dto.requests.rate_limiter.reset_in(60)
+        start = time.monotonic()
+        cassiopeia.dto.requests.get("v1.2/champion", static=True)
+        cassiopeia.dto.requests.get("http://status.leagueoflegends.com/shards", static=True, include_base=False)
+        assert time.monotonic() - start < 1
+        assert cassiopeia.dto.requests.rate_limiter.calls == (0, 0)
+
+    def test_api_family(self):
+        assert cassiopeia.dto.requests.get_api_family("v2.5/league/by-summoner/1") == "league"
+        assert cassiopeia.dto.requests.get_api_family("https://na.api.pvp.net/championmastery/location/NA1/player/1/score") == "championmastery"
+        assert cassiopeia.dto.requests.get_api_family("https://na.api.pvp.net/observer-mode/rest/featured") == "featuredgames"
+        assert cassiopeia.dto.requests.get_api_family("https://na.api.pvp.net/observer-mode/rest/consumer/getSpectatorGameInfo/NA1/1") == "currentgame"
+
+    def test_server_errors_are_retried(self):
+        cassiopeia.dto.requests.retry_policy = RetryPolicy(3, base_delay=0.01)
+        cassiopeia.dto.requests.connection_pool = FailingPool(500, 503)
+        assert cassiopeia.dto.requests.get("v2.2/match/1") == {}
+        assert cassiopeia.dto.requests.connection_pool.requests == 3
+
+        cassiopeia.dto.requests.connection_pool = FailingPool(500, 500, 500, 500)
+        with self.assertRaises(APIError):
+            cassiopeia.dto.requests.get("v2.2/match/1")
+        assert cassiopeia.dto.requests.connection_pool.requests == 3
+
+    def test_client_errors_are_not_retried(self):
+        cassiopeia.dto.requests.connection_pool = FailingPool(404)
+        with self.assertRaises(APIError) as context:
+            cassiopeia.dto.requests.get("v2.2/match/1")
+        assert context.exception.error_code == 404
+        assert cassiopeia.dto.requests.connection_pool.requests == 1
+
+    def test_rate_limit_429_pauses_limiter(self):
+        headers = email.message.Message()
+        headers["Retry-After"] = "3"
+        headers["X-Rate-Limit-Type"] = "method"
+        error = urllib.error.HTTPError("url", 429, "Too Many Requests", headers, None)
+
+        application = MultiRateLimiter((10, 10))
+        method = MultiRateLimiter((10, 10))
+        assert cassiopeia.dto.requests.get_retry_delay(error, 1, application, method) == 0
+        assert method.available_at() - time.monotonic() > 3
+        assert application.available_at() - time.monotonic() < 1
+
+    def test_backoff_is_capped_and_jittered(self):
+        policy = RetryPolicy(10, base_delay=1, max_delay=4)
+        delays = [policy.backoff(8) for _ in range(100)]
+        assert all(0 <= delay <= 4 for delay in delays)
+        assert len(set(delays)) > 1
+        assert policy.backoff(1, retry_after=5) == 5
+        assert not policy.should_retry(500, 10)
+        assert not policy.should_retry(404, 1)
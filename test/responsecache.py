@@ -0,0 +1,84 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+import cassiopeia.dto.requests
+import cassiopeia.type.api.common
+from cassiopeia import baseriotapi
+
+from .stubs import StaticPool
+
+
+def static_pool(version):
+    # Answers realm, champion, and summoner requests locally
+    return StaticPool({"realm": {"v": version}, "champion": {"type": "champion", "version": version, "data": {}}}, {"1": {"id": 1, "name": "summoner1"}})
+
+
+class ResponseCacheTests(TestCase):
+
+    def setUp(self):
+        self.old = (cassiopeia.dto.requests.api_key, cassiopeia.dto.requests.region, cassiopeia.dto.requests.connection_pool, cassiopeia.dto.requests.rate_limiter, cassiopeia.dto.requests.response_cache)
+        cassiopeia.dto.requests.api_key = "key"
+        cassiopeia.dto.requests.region = "na"
+        cassiopeia.dto.requests.rate_limiter = None
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        cassiopeia.dto.requests.api_key, cassiopeia.dto.requests.region, cassiopeia.dto.requests.connection_pool, cassiopeia.dto.requests.rate_limiter, cassiopeia.dto.requests.response_cache = self.old
+        shutil.rmtree(self.directory)
+
+    def run_program(self, version, **kwargs):
+        # Like starting a new process, with nothing in memory
+        cassiopeia.dto.requests.connection_pool = static_pool(version)
+        baseriotapi.set_response_cache(self.directory, **kwargs)
+        assert baseriotapi.get_champions().version == version
+        baseriotapi.get_summoners_by_id(1)
+        return cassiopeia.dto.requests.connection_pool.paths
+
+    def test_static_data_is_reused(self):
+        assert self.run_program("6.1.1") == ["realm", "champion", "1"]
+
+        # The API key isn't part of the cache key
+        cassiopeia.dto.requests.api_key = "other-key"
+        assert self.run_program("6.1.1") == ["1"]
+        assert cassiopeia.dto.requests.response_cache.stats == {"hits": 2, "misses": 0}
+
+    def test_new_version_is_downloaded(self):
+        self.run_program("6.1.1", version_ttl=0)
+        assert self.run_program("6.1.1", version_ttl=0) == ["realm", "1"]
+        assert self.run_program("6.2.1", version_ttl=0) == ["realm", "champion", "1"]
+
+    def test_other_families(self):
+        self.run_program("6.1.1", ttls={"staticdata": None, "summoner": 60})
+        assert self.run_program("6.1.1", ttls={"staticdata": None, "summoner": 60}) == []
+        assert self.run_program("6.1.1", ttls={"staticdata": None, "summoner": 0}) == ["1"]
+
+        baseriotapi.set_response_cache(None)
+        assert cassiopeia.dto.requests.response_cache is None
+
+    def test_shard_status_is_not_static_data(self):
+        cassiopeia.dto.requests.connection_pool = static_pool("6.1.1")
+        baseriotapi.set_response_cache(self.directory)
+        baseriotapi.get_shard()
+        baseriotapi.get_shard()
+
+        # Shard status changes all the time, so it's only cached if asked for like any other family
+        assert cassiopeia.dto.requests.connection_pool.paths == ["na", "na"]
+        baseriotapi.set_response_cache(self.directory, ttls={"shards": 60})
+        baseriotapi.get_shard()
+        assert cassiopeia.dto.requests.connection_pool.paths == ["na", "na", "na"]
+        baseriotapi.get_shard()
+        assert cassiopeia.dto.requests.connection_pool.paths == ["na", "na", "na"]
+
+    def test_atomic_write(self):
+        path = os.path.join(self.directory, "response")
+        cassiopeia.type.api.common.atomic_write(path, b"first")
+        cassiopeia.type.api.common.atomic_write(path, b"second")
+        with open(path, "rb") as response_file:
+            assert response_file.read() == b"second"
+
+        # A failed write leaves the old file and no temporary file behind
+        with self.assertRaises(TypeError):
+            cassiopeia.type.api.common.atomic_write(path, "not bytes")
+        assert os.listdir(self.directory) == ["response"]
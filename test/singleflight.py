@@ -0,0 +1,76 @@
+import email.message
+import threading
+import time
+import urllib.error
+from unittest import TestCase
+
+import cassiopeia.dto.requests
+from cassiopeia.type.api.exception import APIError
+from cassiopeia.type.api.singleflight import SingleFlight
+
+
+class SlowPool(object):
+    """Answers every request after a short delay, optionally with an error status"""
+
+    def __init__(self, code=200):
+        self.code = code
+        self.requests = 0
+
+    def request(self, url, method="GET", body=None, headers={}):
+        self.requests += 1
+        time.sleep(0.2)
+        if self.code != 200:
+            raise urllib.error.HTTPError(url, self.code, "Error", email.message.Message(), None)
+        return b'{"id": 1}', {}
+
+
+class SingleFlightTests(TestCase):
+
+    def setUp(self):
+        self.old = (cassiopeia.dto.requests.api_key, cassiopeia.dto.requests.region, cassiopeia.dto.requests.connection_pool, cassiopeia.dto.requests.rate_limiter)
+        cassiopeia.dto.requests.api_key = "key"
+        cassiopeia.dto.requests.region = "na"
+        cassiopeia.dto.requests.rate_limiter = None
+
+    def tearDown(self):
+        cassiopeia.dto.requests.api_key, cassiopeia.dto.requests.region, cassiopeia.dto.requests.connection_pool, cassiopeia.dto.requests.rate_limiter = self.old
+
+    def run_concurrently(self, request, count=10):
+        results = [None] * count
+
+        def worker(i):
+            try:
+                results[i] = cassiopeia.dto.requests.get(request)
+            except APIError as e:
+                results[i] = e
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_identical_requests_share_one_call(self):
+        cassiopeia.dto.requests.connection_pool = SlowPool()
+        results = self.run_concurrently("v1.4/summoner/1")
+        assert cassiopeia.dto.requests.connection_pool.requests == 1
+        assert all(result == {"id": 1} for result in results)
+
+        # Every caller gets its own copy to modify
+        assert len(set(id(result) for result in results)) == len(results)
+
+        # Once the call is done, the next one goes to the server again
+        cassiopeia.dto.requests.get("v1.4/summoner/1")
+        assert cassiopeia.dto.requests.connection_pool.requests == 2
+
+    def test_errors_are_shared(self):
+        cassiopeia.dto.requests.connection_pool = SlowPool(404)
+        results = self.run_concurrently("v1.4/summoner/1")
+        assert cassiopeia.dto.requests.connection_pool.requests == 1
+        assert all(isinstance(result, APIError) and result.error_code == 404 for result in results)
+
+    def test_different_requests_are_not_shared(self):
+        flight = SingleFlight()
+        assert [flight.do(key, lambda key: key * 2, key) for key in range(3)] == [0, 2, 4]
+        assert flight.stats == {"made": 3, "shared": 0}
@@ -0,0 +1,84 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+import cassiopeia.dto.requests
+import cassiopeia.core.requests
+import cassiopeia.core.staticdataapi
+import cassiopeia.type.api.store
+from cassiopeia import riotapi
+from cassiopeia.type.api.exception import CassiopeiaException
+
+from .stubs import StaticPool
+
+_responses = {
+    "realm": {"v": "6.1.1", "l": "en_US"},
+    "champion": {"type": "champion", "version": "6.1.1", "data": {"Annie": {"id": 1, "name": "Annie", "stats": {"armor": 19.22}, "spells": [{"name": "Disintegrate", "cooldown": [4.0]}]}}},
+    "item": {"type": "item", "version": "6.1.1", "data": {"1001": {"id": 1001, "name": "Boots of Speed", "gold": {"total": 300}, "into": ["3006"]}, "3006": {"id": 3006, "name": "Berserker's Greaves", "from": ["1001", "1042"]}}},
+    "mastery": {"type": "mastery", "version": "6.1.1", "data": {"6111": {"id": 6111, "name": "Fury", "ranks": 5}}},
+    "rune": {"type": "rune", "version": "6.1.1", "data": {"5001": {"id": 5001, "name": "Lesser Mark of Attack Damage", "rune": {"tier": "1"}}}},
+    "summoner-spell": {"type": "summoner", "version": "6.1.1", "data": {"SummonerFlash": {"id": 4, "name": "Flash"}}}
+}
+
+
+class SnapshotTests(TestCase):
+
+    def setUp(self):
+        self.old = (cassiopeia.dto.requests.api_key, cassiopeia.dto.requests.region, cassiopeia.dto.requests.connection_pool, cassiopeia.dto.requests.rate_limiter, cassiopeia.core.requests.data_store)
+        cassiopeia.dto.requests.api_key = "key"
+        cassiopeia.dto.requests.region = "na"
+        cassiopeia.dto.requests.connection_pool = StaticPool(_responses)
+        cassiopeia.dto.requests.rate_limiter = None
+        cassiopeia.core.requests.data_store = cassiopeia.type.api.store.Cache()
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "static.snapshot")
+
+    def tearDown(self):
+        cassiopeia.dto.requests.api_key, cassiopeia.dto.requests.region, cassiopeia.dto.requests.connection_pool, cassiopeia.dto.requests.rate_limiter, cassiopeia.core.requests.data_store = self.old
+        shutil.rmtree(self.directory)
+
+    def test_save_and_load(self):
+        assert riotapi.save_static_data(self.path) == "6.1.1"
+        downloaded = cassiopeia.core.staticdataapi.get_champions()[0]
+        assert len(cassiopeia.dto.requests.connection_pool.paths) == 6
+
+        # A new worker with nothing loaded yet
+        cassiopeia.dto.requests.connection_pool = StaticPool(_responses)
+        cassiopeia.core.requests.data_store = cassiopeia.type.api.store.Cache()
+        assert riotapi.load_static_data(self.path, version="6.1.1", locale="en_US") == "6.1.1"
+
+        champion = cassiopeia.core.staticdataapi.get_champion_by_id(1)
+        assert champion.data == downloaded.data
+        assert champion.spells[0].name == "Disintegrate"
+        assert cassiopeia.core.staticdataapi.get_items()[0].name == "Boots of Speed"
+        assert [spell.name for spell in cassiopeia.core.staticdataapi.get_summoner_spells()] == ["Flash"]
+        assert cassiopeia.core.staticdataapi.get_rune(5001).id == 5001
+        assert cassiopeia.core.staticdataapi.get_masteries([6111])[0].name == "Fury"
+        assert cassiopeia.dto.requests.connection_pool.paths == []
+
+    def test_item_recipes_are_kept(self):
+        riotapi.save_static_data(self.path)
+        cassiopeia.core.requests.data_store = cassiopeia.type.api.store.Cache()
+        riotapi.load_static_data(self.path)
+
+        assert cassiopeia.core.staticdataapi.get_item(3006).data.from_ == ["1001", "1042"]
+        assert cassiopeia.core.staticdataapi.get_item(1001).data.into == ["3006"]
+
+    def test_loaded_data_is_indexed(self):
+        riotapi.save_static_data(self.path)
+        cassiopeia.dto.requests.connection_pool = StaticPool(_responses)
+        cassiopeia.core.requests.data_store = cassiopeia.type.api.store.Cache()
+        riotapi.load_static_data(self.path)
+
+        assert [item.id for item in cassiopeia.core.staticdataapi.get_items_built_from(1001)] == [3006]
+        assert [item.id for item in cassiopeia.core.staticdataapi.get_item_components(3006)] == [1001]
+        assert cassiopeia.core.staticdataapi.get_champion_by_name("annie").id == 1
+        assert cassiopeia.dto.requests.connection_pool.paths == []
+
+    def test_wrong_version(self):
+        riotapi.save_static_data(self.path)
+        cassiopeia.core.requests.data_store = cassiopeia.type.api.store.Cache()
+        self.assertRaises(CassiopeiaException, riotapi.load_static_data, self.path, "6.2.1")
+        self.assertRaises(CassiopeiaException, riotapi.load_static_data, self.path, None, "ko_KR")
+        assert not cassiopeia.core.requests.data_store.has_all(cassiopeia.type.core.staticdata.Champion)
@@ -0,0 +1,66 @@
+from unittest import TestCase
+
+import cassiopeia.dto.requests
+import cassiopeia.core.requests
+import cassiopeia.core.staticdataapi
+import cassiopeia.type.api.store
+
+from .stubs import StaticPool
+
+_responses = {
+    "champion": {"type": "champion", "data": {
+        "Annie": {"id": 1, "key": "Annie", "name": "Annie", "tags": ["Mage"]},
+        "MonkeyKing": {"id": 62, "key": "MonkeyKing", "name": "Wukong", "tags": ["Fighter", "Tank"]},
+        "Khazix": {"id": 121, "key": "Khazix", "name": "Kha'Zix", "tags": ["Assassin", "Fighter"]}
+    }},
+    "item": {"type": "item", "data": {
+        "1001": {"id": 1001, "name": "Boots of Speed", "tags": ["Boots"], "into": ["3006", "3020"]},
+        "3006": {"id": 3006, "name": "Berserker's Greaves", "tags": ["Boots", "AttackSpeed"], "from": ["1001", "1042"]},
+        "3020": {"id": 3020, "name": "Sorcerer's Shoes", "tags": ["Boots", "SpellPenetration"], "from": ["1001"]},
+        "1042": {"id": 1042, "name": "Dagger", "tags": ["AttackSpeed"], "into": ["3006"]}
+    }}
+}
+
+
+class StaticDataIndexTests(TestCase):
+
+    def setUp(self):
+        self.old = (cassiopeia.dto.requests.api_key, cassiopeia.dto.requests.region, cassiopeia.dto.requests.connection_pool, cassiopeia.dto.requests.rate_limiter, cassiopeia.core.requests.data_store)
+        cassiopeia.dto.requests.api_key = "key"
+        cassiopeia.dto.requests.region = "na"
+        cassiopeia.dto.requests.connection_pool = StaticPool(_responses)
+        cassiopeia.dto.requests.rate_limiter = None
+        cassiopeia.core.requests.data_store = cassiopeia.type.api.store.Cache()
+
+    def tearDown(self):
+        cassiopeia.dto.requests.api_key, cassiopeia.dto.requests.region, cassiopeia.dto.requests.connection_pool, cassiopeia.dto.requests.rate_limiter, cassiopeia.core.requests.data_store = self.old
+
+    def test_champion_lookups(self):
+        api = cassiopeia.core.staticdataapi
+        assert api.get_champion_by_name("Wukong").id == 62
+        assert api.get_champion_by_name("kha'zix").id == 121
+        assert api.get_champion_by_name("Teemo") is None
+        assert [champion.id if champion else None for champion in api.get_champions_by_name(["Annie", "Teemo", "WUKONG"])] == [1, None, 62]
+        assert api.get_champion_by_key("MonkeyKing").name == "Wukong"
+        assert sorted(champion.id for champion in api.get_champions_by_tag("Fighter")) == [62, 121]
+        assert [champion.id if champion else None for champion in api.get_champions_by_id([121, 7])] == [121, None]
+        assert cassiopeia.dto.requests.connection_pool.paths == ["champion"]
+
+    def test_item_lookups(self):
+        api = cassiopeia.core.staticdataapi
+        assert sorted(item.id for item in api.get_items_by_tag("Boots")) == [1001, 3006, 3020]
+        assert sorted(item.id for item in api.get_items_built_from(1001)) == [3006, 3020]
+        assert sorted(item.id for item in api.get_item_components(3006)) == [1001, 1042]
+        assert api.get_items_built_from(3006) == []
+        assert [item.id for item in api.get_items([1042, 3020])] == [1042, 3020]
+        assert cassiopeia.dto.requests.connection_pool.paths == ["item"]
+
+    def test_data_loaded_elsewhere_is_indexed(self):
+        api = cassiopeia.core.staticdataapi
+        champions = api.get_champions()
+
+        # A new data store that already has the champions, e.g. a database filled by an earlier run
+        cassiopeia.core.requests.data_store = cassiopeia.type.api.store.Cache()
+        cassiopeia.core.requests.data_store.store(champions, [champion.id for champion in champions], [cassiopeia.type.core.staticdata.Champion])
+        assert api.get_champion_by_name("Annie").id == 1
+        assert cassiopeia.dto.requests.connection_pool.paths == ["champion"]
@@ -0,0 +1,338 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import TestCase
+
+import cassiopeia.type.dto.common
+from cassiopeia.type.api.store import Cache, TieredDataStore, WriteBehindDataStore
+
+if cassiopeia.type.dto.common.sqlalchemy_imported:
+    import sqlalchemy
+
+    from cassiopeia.type.api.store import SQLAlchemyDB, SQLiteDB
+
+
+class Thing(object):
+    def __init__(self, id_):
+        self.id = id_
+
+
+class Other(object):
+    def __init__(self, id_):
+        self.id = id_
+
+
+class GatedCache(Cache):
+    """A cache whose writes wait until the gate is opened"""
+
+    def __init__(self):
+        Cache.__init__(self)
+        self.gate = threading.Event()
+        self.writes = []
+
+    def store(self, objs, keys, complete_sets=[]):
+        self.gate.wait()
+        if keys == ["bad"]:
+            raise ValueError("Can't store that")
+        self.writes.append(len(objs))
+        Cache.store(self, objs, keys, complete_sets)
+
+
+class CountingCache(Cache):
+    """A cache which counts the lookups made against it"""
+
+    def __init__(self):
+        Cache.__init__(self)
+        self.lookups = 0
+
+    def get(self, class_, keys, key_field):
+        self.lookups += 1
+        return Cache.get(self, class_, keys, key_field)
+
+    def get_all(self, class_):
+        self.lookups += 1
+        return Cache.get_all(self, class_)
+
+
+class CacheTests(TestCase):
+
+    def test_get_and_store(self):
+        cache = Cache()
+        cache.store([Thing(1), Thing(2)], [1, 2])
+        cache.store(Thing(3), 3)
+        assert cache.get(Thing, 1, "id").id == 1
+        assert [thing.id if thing else None for thing in cache.get(Thing, [3, 4, 2], "id")] == [3, None, 2]
+        assert cache.get(Other, [1], "id") == [None]
+        assert sorted(thing.id for thing in cache.iterate(Thing)) == [1, 2, 3]
+        assert len(cache.get_all(Thing)) == 3
+
+    def test_least_recently_used_are_evicted(self):
+        cache = Cache(capacities={Thing: 3})
+        cache.store([Thing(1), Thing(2), Thing(3)], [1, 2, 3], complete_sets=[Thing])
+        cache.get(Thing, 1, "id")
+        cache.store(Thing(4), 4)
+
+        assert cache.get(Thing, 2, "id") is None
+        assert [thing.id for thing in cache.get(Thing, [1, 3, 4], "id")] == [1, 3, 4]
+        assert not cache.has_all(Thing)
+
+        # Other classes aren't capped
+        cache.store([Other(i) for i in range(10)], list(range(10)))
+        assert len(cache.get_all(Other)) == 10
+        assert cache.stats[Thing]["evictions"] == 1
+        assert cache.stats[Thing]["size"] == 3
+
+    def test_entries_expire(self):
+        cache = Cache(ttls={Thing: 0.05})
+        cache.store(Thing(1), 1, complete_sets=[Thing])
+        cache.store(Other(1), 1)
+        assert cache.get(Thing, 1, "id").id == 1
+        time.sleep(0.1)
+        assert cache.get(Thing, 1, "id") is None
+        assert cache.get(Other, 1, "id").id == 1
+        assert not cache.has_all(Thing)
+        assert cache.stats[Thing] == {"size": 0, "hits": 1, "misses": 1, "evictions": 0, "expirations": 1}
+
+    def test_expired_sets_are_not_complete(self):
+        cache = Cache(ttl=0.05)
+        cache.store([Thing(1), Thing(2)], [1, 2], complete_sets=[Thing])
+        assert cache.has_all(Thing)
+        time.sleep(0.1)
+
+        # Static data getters trust has_all, so a set whose objects have expired mustn't be reported as complete
+        assert cache.get_all(Thing) == []
+        assert cache.stats[Thing]["expirations"] == 2
+        assert not cache.has_all(Thing)
+
+        # Objects stored again with the set make it complete again
+        cache.store([Thing(1), Thing(2)], [1, 2], complete_sets=[Thing])
+        assert cache.has_all(Thing)
+        assert len(cache.get_all(Thing)) == 2
+
+    def test_concurrent_stores_respect_capacity(self):
+        cache = Cache(capacity=1024, stripes=8)
+
+        def worker(start):
+            for i in range(start, start + 1000):
+                cache.store(Thing(i), i)
+                cache.get(Thing, i - 1, "id")
+
+        threads = [threading.Thread(target=worker, args=(i * 1000,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = cache.stats[Thing]
+        assert stats["size"] <= 1024
+        assert stats["size"] + stats["evictions"] == 8000
+        assert stats["hits"] + stats["misses"] == 8000
+
+
+class TieredTests(TestCase):
+
+    def test_lookups_are_promoted(self):
+        backend = CountingCache()
+        backend.store([Thing(i) for i in range(5)], list(range(5)))
+        store = TieredDataStore(backend, Cache(capacity=3))
+
+        assert [thing.id if thing else None for thing in store.get(Thing, [0, 1, 7], "id")] == [0, 1, None]
+        assert backend.lookups == 1
+        assert store.get(Thing, 1, "id").id == 1
+        assert [thing.id for thing in store.get(Thing, [0, 1], "id")] == [0, 1]
+        assert backend.lookups == 1
+
+        # Stores go to both tiers
+        store.store(Thing(9), 9)
+        assert backend.get(Thing, 9, "id").id == 9
+        assert store.cache.get(Thing, 9, "id").id == 9
+
+    def test_complete_sets_are_promoted(self):
+        backend = CountingCache()
+        backend.store([Thing(i) for i in range(5)], list(range(5)), [Thing])
+        store = TieredDataStore(backend)
+
+        assert store.has_all(Thing)
+        assert not store.cache.has_all(Thing)
+        assert sorted(thing.id for thing in store.get_all(Thing)) == list(range(5))
+        assert store.cache.has_all(Thing)
+        assert sorted(thing.id for thing in store.get_all(Thing)) == list(range(5))
+        assert backend.lookups == 1
+
+
+class WriteBehindTests(TestCase):
+
+    def setUp(self):
+        self.backend = GatedCache()
+        self.store = WriteBehindDataStore(self.backend, max_pending=20, batch_size=10, flush_interval=0.05)
+
+    def tearDown(self):
+        self.backend.gate.set()
+        self.store.close()
+
+    def test_pending_objects_are_readable(self):
+        self.store.store([Thing(i) for i in range(5)], list(range(5)), complete_sets=[Thing])
+        self.store.store(Other(1), 1)
+        assert self.backend.writes == []
+        assert [thing.id for thing in self.store.get(Thing, [0, 4], "id")] == [0, 4]
+        assert self.store.get(Other, 1, "id").id == 1
+        assert self.store.get(Other, 2, "id") is None
+        assert self.store.has_all(Thing)
+        assert self.store.pending == 6
+
+        self.backend.gate.set()
+        self.store.flush()
+        assert self.store.pending == 0
+        assert self.backend.writes == [5, 1]
+        assert self.backend.has_all(Thing)
+        assert self.store.get(Thing, 3, "id").id == 3
+
+    def test_full_queue_blocks(self):
+        self.store.store([Thing(i) for i in range(20)], list(range(20)))
+        stored = threading.Event()
+
+        def worker():
+            self.store.store(Thing(20), 20)
+            stored.set()
+
+        threading.Thread(target=worker).start()
+        assert not stored.wait(0.2)
+        self.backend.gate.set()
+        assert stored.wait(5)
+        self.store.flush()
+        assert sum(self.backend.writes) == 21
+        assert max(self.backend.writes) == 10
+
+    def test_errors_are_raised_on_flush(self):
+        self.backend.gate.set()
+        self.store.store(Thing("bad"), "bad")
+        self.assertRaises(ValueError, self.store.flush)
+        assert self.store.get(Thing, "bad", "id") is None
+
+        self.store.store(Thing(1), 1)
+        self.store.close()
+        assert self.backend.get(Thing, 1, "id").id == 1
+        self.assertRaises(ValueError, self.store.store, Thing(2), 2)
+
+
+@unittest.skipUnless(cassiopeia.type.dto.common.sqlalchemy_imported, "SQLAlchemy isn't installed")
+class SQLAlchemyDBTests(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.db = self.connect(os.path.join(self.directory, "test.db"))
+
+    def connect(self, path):
+        return SQLAlchemyDB("sqlite", "", path, "", "", batch_size=3)
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.directory)
+
+    def matches(self, ids):
+        import cassiopeia.type.dto.match
+        import cassiopeia.type.core.match
+        return [cassiopeia.type.core.match.Match(cassiopeia.type.dto.match.MatchDetail({
+            "matchId": id_,
+            "participants": [{"participantId": p, "teamId": 100, "stats": {"champLevel": id_, "winner": True}, "timeline": {"lane": "TOP", "role": "SOLO"}} for p in range(1, 11)],
+            "participantIdentities": [{"participantId": p, "player": {"summonerId": id_ * 10 + p}} for p in range(1, 11)]
+        })) for id_ in ids]
+
+    def test_bulk_store(self):
+        import cassiopeia.type.core.match
+        matches = self.matches(range(1, 8))
+        self.db.store(matches, [match.id for match in matches])
+
+        # Objects which are already stored are skipped
+        matches = self.matches(range(5, 11))
+        self.db.store(matches, [match.id for match in matches])
+        self.db.store([], [])
+
+        # Objects stored through the ORM afterwards get new keys
+        self.db.store(self.matches([11])[0], 11)
+
+        stored = self.db.get(cassiopeia.type.core.match.Match, list(range(1, 12)), "matchId")
+        assert [match.id for match in stored] == list(range(1, 12))
+        for match in stored:
+            assert len(match.data.participants) == 10
+            assert all(participant.stats.champLevel == match.id for participant in match.data.participants)
+            assert sorted(identity.player.summonerId for identity in match.data.participantIdentities) == [match.id * 10 + p for p in range(1, 11)]
+
+    def test_concurrent_workers(self):
+        import cassiopeia.type.core.match
+        errors = []
+
+        def worker(start):
+            try:
+                for i in range(start, start + 5):
+                    self.db.store(self.matches([i])[0], i)
+                    self.db.store(self.matches([i + 1, i + 2]), [i + 1, i + 2])
+                    assert self.db.get(cassiopeia.type.core.match.Match, i, "matchId").id == i
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(i * 3,)) for i in range(12)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        stored = self.db.get_all(cassiopeia.type.core.match.Match)
+        assert sorted(match.id for match in stored) == list(range(0, 40))
+        assert all(len(match.data.participants) == 10 for match in stored)
+
+    def test_concurrent_processes(self):
+        import cassiopeia.type.core.match
+        import cassiopeia.type.dto.match
+        other = self.connect(os.path.join(self.directory, "test.db"))
+        errors = []
+
+        # Each connection writes overlapping matches, like separate processes sharing one database
+        def worker(db, start):
+            try:
+                for i in range(start, start + 20, 2):
+                    matches = self.matches([i, i + 1, i + 2])
+                    db.store(matches, [match.id for match in matches])
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(db, start)) for db in (self.db, other) for start in (0, 1)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        other.close()
+
+        assert errors == []
+        stored = self.db.get_all(cassiopeia.type.core.match.Match)
+        assert sorted(match.id for match in stored) == list(range(0, 22))
+        assert self.db.session.query(cassiopeia.type.dto.match.Participant).count() == 220
+        assert all(len(match.data.participants) == 10 for match in stored)
+
+    def test_bulk_store_without_native_upserts(self):
+        self.db._native_upserts = False
+        self.test_bulk_store()
+
+
+class SQLiteDBTests(SQLAlchemyDBTests):
+
+    def connect(self, path):
+        return SQLiteDB(path, batch_size=3)
+
+    def test_settings(self):
+        with self.db.db.connect() as connection:
+            assert connection.execute(sqlalchemy.text("PRAGMA journal_mode")).scalar() == "wal"
+            assert connection.execute(sqlalchemy.text("PRAGMA mmap_size")).scalar() == 268435456
+            indexes = [row[1] for row in connection.execute(sqlalchemy.text("PRAGMA index_list(MatchPlayer)"))]
+        assert "ix_MatchPlayer_summonerId" in indexes
+
+    def test_in_memory(self):
+        import cassiopeia.type.core.match
+        db = SQLiteDB(":memory:")
+        db.store(self.matches([1, 2]), [1, 2])
+        assert [match.id for match in db.get(cassiopeia.type.core.match.Match, [1, 2], "matchId")] == [1, 2]
+        db.close()
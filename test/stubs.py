@@ -0,0 +1,88 @@
+import json
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+_no_default = object()
+
+
+class StaticPool(object):
+    """Answers requests locally with the response for the last part of each URL's path"""
+
+    def __init__(self, responses, default=_no_default):
+        """
+        Args:
+            responses (dict<str, object>): the JSON content to answer with for each last path part
+            default (object): the JSON content to answer with for any other path. Other paths raise KeyError if it isn't given.
+        """
+        self.responses = responses
+        self.default = default
+        self.paths = []
+
+    def request(self, url, method="GET", body=None, headers={}):
+        path = urllib.parse.urlsplit(url).path.split("/")[-1]
+        self.paths.append(path)
+        content = self.responses[path] if self.default is _no_default else self.responses.get(path, self.default)
+        return json.dumps(content).encode("UTF-8"), {}
+
+
+class SummonerPool(object):
+    """Answers summoner requests locally, naming each summoner after the region it was requested from"""
+
+    def __init__(self, missing=()):
+        """
+        Args:
+            missing (list<int>): the IDs of summoners which don't exist (default ())
+        """
+        self.missing = [str(id_) for id_ in missing]
+        self.urls = []
+
+    def request(self, url, method="GET", body=None, headers={}):
+        self.urls.append(url)
+        parts = urllib.parse.urlsplit(url)
+        region = parts.hostname.split(".")[0]
+        ids = parts.path.split("/")[-1].split(",")
+        content = json.dumps({id_: {"id": int(id_), "name": "{region}{id}".format(region=region, id=id_)} for id_ in ids if id_ not in self.missing})
+        return content.encode("UTF-8"), {}
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    """Answers every request over HTTP/1.1 with its path. /missing paths get a 404, /slow paths are slow, and /chunked paths are sent chunked."""
+    protocol_version = "HTTP/1.1"
+    lock = threading.Lock()
+    running = 0
+    most_running = 0
+
+    def do_GET(self):
+        code = 404 if self.path.startswith("/missing") else 200
+        if self.path.startswith("/slow"):
+            with KeepAliveHandler.lock:
+                KeepAliveHandler.running += 1
+                KeepAliveHandler.most_running = max(KeepAliveHandler.most_running, KeepAliveHandler.running)
+            time.sleep(0.05)
+            with KeepAliveHandler.lock:
+                KeepAliveHandler.running -= 1
+        body = json.dumps({"path": self.path}).encode("UTF-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("X-Test", "yes")
+        if self.path.startswith("/chunked"):
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for i in range(0, len(body), 5):
+                chunk = body[i:i + 5]
+                self.wfile.write("{size:x}\r\n".format(size=len(chunk)).encode("latin-1") + chunk + b"\r\n")
+            self.wfile.write(b"0\r\n\r\n")
+        else:
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class ThreadedServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
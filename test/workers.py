@@ -0,0 +1,49 @@
+import threading
+import time
+from unittest import TestCase
+
+import cassiopeia.core.requests
+from cassiopeia import riotapi
+
+
+class WorkerPoolTests(TestCase):
+
+    def setUp(self):
+        self.old = cassiopeia.core.requests.workers
+
+    def tearDown(self):
+        riotapi.set_worker_count(self.old)
+
+    def test_chunks_are_requested_concurrently(self):
+        threads = set()
+
+        def method(chunk):
+            threads.add(threading.current_thread().name)
+            time.sleep(0.05)
+            return [i * 2 for i in chunk]
+
+        start = time.time()
+        assert cassiopeia.core.requests.call_with_ensured_size(method, 10, list(range(50))) == [i * 2 for i in range(50)]
+        assert time.time() - start < 0.2
+        assert len(threads) == 5
+
+        merged = cassiopeia.core.requests.call_with_ensured_size(lambda chunk: dict((str(i), i) for i in chunk), 10, list(range(25)))
+        assert merged == dict((str(i), i) for i in range(25))
+
+    def test_pool_is_shared_and_configurable(self):
+        executor = cassiopeia.core.requests.get_executor()
+        cassiopeia.core.requests.map_concurrently(abs, [-1, -2])
+        assert cassiopeia.core.requests.get_executor() is executor
+
+        riotapi.set_worker_count(1)
+        assert cassiopeia.core.requests.get_executor() is not executor
+        assert cassiopeia.core.requests.get_executor()._max_workers == 1
+
+    def test_nested_calls_run_inline(self):
+        riotapi.set_worker_count(1)
+
+        # With one thread, work from the pool waiting on the pool would never finish if it were queued
+        def outer(i):
+            return sum(cassiopeia.core.requests.map_concurrently(abs, [-i, -i])) + cassiopeia.core.requests.submit(abs, -i).result()
+
+        assert cassiopeia.core.requests.map_concurrently(outer, [1, 2, 3]) == [3, 6, 9]